@@ -1,6 +1,13 @@
-"""Agent module initialization."""
+"""Agent module initialization.
 
-try:
+Generated by agents/_generate_init.py -- edit the export table there and
+re-run the script instead of editing this file by hand.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
     from .agent_definitions_new import (
         CONTRACT_PARSER_AGENT,
         LEGAL_RESEARCH_AGENT,
@@ -12,37 +19,86 @@ try:
         get_agent_instructions,
         list_agents,
     )
-except ImportError:
-    try:
-        from .agent_definitions import (
-            SCHEDULER_AGENT as CONTRACT_PARSER_AGENT,
-            ASSISTANT_AGENT,
-        )
-    except ImportError:
-        CONTRACT_PARSER_AGENT = None
-
-try:
     from .agent_strategies_new import (
         select_agent,
         get_agent_sequence,
         AgentOrchestrator,
     )
-except ImportError:
-    try:
-        from .agent_strategies import (
-            ChatbotSelectionStrategy,
-            ChatbotTerminationStrategy,
-        )
-    except ImportError:
-        ChatbotSelectionStrategy = None
-
-__all__ = [
+    from .agent_definitions import (
+        SCHEDULER_AGENT,
+        REPORTING_AGENT,
+        POLITICAL_RISK_AGENT,
+        TARIFF_RISK_AGENT,
+        LOGISTICS_RISK_AGENT,
+        SCHEDULER_AGENT_INSTRUCTIONS,
+        REPORTING_AGENT_INSTRUCTIONS,
+        ASSISTANT_AGENT_INSTRUCTIONS,
+    )
+    from .agent_strategies import (
+        ChatbotSelectionStrategy,
+        ChatbotTerminationStrategy,
+        AutomatedWorkflowSelectionStrategy,
+        AutomatedWorkflowTerminationStrategy,
+    )
+    from .agent_manager import (
+        create_or_reuse_agent,
+    )
+
+# Exported name -> submodule; submodules are imported on first access
+_LAZY = {
+    'CONTRACT_PARSER_AGENT': 'agent_definitions_new',
+    'LEGAL_RESEARCH_AGENT': 'agent_definitions_new',
+    'COMPLIANCE_CHECKER_AGENT': 'agent_definitions_new',
+    'RISK_ASSESSMENT_AGENT': 'agent_definitions_new',
+    'LEGAL_MEMO_AGENT': 'agent_definitions_new',
+    'ASSISTANT_AGENT': 'agent_definitions_new',
+    'get_agent_config': 'agent_definitions_new',
+    'get_agent_instructions': 'agent_definitions_new',
+    'list_agents': 'agent_definitions_new',
+    'select_agent': 'agent_strategies_new',
+    'get_agent_sequence': 'agent_strategies_new',
+    'AgentOrchestrator': 'agent_strategies_new',
+    'SCHEDULER_AGENT': 'agent_definitions',
+    'REPORTING_AGENT': 'agent_definitions',
+    'POLITICAL_RISK_AGENT': 'agent_definitions',
+    'TARIFF_RISK_AGENT': 'agent_definitions',
+    'LOGISTICS_RISK_AGENT': 'agent_definitions',
+    'SCHEDULER_AGENT_INSTRUCTIONS': 'agent_definitions',
+    'REPORTING_AGENT_INSTRUCTIONS': 'agent_definitions',
+    'ASSISTANT_AGENT_INSTRUCTIONS': 'agent_definitions',
+    'ChatbotSelectionStrategy': 'agent_strategies',
+    'ChatbotTerminationStrategy': 'agent_strategies',
+    'AutomatedWorkflowSelectionStrategy': 'agent_strategies',
+    'AutomatedWorkflowTerminationStrategy': 'agent_strategies',
+    'create_or_reuse_agent': 'agent_manager',
+}
+
+__all__ = (
+    'ASSISTANT_AGENT',
+    'AgentOrchestrator',
+    'COMPLIANCE_CHECKER_AGENT',
     'CONTRACT_PARSER_AGENT',
+    'LEGAL_MEMO_AGENT',
     'LEGAL_RESEARCH_AGENT',
-    'COMPLIANCE_CHECKER_AGENT',
     'RISK_ASSESSMENT_AGENT',
-    'LEGAL_MEMO_AGENT',
-    'ASSISTANT_AGENT',
     'get_agent_config',
+    'get_agent_instructions',
+    'get_agent_sequence',
     'list_agents',
-]
+    'select_agent',
+)
+
+
+def __getattr__(name):
+    """Import the submodule that defines ``name`` on first access."""
+    if name in _LAZY:
+        module = import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
@@ -0,0 +1,114 @@
+"""Regenerate ``agents/__init__.py`` from the export table below.
+
+Run with: python agents/_generate_init.py
+
+Keeps ``__all__``, the TYPE_CHECKING import block and the ``_LAZY`` lookup
+table in sync so a new export only has to be added in one place.
+"""
+
+from pathlib import Path
+
+# Submodule -> names re-exported from the package. Names listed under
+# PUBLIC are part of ``__all__``; LEGACY names (semantic-kernel stack) are
+# importable from the package but excluded from ``import *``.
+PUBLIC = {
+    "agent_definitions_new": [
+        "CONTRACT_PARSER_AGENT",
+        "LEGAL_RESEARCH_AGENT",
+        "COMPLIANCE_CHECKER_AGENT",
+        "RISK_ASSESSMENT_AGENT",
+        "LEGAL_MEMO_AGENT",
+        "ASSISTANT_AGENT",
+        "get_agent_config",
+        "get_agent_instructions",
+        "list_agents",
+    ],
+    "agent_strategies_new": [
+        "select_agent",
+        "get_agent_sequence",
+        "AgentOrchestrator",
+    ],
+}
+
+LEGACY = {
+    "agent_definitions": [
+        "SCHEDULER_AGENT",
+        "REPORTING_AGENT",
+        "POLITICAL_RISK_AGENT",
+        "TARIFF_RISK_AGENT",
+        "LOGISTICS_RISK_AGENT",
+        "SCHEDULER_AGENT_INSTRUCTIONS",
+        "REPORTING_AGENT_INSTRUCTIONS",
+        "ASSISTANT_AGENT_INSTRUCTIONS",
+    ],
+    "agent_strategies": [
+        "ChatbotSelectionStrategy",
+        "ChatbotTerminationStrategy",
+        "AutomatedWorkflowSelectionStrategy",
+        "AutomatedWorkflowTerminationStrategy",
+    ],
+    "agent_manager": [
+        "create_or_reuse_agent",
+    ],
+}
+
+TEMPLATE = '''"""Agent module initialization.
+
+Generated by agents/_generate_init.py -- edit the export table there and
+re-run the script instead of editing this file by hand.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+{type_checking}
+
+# Exported name -> submodule; submodules are imported on first access
+_LAZY = {{
+{lazy}
+}}
+
+__all__ = (
+{all}
+)
+
+
+def __getattr__(name):
+    """Import the submodule that defines ``name`` on first access."""
+    if name in _LAZY:
+        module = import_module(f".{{_LAZY[name]}}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {{__name__!r}} has no attribute {{name!r}}")
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
+'''
+
+
+def render() -> str:
+    """Render the package ``__init__`` source."""
+    exports = {**PUBLIC, **LEGACY}
+    type_checking = []
+    lazy = []
+    for module, names in exports.items():
+        type_checking.append(f"    from .{module} import (")
+        type_checking.extend(f"        {name}," for name in names)
+        type_checking.append("    )")
+        lazy.extend(f"    '{name}': '{module}'," for name in names)
+    public = sorted(name for names in PUBLIC.values() for name in names)
+    return TEMPLATE.format(
+        type_checking="\n".join(type_checking),
+        lazy="\n".join(lazy),
+        all="\n".join(f"    '{name}'," for name in public),
+    )
+
+
+if __name__ == "__main__":
+    target = Path(__file__).with_name("__init__.py")
+    target.write_text(render(), encoding="utf-8")
+    print(f"Wrote {target}")
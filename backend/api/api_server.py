@@ -16,7 +16,7 @@ dotenv.load_dotenv()
 
 # Try to import modules from our application
 try:
-    from config.settings import get_database_connection_string
+    from config.settings import get_database_connection_string, prewarm_project_client
     from managers.chatbot_manager import ChatbotManager
 
     modules_imported = True
@@ -26,6 +26,18 @@ except ImportError as e:
 
 app = FastAPI(title="Equipment Schedule Agent API")
 
+
+@app.on_event("startup")
+async def startup_event():
+    """Warm up the Azure AI Project client before serving requests."""
+    if not modules_imported:
+        return
+    try:
+        await asyncio.to_thread(prewarm_project_client)
+        print("Azure AI Project client warmed up")
+    except Exception as e:
+        print(f"Project client warm-up failed: {e}")
+
 # Store active chatbot managers
 active_managers: Dict[str, ChatbotManager] = {}
 
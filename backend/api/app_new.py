@@ -29,13 +29,18 @@ from fastapi.middleware.gzip import GZipMiddleware
 
 from config.settings import get_settings
 from managers.chatbot_manager_new import get_chatbot_manager
+from services.firestore_service import get_firestore_service
+from services.storage_service import get_storage_service
+from tools.contract_tools import shutdown_extraction_pool
 from api.endpoints_new import router
 from utils.error_handlers import (
     api_error_handler,
     validation_exception_handler,
     general_exception_handler,
     APIError,
+    FastJSONResponse,
 )
+from utils.request_helpers import BodySizeLimitMiddleware
 
 
 @asynccontextmanager
@@ -86,6 +91,21 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         print(f"⚠️ Cleanup error: {e}")
     
+    # Write any queued contract metadata updates
+    try:
+        await get_firestore_service().contract_writes.wait_drained()
+    except Exception as e:
+        print(f"⚠️ Contract update flush error: {e}")
+    
+    # Close the storage service's HTTP session
+    try:
+        await get_storage_service().close()
+    except Exception as e:
+        print(f"⚠️ Storage shutdown error: {e}")
+    
+    # Stop PDF extraction worker processes
+    shutdown_extraction_pool()
+    
     await asyncio.sleep(0.5)
     print("Shutdown complete")
 
@@ -96,13 +116,22 @@ app = FastAPI(
     description="AI-powered legal contract analysis and research",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 # Add GZIP compression for responses
 app.add_middleware(GZipMiddleware, minimum_size=1000)
 
-# Add CORS middleware
 settings = get_settings()
+
+# Reject oversized request bodies while they stream in (inside CORS, so the
+# 413 still carries CORS headers)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=settings.max_request_size_mb * 1024 * 1024,
+)
+
+# Add CORS middleware
 allowed_origins = [
     origin.strip()
     for origin in settings.allowed_origins.split(",")
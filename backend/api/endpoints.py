@@ -1,6 +1,6 @@
 """API endpoints for the equipment schedule agent."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from config.settings import get_database_connection_string
@@ -77,12 +77,17 @@ async def get_risk_summary():
 @router.get("/schedule/comparison")
 async def get_schedule_comparison(equipment_code: str = None, project_code: str = None):
     """Gets schedule comparison data."""
+    # The plugin cannot filter; refuse rather than return unfiltered rows
+    if equipment_code or project_code:
+        raise HTTPException(
+            status_code=400,
+            detail="Filtering by equipment_code or project_code is not supported",
+        )
+    
     connection_string = get_database_connection_string()
     from plugins.schedule_plugin import EquipmentSchedulePlugin
     schedule_plugin = EquipmentSchedulePlugin(connection_string)
     
-    result = schedule_plugin.get_schedule_comparison_data(
-        equipment_code=equipment_code,
-        project_code=project_code
-    )
+    # Run the query off the event loop
+    result = await schedule_plugin.get_schedule_comparison_data_async()
     return result
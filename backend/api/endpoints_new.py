@@ -16,8 +16,8 @@ import logging
 
 from managers.chatbot_manager_new import get_chatbot_manager, ChatbotManager
 from config.settings import get_settings
-from services.firestore_service import FirestoreService
-from services.storage_service import StorageService
+from services.firestore_service import build_search_fields, get_firestore_service, without_search_fields
+from services.storage_service import get_storage_service
 from tools.contract_tools import extract_contract_text
 from agents.agent_definitions_new import list_agents, AGENT_CONFIGS
 from agents.agent_strategies_new import list_workflow_templates
@@ -265,7 +265,7 @@ async def get_session(session_id: str, limit: int = 100):
         chatbot = get_chatbot_manager()
         history = await chatbot.get_session_history(session_id, limit=limit)
         
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         session = await firestore.get_session(session_id)
         
         return {
@@ -308,7 +308,7 @@ async def list_sessions(limit: int = 50):
         List of session information
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         try:
             sessions = await firestore.list_sessions(limit=limit)
         except Exception as query_error:
@@ -361,7 +361,7 @@ async def upload_contract(
         contract_id = str(uuid.uuid4())
         
         # Upload to Cloud Storage
-        storage = StorageService()
+        storage = get_storage_service()
         content = await file.read()
         file_url = await storage.upload_contract_pdf(
             io.BytesIO(content),
@@ -379,7 +379,7 @@ async def upload_contract(
                 party_list = [p.strip() for p in parties.split(',')]
         
         # Save metadata to Firestore
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         contract_data = {
             "id": contract_id,
             "name": name,
@@ -397,6 +397,8 @@ async def upload_contract(
             "compliance_status": None,
             "key_dates": [],
             "clauses": [],
+            # Title-only until the text is extracted
+            **build_search_fields(name, ""),
         }
         await firestore.create_document(firestore.CONTRACTS, contract_data, document_id=contract_id)
 
@@ -441,18 +443,15 @@ async def list_contracts(
         List of contracts
     """
     try:
-        firestore = FirestoreService()
-        filters = {}
-        if status:
-            filters["status"] = status
-        if contract_type:
-            filters["type"] = contract_type
-            
-        contracts = await firestore.list_contracts(filters)
+        firestore = get_firestore_service()
+        contracts = await firestore.list_contracts(
+            status=status,
+            contract_type=contract_type,
+        )
         
         return {
             "success": True,
-            "contracts": contracts,
+            "contracts": [without_search_fields(c) for c in contracts],
             "count": len(contracts),
         }
     except Exception as e:
@@ -470,7 +469,7 @@ async def get_contract(contract_id: str):
         Contract details and metadata
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         contract = await firestore.get_contract(contract_id)
         
         if not contract:
@@ -478,7 +477,7 @@ async def get_contract(contract_id: str):
         
         return {
             "success": True,
-            "contract": contract,
+            "contract": without_search_fields(contract),
         }
     except HTTPException:
         raise
@@ -497,8 +496,8 @@ async def delete_contract(contract_id: str):
         Deletion confirmation
     """
     try:
-        firestore = FirestoreService()
-        storage = StorageService()
+        firestore = get_firestore_service()
+        storage = get_storage_service()
         
         # Get contract to find file path
         contract = await firestore.get_contract(contract_id)
@@ -533,13 +532,13 @@ async def download_contract(contract_id: str):
         Signed download URL
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         contract = await firestore.get_contract(contract_id)
         
         if not contract:
             raise HTTPException(status_code=404, detail="Contract not found")
         
-        storage = StorageService()
+        storage = get_storage_service()
         blob_path = contract.get("file_url")
         if not blob_path:
             blob_path = f"{storage.settings.gcs_contracts_folder}/{contract['filename']}"
@@ -568,7 +567,7 @@ async def get_contract_clauses(contract_id: str):
         List of clauses with analysis
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         clauses = await firestore.get_contract_clauses(contract_id)
         
         return {
@@ -679,7 +678,7 @@ async def get_thinking_logs(session_id: str):
         List of thinking log entries
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         logs = await firestore.get_thinking_logs(session_id)
         
         return {
@@ -707,7 +706,7 @@ async def list_documents(contract_id: Optional[str] = None):
         List of documents
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         filters = {}
         if contract_id:
             filters["contract_id"] = contract_id
@@ -734,13 +733,13 @@ async def download_document(document_id: str):
         Signed download URL
     """
     try:
-        firestore = FirestoreService()
+        firestore = get_firestore_service()
         document = await firestore.get_document(document_id)
         
         if not document:
             raise HTTPException(status_code=404, detail="Document not found")
         
-        storage = StorageService()
+        storage = get_storage_service()
         download_url = await storage.get_signed_url(document["file_path"])
         
         return {
@@ -1,18 +1,61 @@
 """Configuration module initialization."""
 
-try:
-    from .settings import get_settings
-    
-    # Backwards compatibility alias
-    def initialize_ai_agent_settings():
-        """Backwards compatible function (deprecated)."""
-        return get_settings()
-    
-except ImportError:
-    initialize_ai_agent_settings = None
-    get_settings = None
-
-__all__ = [
-    'initialize_ai_agent_settings',
+import warnings
+from importlib import import_module
+from importlib.util import find_spec
+
+__all__ = (
+    'get_database_connection_string',
+    'get_project_client',
     'get_settings',
-]
\ No newline at end of file
+    'initialize_ai_agent_settings',
+)
+_EXPORTS = frozenset(__all__)
+
+# Check that settings.py can be imported without executing it; the Azure
+# SDKs are imported inside the legacy helpers, so only pydantic-settings is
+# needed at import time.
+SETTINGS_AVAILABLE = find_spec('pydantic_settings') is not None
+
+
+def _unavailable(name):
+    """Build a stand-in that raises a clear ImportError when called."""
+    def helper(*args, **kwargs):
+        raise ImportError(
+            f"config.{name} is unavailable: config.settings requires "
+            "pydantic-settings (pip install -r requirements.txt)"
+        )
+    helper.__name__ = name
+    return helper
+
+
+if not SETTINGS_AVAILABLE:
+    initialize_ai_agent_settings = _unavailable('initialize_ai_agent_settings')
+    get_settings = _unavailable('get_settings')
+    get_database_connection_string = _unavailable('get_database_connection_string')
+    get_project_client = _unavailable('get_project_client')
+
+
+def __getattr__(name):
+    """Resolve public names from ``config.settings`` on first access.
+
+    The resolved object is cached in the package globals, so later lookups
+    (and the deprecation warning below) happen only once.
+    """
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if name == 'initialize_ai_agent_settings':
+        warnings.warn(
+            "config.initialize_ai_agent_settings is deprecated; import it from "
+            "config.settings, or use get_settings() for the Google Cloud settings",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    value = getattr(import_module('.settings', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
@@ -4,7 +4,9 @@ Google Cloud / Vertex AI Configuration
 """
 
 import os
-from typing import Optional
+from importlib import import_module
+from types import MappingProxyType
+from typing import Mapping, Optional
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import field_validator, Field
@@ -58,6 +60,12 @@ class Settings(BaseSettings):
     
     # Rate Limiting
     rate_limit_requests_per_minute: int = 30
+    
+    # Largest request body accepted, e.g. a contract PDF upload
+    max_request_size_mb: int = 25
+    
+    # Worker processes for parsing large PDFs (capped at the available CPUs)
+    pdf_extraction_workers: int = 2
 
     # Caching
     response_cache_ttl_seconds: int = 60
@@ -140,4 +148,169 @@ def validate_settings() -> bool:
             "Please check your .env file."
         )
     
-    return True
\ No newline at end of file
+    return True
+
+
+# -----------------------------------------------------------------------------
+# Legacy Azure AI Agent helpers
+# -----------------------------------------------------------------------------
+# The Azure SDKs are only needed by the legacy semantic-kernel managers and
+# plugins, so they are imported inside the helpers (or on attribute access via
+# ``__getattr__``) instead of at module import time.
+
+_LAZY_IMPORTS: dict[str, tuple[str, str]] = {
+    "AzureAIAgentSettings": ("semantic_kernel.agents", "AzureAIAgentSettings"),
+    "AIProjectClient": ("azure.ai.projects", "AIProjectClient"),
+    "DefaultAzureCredential": ("azure.identity", "DefaultAzureCredential"),
+}
+
+
+def __getattr__(name: str):
+    """Resolve Azure SDK names on first access (PEP 562)."""
+    try:
+        module_name, attr = _LAZY_IMPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name), attr)
+    globals()[name] = value
+    return value
+
+
+_LEGACY_ENV_VARS = (
+    "AZURE_AI_AGENT_PROJECT_NAME",
+    "AZURE_AI_AGENT_PROJECT_CONNECTION_STRING",
+    "AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME",
+    "DB_CONNECTION_STRING",
+)
+
+
+@lru_cache(maxsize=1)
+def _env() -> Mapping[str, str]:
+    """Snapshot the legacy environment variables in a single ``os.environ`` pass.
+    
+    Call ``_env.cache_clear()`` after changing the environment (e.g. in tests).
+    """
+    environ = os.environ
+    return MappingProxyType({k: environ[k] for k in _LEGACY_ENV_VARS if k in environ})
+
+
+def _require_env(*names: str) -> Mapping[str, str]:
+    """Return the environment snapshot, raising if any of ``names`` is unset.
+    
+    Raises:
+        ValueError: Listing every missing variable at once
+    """
+    env = _env()
+    missing = [name for name in names if not env.get(name)]
+    if missing:
+        raise ValueError(
+            f"Missing required environment variables: {', '.join(missing)}. "
+            "Please check your .env file."
+        )
+    return env
+
+
+@lru_cache(maxsize=1)
+def get_database_connection_string() -> Optional[str]:
+    """Get the SQL database connection string used by the legacy plugins.
+    
+    The value is cached; call ``get_database_connection_string.cache_clear()``
+    after changing the environment (e.g. in tests).
+    
+    Returns:
+        Optional[str]: The DB_CONNECTION_STRING value, if set
+    """
+    return _env().get("DB_CONNECTION_STRING")
+
+
+def initialize_ai_agent_settings():
+    """Build the Azure AI Agent settings for the legacy chatbot managers.
+    
+    Settings objects are memoized on the (project name, connection string,
+    model deployment) triple, so repeated calls - including after
+    ``_env.cache_clear()`` when the values did not change - skip Pydantic
+    validation and return the same instance.
+    
+    Returns:
+        AzureAIAgentSettings: Azure AI Agent settings
+        
+    Raises:
+        ValueError: If the project connection string or model deployment is missing
+    """
+    env = _require_env(
+        "AZURE_AI_AGENT_PROJECT_CONNECTION_STRING",
+        "AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME",
+    )
+    return _build_ai_agent_settings(
+        env.get("AZURE_AI_AGENT_PROJECT_NAME"),
+        env["AZURE_AI_AGENT_PROJECT_CONNECTION_STRING"],
+        env["AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"],
+    )
+
+
+@lru_cache(maxsize=4)
+def _build_ai_agent_settings(
+    project_name: Optional[str],
+    service_connection_string: str,
+    model_deployment_name: str,
+):
+    """Construct and validate ``AzureAIAgentSettings`` once per value triple."""
+    from semantic_kernel.agents import AzureAIAgentSettings
+    
+    return AzureAIAgentSettings(
+        project_name=project_name,
+        service_connection_string=service_connection_string,
+        model_deployment_name=model_deployment_name,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_project_client():
+    """Get the shared Azure AI Project client for the legacy logging plugin.
+    
+    The client is created once per process so its credential and HTTP
+    connection pool are reused. Callers must not close it (e.g. by using it
+    as a context manager).
+    
+    Returns:
+        AIProjectClient: Azure AI Project client
+        
+    Raises:
+        ValueError: If the project connection string is missing
+    """
+    env = _require_env("AZURE_AI_AGENT_PROJECT_CONNECTION_STRING")
+    
+    from azure.ai.projects import AIProjectClient
+    
+    return AIProjectClient.from_connection_string(
+        credential=_get_azure_credential(),
+        conn_str=env["AZURE_AI_AGENT_PROJECT_CONNECTION_STRING"],
+    )
+
+
+@lru_cache(maxsize=1)
+def _get_azure_credential():
+    """Get the shared Azure credential used by the project client."""
+    from azure.identity import DefaultAzureCredential
+    
+    # Skip credential sources this app never uses so the chain does not
+    # probe them (IMDS / environment / VS Code / shared cache lookups).
+    return DefaultAzureCredential(
+        exclude_environment_credential=True,
+        exclude_managed_identity_credential=True,
+        exclude_visual_studio_code_credential=True,
+        exclude_shared_token_cache_credential=True,
+    )
+
+
+def prewarm_project_client() -> None:
+    """Create the shared project client and open its connections up front.
+    
+    Acquires a token (priming the credential cache) and issues a cheap
+    list call so the first user request does not pay for SDK import,
+    credential discovery and the TLS handshake. Meant to be called once at
+    application startup, off the event loop.
+    """
+    client = get_project_client()
+    _get_azure_credential().get_token("https://cognitiveservices.azure.com/.default")
+    client.agents.list_agents(limit=1)
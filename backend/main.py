@@ -15,8 +15,11 @@ backend_dir = Path(__file__).parent
 load_dotenv(backend_dir / ".env.local")
 load_dotenv(backend_dir / ".env")
 
-# Expose ASGI app for Cloud Run buildpacks (expects main:app)
-from api.app_new import app as app
+# Expose ASGI app for Cloud Run buildpacks (expects main:app). Spawned PDF
+# extraction workers re-import this file as __mp_main__ and must not load
+# the whole API.
+if __name__ != "__mp_main__":
+    from api.app_new import app as app
 
 
 def main():
@@ -1,13 +1,35 @@
 """Managers module initialization."""
 
-try:
-    from .chatbot_manager_new import ChatbotManager
-except ImportError:
-    try:
-        from .chatbot_manager import ChatbotManager
-    except ImportError:
-        ChatbotManager = None
-
-__all__ = [
+from importlib import import_module
+
+__all__ = (
     'ChatbotManager',
-]
+)
+
+
+def __getattr__(name):
+    """Resolve ``ChatbotManager`` on first access.
+
+    Prefers the Gemini-based ``chatbot_manager_new`` and falls back to the
+    legacy ``chatbot_manager``.
+    """
+    if name != 'ChatbotManager':
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    errors = []
+    for module_name in ('.chatbot_manager_new', '.chatbot_manager'):
+        try:
+            module = import_module(module_name, __name__)
+        except ImportError as e:
+            errors.append(f"{module_name.lstrip('.')}: {e}")
+            continue
+        value = module.ChatbotManager
+        globals()[name] = value
+        return value
+
+    raise ImportError("Could not import ChatbotManager (" + "; ".join(errors) + ")")
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
@@ -13,9 +13,9 @@ from dotenv import load_dotenv
 from typing import Dict, List, Any, Optional
 
 from config.settings import get_settings
-from services.gemini_service import GeminiService
-from services.firestore_service import FirestoreService
-from services.storage_service import StorageService
+from services.gemini_service import get_gemini_service
+from services.firestore_service import BatchWriteError, FirestoreService, get_firestore_service
+from services.storage_service import get_storage_service
 from agents.agent_definitions_new import (
     CONTRACT_PARSER_AGENT,
     LEGAL_RESEARCH_AGENT,
@@ -117,9 +117,9 @@ class ChatbotManager:
         self.settings = get_settings()
         
         # Initialize services
-        self.gemini = GeminiService()
-        self.firestore = FirestoreService()
-        self.storage = StorageService()
+        self.gemini = get_gemini_service()
+        self.firestore = get_firestore_service()
+        self.storage = get_storage_service()
 
         # Thinking logger (lightweight)
         self.thinking_logger = _SimpleThinkingLogger(self.firestore)
@@ -598,6 +598,20 @@ class ChatbotManager:
                         "result": result,
                     })
                 
+                # Write any coalesced contract updates before the model sees the
+                # results, and turn failed ones into tool errors
+                try:
+                    await self.firestore.contract_writes.wait_drained()
+                except BatchWriteError as e:
+                    for fc, function_result in zip(function_calls, function_results):
+                        contract_id = fc.get("arguments", {}).get("contract_id")
+                        error = e.errors.get(contract_id)
+                        if fc["name"] == "update_contract_metadata" and error is not None:
+                            function_result["result"] = {
+                                "status": "error",
+                                "message": f"Failed to update contract: {error}"
+                            }
+                
                 # Continue conversation with function results
                 response = await self.gemini.continue_with_function_results(
                     function_results=function_results,
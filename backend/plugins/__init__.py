@@ -1,17 +1,46 @@
 """Plugins module initialization."""
 
-from .schedule_plugin import EquipmentSchedulePlugin
-from .risk_plugin import RiskCalculationPlugin
-from .logging_plugin import LoggingPlugin
-from .report_file_plugin import ReportFilePlugin
-from .political_risk_json_plugin import PoliticalRiskJsonPlugin
-from .citation_handler_plugin import CitationLoggerPlugin
-
-__all__ = [
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .schedule_plugin import EquipmentSchedulePlugin
+    from .risk_plugin import RiskCalculationPlugin
+    from .logging_plugin import LoggingPlugin
+    from .report_file_plugin import ReportFilePlugin
+    from .political_risk_json_plugin import PoliticalRiskJsonPlugin
+    from .citation_handler_plugin import CitationLoggerPlugin
+
+# Plugin class name -> submodule; each plugin is imported on first access
+_LAZY = {
+    'EquipmentSchedulePlugin': 'schedule_plugin',
+    'RiskCalculationPlugin': 'risk_plugin',
+    'LoggingPlugin': 'logging_plugin',
+    'ReportFilePlugin': 'report_file_plugin',
+    'PoliticalRiskJsonPlugin': 'political_risk_json_plugin',
+    'CitationLoggerPlugin': 'citation_handler_plugin',
+}
+
+__all__ = (
+    'CitationLoggerPlugin',
     'EquipmentSchedulePlugin',
-    'RiskCalculationPlugin',
     'LoggingPlugin',
-    'ReportFilePlugin',
     'PoliticalRiskJsonPlugin',
-    'CitationLoggerPlugin'
-]
\ No newline at end of file
+    'ReportFilePlugin',
+    'RiskCalculationPlugin',
+)
+
+
+def __getattr__(name):
+    """Import the plugin module that defines ``name`` on first access."""
+    if name in _LAZY:
+        module = import_module(f".{_LAZY[name]}", __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
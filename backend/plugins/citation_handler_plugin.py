@@ -1,8 +1,11 @@
 """Plugin for retrieving and formatting citations from Bing search."""
 
 import json
+import logging
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+logger = logging.getLogger(__name__)
+
 class CitationLoggerPlugin:
     """A plugin for retrieving and formatting citations from Bing search."""
     
@@ -40,9 +43,7 @@ class CitationLoggerPlugin:
             })
                 
         except Exception as e:
-            print(f"Error in get_formatted_citations: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in get_formatted_citations: %s", e)
             return json.dumps({
                 "error": str(e),
                 "success": False,
@@ -70,42 +71,39 @@ class CitationLoggerPlugin:
             project_client = get_project_client()
             
             if not project_client:
-                print("Failed to get project client")
+                logger.error("Failed to get project client")
                 return []
             
             citations = []
             
-            # Get the response message from the thread
-            with project_client:
-                response_messages = project_client.agents.list_messages(thread_id=thread_id)
-                response_message = response_messages.get_last_message_by_role("assistant")
-                
-                if not response_message:
-                    print(f"No response message found in thread {thread_id}")
-                    return []
-                
-                # Extract citations
-                if hasattr(response_message, 'url_citation_annotations') and response_message.url_citation_annotations:
-                    for annotation in response_message.url_citation_annotations:
-                        citation = {
-                            "title": annotation.url_citation.title,
-                            "url": annotation.url_citation.url,
-                            "source": self._extract_source_from_title(annotation.url_citation.title)
-                        }
-                        citations.append(citation)
-                        
-                    # Cache the citations
-                    self._cached_citations[thread_id] = citations
-                    print(f"Retrieved and cached {len(citations)} citations from thread {thread_id}")
-                else:
-                    print(f"No citation annotations found in thread {thread_id}")
+            # Get the response message from the thread (the shared client must stay open)
+            response_messages = project_client.agents.list_messages(thread_id=thread_id)
+            response_message = response_messages.get_last_message_by_role("assistant")
+            
+            if not response_message:
+                logger.warning("No response message found in thread %s", thread_id)
+                return []
+            
+            # Extract citations
+            if hasattr(response_message, 'url_citation_annotations') and response_message.url_citation_annotations:
+                for annotation in response_message.url_citation_annotations:
+                    citation = {
+                        "title": annotation.url_citation.title,
+                        "url": annotation.url_citation.url,
+                        "source": self._extract_source_from_title(annotation.url_citation.title)
+                    }
+                    citations.append(citation)
+                    
+                # Cache the citations
+                self._cached_citations[thread_id] = citations
+                logger.info("Retrieved and cached %d citations from thread %s", len(citations), thread_id)
+            else:
+                logger.warning("No citation annotations found in thread %s", thread_id)
             
             return citations
             
         except Exception as e:
-            print(f"Error getting citations from thread: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error getting citations from thread: %s", e)
             return []
     
     def _extract_source_from_title(self, title):
@@ -169,12 +167,12 @@ class CitationLoggerPlugin:
             citations = self._get_citations_from_thread(thread_id)
             
             if not citations:
-                print("No citations found, returning original output")
+                logger.warning("No citations found, returning original output")
                 return agent_output
             
             # Check if the output already has a References section
             if "### References" in agent_output:
-                print("Output already has References section, replacing it")
+                logger.info("Output already has References section, replacing it")
                 
                 # Replace the existing References section
                 import re
@@ -185,7 +183,7 @@ class CitationLoggerPlugin:
                 return enhanced_output
             else:
                 # Add the References section at the end
-                print("Adding References section to output")
+                logger.info("Adding References section to output")
                 references_section = self._format_citations_as_markdown(citations)
                 
                 # Make sure there's a newline before adding references
@@ -197,7 +195,5 @@ class CitationLoggerPlugin:
                 return enhanced_output
                 
         except Exception as e:
-            print(f"Error enhancing political risk output: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error enhancing political risk output: %s", e)
             return agent_output  # Return original output in case of error
\ No newline at end of file
@@ -1,11 +1,14 @@
 """Consolidated logging plugin for all agent and event logging."""
 
 import json
+import logging
 import uuid
 import pyodbc
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 from azure.ai.projects import AIProjectClient
 
+logger = logging.getLogger(__name__)
+
 class LoggingPlugin:
     """A consolidated plugin for all logging functions."""
     
@@ -30,7 +33,7 @@ class LoggingPlugin:
             # Otherwise, return placeholder
             return "AGENT_ID_NOT_SET"
         except Exception as e:
-            print(f"Error in log_agent_get_agent_id: {e}")
+            logger.error("Error in log_agent_get_agent_id: %s", e)
             return "AGENT_ID_ERROR"
     
     def set_agent_id(self, agent_id: str):
@@ -42,7 +45,7 @@ class LoggingPlugin:
         try:
             self._current_agent_id = agent_id
         except Exception as e:
-            print(f"Error in set_agent_id: {e}")
+            logger.error("Error in set_agent_id: %s", e)
     
     @kernel_function(description="Retrieve agent thread id")
     def log_agent_get_thread_id(self) -> str:
@@ -64,40 +67,39 @@ class LoggingPlugin:
                     project_client = get_project_client()
                     thread_id = None
     
-                    # Get the thread id
-                    with project_client:
-                        try:
-                            threads_list = project_client.agents.list_threads(limit=1)
-                            if hasattr(threads_list, 'first_id'):
-                                thread_id = threads_list.first_id
-                            elif hasattr(threads_list, 'data') and threads_list.data:
-                                thread_id = threads_list.data[0].id
-                            else:
-                                # Handle different response formats
-                                threads_data = getattr(threads_list, 'data', None) or []
-                                if threads_data and len(threads_data) > 0:
-                                    thread_id = threads_data[0].get('id')
-                            
-                            print(f"Thread ID From Logging Plugin: {thread_id}")
-                            
-                            # Cache the thread ID for future use
-                            if thread_id:
-                                self._current_thread_id = thread_id
-                        except Exception as e:
-                            print(f"Error getting thread ID from client: {e}")
-                            return "thread_id_not_available"
-                    
+                    # Get the thread id (the shared client must stay open)
+                    try:
+                        threads_list = project_client.agents.list_threads(limit=1)
+                        if hasattr(threads_list, 'first_id'):
+                            thread_id = threads_list.first_id
+                        elif hasattr(threads_list, 'data') and threads_list.data:
+                            thread_id = threads_list.data[0].id
+                        else:
+                            # Handle different response formats
+                            threads_data = getattr(threads_list, 'data', None) or []
+                            if threads_data and len(threads_data) > 0:
+                                thread_id = threads_data[0].get('id')
+                        
+                        logger.debug("Thread ID From Logging Plugin: %s", thread_id)
+                        
+                        # Cache the thread ID for future use
+                        if thread_id:
+                            self._current_thread_id = thread_id
+                    except Exception as e:
+                        logger.error("Error getting thread ID from client: %s", e)
+                        return "thread_id_not_available"
+                
                     return thread_id or "thread_id_not_found"
                     
                 except Exception as e:
-                    print(f"Error getting project client: {e}")
+                    logger.error("Error getting project client: %s", e)
                     return "thread_id_not_available_client_error"
             except ImportError:
-                print("Could not import get_project_client")
+                logger.error("Could not import get_project_client")
                 return "thread_id_import_error"
                 
         except Exception as e:
-            print(f"Error getting thread ID: {e}")
+            logger.error("Error getting thread ID: %s", e)
             return "thread_id_error"
     
     @kernel_function(description="Log the agent's thinking process with improved error handling")
@@ -140,7 +142,7 @@ class LoggingPlugin:
                 try:
                     thread_id = self.log_agent_get_thread_id()
                 except Exception as e:
-                    print(f"Error getting thread ID: {e}")
+                    logger.error("Error getting thread ID: %s", e)
                     thread_id = "thread_id_retrieval_error"
             
             # If azure_agent_id is None or "Get by calling log_agent_get_agent_id()", try to get it
@@ -148,7 +150,7 @@ class LoggingPlugin:
                 try:
                     azure_agent_id = self.log_agent_get_agent_id()
                 except Exception as e:
-                    print(f"Error getting agent ID: {e}")
+                    logger.error("Error getting agent ID: %s", e)
                     azure_agent_id = "agent_id_retrieval_error"
             
             # Handle non-string thinking_stage_output
@@ -203,13 +205,13 @@ class LoggingPlugin:
                 return json.dumps({"success": True, "conversation_id": conversation_id})
                 
             except Exception as db_error:
-                print(f"Database error in log_agent_thinking: {db_error}")
+                logger.error("Database error in log_agent_thinking: %s", db_error)
                 
                 try:
                     # Log to console as fallback
-                    print(f"FALLBACK LOG - Agent: {agent_name}, Stage: {thinking_stage}")
-                    print(f"FALLBACK LOG - Conversation: {conversation_id}, Session: {session_id}")
-                    print(f"FALLBACK LOG - Content: {thought_content[:200]}...")
+                    logger.warning("FALLBACK LOG - Agent: %s, Stage: %s", agent_name, thinking_stage)
+                    logger.warning("FALLBACK LOG - Conversation: %s, Session: %s", conversation_id, session_id)
+                    logger.warning("FALLBACK LOG - Content: %s...", thought_content[:200])
                     
                     return json.dumps({
                         "success": False, 
@@ -218,13 +220,11 @@ class LoggingPlugin:
                         "conversation_id": conversation_id
                     })
                 except Exception as fallback_error:
-                    print(f"Fallback logging error: {fallback_error}")
+                    logger.error("Fallback logging error: %s", fallback_error)
                     return json.dumps({"error": f"Database error: {db_error}, Fallback error: {fallback_error}"})
                 
         except Exception as e:
-            print(f"Error in log_agent_thinking: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in log_agent_thinking: %s", e)
             try:
                 import json
                 return json.dumps({"error": str(e)})
@@ -296,7 +296,7 @@ class LoggingPlugin:
             return json.dumps({"success": True, "conversation_id": conversation_id})
             
         except Exception as e:
-            print(f"Error in log_agent_event: {str(e)}")
+            logger.error("Error in log_agent_event: %s", e)
             return json.dumps({"error": str(e)})
     
     @kernel_function(description="Log an error that occurred during agent thinking")
@@ -407,7 +407,7 @@ class LoggingPlugin:
             return json.dumps(logs, default=str)
             
         except Exception as e:
-            print(f"Error retrieving thinking logs: {e}")
+            logger.error("Error retrieving thinking logs: %s", e)
             return json.dumps({"error": str(e)})
     
     @kernel_function(description="Retrieves conversation history")
@@ -460,7 +460,7 @@ class LoggingPlugin:
             return json.dumps({"conversation_id": conversation_id, "events": events}, default=str)
             
         except Exception as e:
-            print(f"Error in get_conversation_history: {str(e)}")
+            logger.error("Error in get_conversation_history: %s", e)
             return json.dumps({"error": str(e)})
     
     @kernel_function(description="Retrieves recent conversations")
@@ -513,5 +513,5 @@ class LoggingPlugin:
             return json.dumps({"conversations": conversations}, default=str)
             
         except Exception as e:
-            print(f"Error in get_recent_conversations: {str(e)}")
+            logger.error("Error in get_recent_conversations: %s", e)
             return json.dumps({"error": str(e)})
\ No newline at end of file
@@ -1,12 +1,15 @@
 """Plugin for converting political risk output to standardized JSON."""
 
 import json
+import logging
 import uuid
 import re
 import pyodbc
 from datetime import datetime
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+logger = logging.getLogger(__name__)
+
 class PoliticalRiskJsonPlugin:
     """Plugin for converting political risk agent output to JSON and storing in event log."""
     
@@ -108,9 +111,7 @@ class PoliticalRiskJsonPlugin:
             return json.dumps(result, indent=2)
             
         except Exception as e:
-            print(f"Error converting political risk analysis to JSON: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error converting political risk analysis to JSON: %s", e)
             return json.dumps({
                 "error": str(e),
                 "political_risks": [],
@@ -168,9 +169,7 @@ class PoliticalRiskJsonPlugin:
             })
             
         except Exception as e:
-            print(f"Error storing political risk JSON: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error storing political risk JSON: %s", e)
             return json.dumps({
                 "error": str(e),
                 "message": "Failed to store political risk JSON in event log"
@@ -230,7 +229,7 @@ class PoliticalRiskJsonPlugin:
             }, indent=2)
             
         except Exception as e:
-            print(f"Error extracting citations: {e}")
+            logger.error("Error extracting citations: %s", e)
             return json.dumps({
                 "error": str(e),
                 "citations": [],
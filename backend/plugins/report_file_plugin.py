@@ -1,15 +1,26 @@
 """Improved ReportFilePlugin with Spire.Doc.Free integration."""
 
+import hashlib
+import asyncio
 import json
+import logging
 import uuid
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 import pyodbc
 from datetime import datetime
 import re
-import traceback
 import time
-import tempfile
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
+from utils.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Let the ODBC driver manager reuse connections; must be set before the
+# first pyodbc.connect() in the process
+pyodbc.pooling = True
 
 # Import the Spire.Doc library
 try:
@@ -18,18 +29,164 @@ try:
     
     SPIRE_DOC_AVAILABLE = True
 except ImportError:
-    print("Spire.Doc.Free not available. Install with: pip install Spire.Doc.Free")
+    logger.warning("Spire.Doc.Free not available. Install with: pip install Spire.Doc.Free")
     SPIRE_DOC_AVAILABLE = False
 
+if SPIRE_DOC_AVAILABLE:
+    # Document colors (ARGB, alpha first), built once instead of per report
+    # Heading level -> (text color, font size): dark blue for # headings,
+    # medium blue for ## and ### headings, black for #### headings
+    HEADING_FORMATS = {
+        1: (Color.FromArgb(255, 0, 75, 156), 16),
+        2: (Color.FromArgb(255, 58, 124, 193), 14),
+        3: (Color.FromArgb(255, 58, 124, 193), 14),
+        4: (Color.FromArgb(255, 0, 0, 0), 12),
+    }
+    # Used for any deeper heading level
+    DEFAULT_HEADING_FORMAT = (HEADING_FORMATS[4][0], 10)
+    # Used if a heading color cannot be applied
+    HEADING_FALLBACK_COLORS = {
+        1: Color.FromArgb(255, 0, 75, 156),
+        2: Color.FromArgb(255, 58, 124, 193),
+        3: Color.FromArgb(255, 79, 156, 241),
+        4: Color.FromArgb(255, 125, 185, 246),
+    }
+    # Paragraph outline level -> heading level
+    OUTLINE_HEADING_LEVELS = {
+        OutlineLevel.Level1: 1,
+        OutlineLevel.Level2: 2,
+        OutlineLevel.Level3: 3,
+        OutlineLevel.Level4: 4,
+    }
+    # Table formatting
+    BORDER_COLOR = Color.FromArgb(255, 128, 128, 128)  # Gray
+    HEADER_BG_COLOR = Color.FromArgb(255, 240, 240, 240)  # Light gray
+    ZEBRA_STRIPE_COLOR = Color.FromArgb(255, 245, 245, 250)  # Very light blue
+
 # Import Azure storage modules
 try:
     from azure.storage.blob import BlobServiceClient, ContentSettings
     from azure.identity import DefaultAzureCredential
+    from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+    from azure.core.pipeline.transport import RequestsTransport
+    import requests
+    from requests.adapters import HTTPAdapter
     AZURE_STORAGE_AVAILABLE = True
 except ImportError:
-    print("Azure Storage SDK not available. Uploads to data lake will not work.")
+    logger.warning("Azure Storage SDK not available. Uploads to data lake will not work.")
     AZURE_STORAGE_AVAILABLE = False
 
+# Blob client transfer tuning: reports over 4 MiB are split into 8 MiB blocks
+# uploaded in parallel, smaller ones go up in a single PUT. Reports are rarely
+# more than a few tens of MiB, so larger blocks would leave nothing to run
+# in parallel.
+BLOB_CLIENT_OPTIONS = {
+    "max_block_size": 8 * 1024 * 1024,
+    "max_single_put_size": 4 * 1024 * 1024,
+    "connection_timeout": 60,
+}
+BLOB_UPLOAD_CONCURRENCY = int(os.getenv("REPORT_UPLOAD_CONCURRENCY", "8"))
+# Keep enough pooled connections for every parallel block upload; up to
+# REPORT_IO_WORKERS reports upload at once
+BLOB_POOL_SIZE = max(16, 4 * BLOB_UPLOAD_CONCURRENCY)
+# Socket read/write chunk for the transport (the default is 4 KiB)
+BLOB_TRANSPORT_BLOCK_SIZE = 4 * 1024 * 1024
+# Paragraph styles applied to table cells
+TABLE_HEADER_STYLE = "RptTblHdr"
+TABLE_BODY_STYLE = "RptTblBody"
+# Markdown heading marker -> heading level, for paragraphs Spire left as text
+HEADING_PREFIX_LEVELS = {"#": 1, "##": 2, "###": 3, "####": 4}
+# Runs blob uploads alongside the database logging of the same report;
+# threads are only started once an upload is submitted
+REPORT_IO_WORKERS = 4
+REPORT_IO_EXECUTOR = ThreadPoolExecutor(max_workers=REPORT_IO_WORKERS, thread_name_prefix="report-io")
+# Rows pulled per fetchmany() round trip when reading result sets
+DB_FETCH_BATCH_SIZE = 1000
+# Conversation reports remembered by generate_report_from_conversation
+REPORT_CACHE_SIZE = 256
+# Cleanup patterns applied to agent output in generate_report_from_conversation
+REPORTING_PREFIX_RE = re.compile(r'REPORTING_AGENT >\s*')
+AGENT_NAME_BLOCK_RE = re.compile(r'```\s*Agent Name:.*?```', re.DOTALL)
+WORKFLOW_STEP_RE = re.compile(r'\*\*Step \d+:.*?Stage\*\*.*?(?=\*\*Step|\*\*Comprehensive|\Z)', re.DOTALL)
+AGENT_PREFIX_RE = re.compile(r'.*_AGENT >\s*')
+H2_SPLIT_RE = re.compile(r'##\s+')
+# Timestamp line written by generate_report_from_conversation; left out of
+# the content hash that names a report
+GENERATED_ON_RE = re.compile(rb'Generated on: \d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}')
+# Agent name -> report section its output is collected under; the first
+# name contained in a logged agent_name wins
+AGENT_SECTIONS = {
+    "SCHEDULER_AGENT": "schedule_analysis",
+    "POLITICAL_RISK_AGENT": "political_analysis",
+    "TARIFF_RISK_AGENT": "tariff_analysis",
+    "LOGISTICS_RISK_AGENT": "logistics_analysis",
+    "REPORTING_AGENT": "report_generation",
+}
+_AGENT_SECTION_CASE = "CASE " + " ".join(
+    f"WHEN agent_name LIKE '%{name.replace('_', '[_]')}%' THEN '{section}'"
+    for name, section in AGENT_SECTIONS.items()
+) + " END"
+# Every user query of a conversation plus only the longest output per
+# report section, so the rest of the event log never leaves the server
+CONVERSATION_REPORT_SQL = f"""
+    WITH ranked AS (
+        SELECT
+            section,
+            agent_output,
+            ROW_NUMBER() OVER (
+                PARTITION BY section
+                ORDER BY LEN(agent_output) DESC, event_time
+            ) AS rn
+        FROM (
+            SELECT {_AGENT_SECTION_CASE} AS section, agent_output, event_time
+            FROM dim_agent_event_log
+            WHERE conversation_id = ? AND agent_output <> ''
+        ) AS classified
+        WHERE section IS NOT NULL
+    )
+    SELECT 'user_queries' AS section, user_query AS content, event_time
+    FROM dim_agent_event_log
+    WHERE conversation_id = ? AND action = 'User Query' AND user_query <> ''
+    UNION ALL
+    SELECT section, agent_output, NULL
+    FROM ranked
+    WHERE rn = 1
+    ORDER BY section, event_time
+"""
+# Direct insert used when sp_LogRiskReport is unavailable
+REPORT_INSERT_SQL = """
+    INSERT INTO fact_risk_report (
+        session_id, 
+        conversation_id, 
+        filename,
+        blob_url,
+        report_type,
+        created_date
+    )
+    VALUES (?, ?, ?, ?, 'comprehensive', GETDATE())
+"""
+REPORT_LOG_PROCEDURE_SQL = """
+    EXEC sp_LogRiskReport 
+        @session_id = ?,
+        @conversation_id = ?,
+        @filename = ?,
+        @blob_url = ?
+"""
+DOCX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+
+
+def _create_blob_transport():
+    """Create an HTTP transport whose connection pool is shared by all uploads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=BLOB_POOL_SIZE, pool_maxsize=BLOB_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return RequestsTransport(
+        session=session,
+        session_owner=False,
+        connection_data_block_size=BLOB_TRANSPORT_BLOCK_SIZE,
+    )
+
 class ReportFilePlugin:
     """A plugin for creating Word reports and uploading them to data lake."""
     
@@ -41,42 +198,62 @@ class ReportFilePlugin:
             storage_connection_string: Optional storage connection string
         """
         self.connection_string = connection_string
+        # Whether sp_LogRiskReport exists; looked up on the first report log
+        self._has_log_procedure = None
+        # (conversation_id, session_id) -> (latest event_time, result JSON)
+        self._report_cache = OrderedDict()
+        self._report_cache_lock = threading.Lock()
         self.storage_connection_string = storage_connection_string or os.getenv("AZURE_STORAGE_CONNECTION_STRING")
         self.storage_container = os.getenv("AZURE_STORAGE_CONTAINER", "procurement-expediting-risk-reports")
         self.report_directory = os.getenv("REPORT_STORAGE_PATH", "reports")
         
         # Create report directory if it doesn't exist
         try:
-            if not os.path.exists(self.report_directory):
-                os.makedirs(self.report_directory)
-                print(f"Created report directory: {self.report_directory}")
+            os.makedirs(self.report_directory, exist_ok=True)
         except Exception as e:
-            print(f"Error creating report directory: {e}")
+            logger.warning("Error creating report directory: %s", e)
             # Use a default that should always work
             self.report_directory = "."
         
         # Initialize blob service client
         self.blob_service_client = None
+        self.container_client = None
         if AZURE_STORAGE_AVAILABLE:
             try:
+                transport = _create_blob_transport()
                 if self.storage_connection_string:
                     try:
-                        self.blob_service_client = BlobServiceClient.from_connection_string(self.storage_connection_string)
-                        print("Initialized blob service client from connection string")
+                        self.blob_service_client = BlobServiceClient.from_connection_string(
+                            self.storage_connection_string, transport=transport, **BLOB_CLIENT_OPTIONS
+                        )
+                        logger.info("Initialized blob service client from connection string")
                     except Exception as e:
-                        print(f"Error initializing blob service client from connection string: {e}")
+                        logger.error("Error initializing blob service client from connection string: %s", e)
                 elif os.getenv("AZURE_STORAGE_ACCOUNT_NAME"):
                     try:
                         credential = DefaultAzureCredential()
                         account_url = f"https://{os.getenv('AZURE_STORAGE_ACCOUNT_NAME')}.blob.core.windows.net"
-                        self.blob_service_client = BlobServiceClient(account_url, credential=credential)
-                        print("Initialized blob service client from Azure credentials")
+                        self.blob_service_client = BlobServiceClient(
+                            account_url, credential=credential, transport=transport, **BLOB_CLIENT_OPTIONS
+                        )
+                        logger.info("Initialized blob service client from Azure credentials")
                     except Exception as e:
-                        print(f"Error initializing blob service client from Azure credentials: {e}")
+                        logger.error("Error initializing blob service client from Azure credentials: %s", e)
             except Exception as e:
-                print(f"Error initializing blob service client: {e}")
+                logger.error("Error initializing blob service client: %s", e)
+        
+        # Resolve the report container once so every upload reuses it
+        if self.blob_service_client:
+            self.container_client = self.blob_service_client.get_container_client(self.storage_container)
+            try:
+                self.container_client.create_container()
+                logger.info("Created container: %s", self.storage_container)
+            except ResourceExistsError:
+                pass
+            except Exception as container_error:
+                # It might just be a permissions issue; uploads will tell
+                logger.warning("Error with container: %s", container_error)
     
-    @kernel_function(description="Saves a report to Word document and uploads to data lake")
     def save_report_to_file(self, report_content: str, session_id: str, 
                           conversation_id: str, report_title: str = None) -> str:
         """Saves a report to Word document and uploads to data lake with improved error handling.
@@ -90,100 +267,117 @@ class ReportFilePlugin:
         Returns:
             str: JSON string with result information
         """
-        print(f"\n==== REPORT GENERATION STARTED ====")
-        print(f"Report length: {len(report_content)} characters")
-        print(f"Session ID: {session_id}")
-        print(f"Conversation ID: {conversation_id}")
-        print(f"Report title: {report_title}")
+        # Encode once; the bytes feed the document loader directly
+        payload = report_content.encode("utf-8")
+        logger.info(
+            "Report generation started: %d bytes, session %s, conversation %s, title %r",
+            len(payload), session_id, conversation_id, report_title,
+        )
         
         try:
             # Check if Spire.Doc is available
             if not SPIRE_DOC_AVAILABLE:
-                print("Spire.Doc.Free not available. Cannot generate Word document.")
+                logger.error("Spire.Doc.Free not available. Cannot generate Word document.")
                 return json.dumps({
                     "error": "Word document generation is not available. Spire.Doc.Free library is missing.",
                     "success": False,
                     "stage": "initialization"
                 })
             
-            # Generate filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            report_id = str(uuid.uuid4())[:8]
-            docx_filename = f"risk_report_{timestamp}_{report_id}.docx"
+            # Name the report after its content so a retried report maps to
+            # the same blob and can skip rendering and upload entirely. The
+            # "Generated on:" stamp changes on every call and the title is not
+            # rendered, so neither is part of the hash.
+            report_id = hashlib.sha256(GENERATED_ON_RE.sub(b"", payload)).hexdigest()[:16]
+            datestamp = datetime.now().strftime("%Y%m%d")
+            docx_filename = f"risk_report_{datestamp}_{report_id}.docx"
             docx_filepath = os.path.join(self.report_directory, docx_filename)
             
-            # Print debug info
-            print(f"Saving report to file: {docx_filepath}")
-            print(f"Report directory exists: {os.path.exists(self.report_directory)}")
-            print(f"Report directory is writable: {os.access(self.report_directory, os.W_OK)}")
+            blob_client = None
+            if self.container_client and AZURE_STORAGE_AVAILABLE:
+                try:
+                    blob_client = self._get_blob_client(docx_filename)
+                    blob_client.get_blob_properties()
+                except ResourceNotFoundError:
+                    pass
+                except Exception as e:
+                    logger.warning("Could not check for an existing report blob: %s", e)
+                else:
+                    logger.info("Report already uploaded, skipping generation: %s", blob_client.url)
+                    self._log_report(session_id, conversation_id, docx_filename, blob_client.url)
+                    return json.dumps({
+                        "success": True,
+                        "filename": docx_filename,
+                        "filepath": None,
+                        "blob_url": blob_client.url,
+                        "session_id": session_id,
+                        "conversation_id": conversation_id,
+                        "report_id": report_id
+                    })
             
-            # First create a temporary markdown file
-            temp_md_file = None
+            # Render the Word document in memory; the markdown never touches disk
             try:
-                # Create a temporary file to store markdown content
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.md', delete=False) as temp:
-                    temp.write(report_content)
-                    temp_md_file = temp.name
-                    print(f"Created temporary markdown file: {temp_md_file}")
-                    print(f"Temp file exists: {os.path.exists(temp_md_file)}")
-                    print(f"Temp file size: {os.path.getsize(temp_md_file)} bytes")
-                
-                # Generate Word document with detailed error handling
-                print(f"Calling _generate_word_document...")
-                self._generate_word_document(temp_md_file, docx_filepath, report_title)
-                if os.path.exists(docx_filepath):
-                    print(f"Successfully generated Word document: {docx_filepath}")
-                    print(f"Word document size: {os.path.getsize(docx_filepath)} bytes")
-                else:
-                    print(f"WARNING: Word document not found after generation: {docx_filepath}")
+                logger.debug("Calling _generate_word_document...")
+                # Plain-prose reports skip the heading and table passes
+                needs_headings = payload.startswith(b"#") or b"\n#" in payload
+                needs_tables = payload.startswith(b"|") or b"\n|" in payload
+                docx_bytes = self._generate_word_document(
+                    payload, report_title,
+                    needs_headings=needs_headings, needs_tables=needs_tables,
+                )
+                logger.debug("Successfully generated Word document: %d bytes", len(docx_bytes))
             except Exception as word_error:
-                print(f"Error generating Word document: {word_error}")
-                traceback.print_exc()
+                logger.exception("Error generating Word document: %s", word_error)
                 return json.dumps({
                     "error": f"Word document generation failed: {str(word_error)}",
                     "stage": "word_generation",
                     "success": False
                 })
-            finally:
-                # Clean up temporary markdown file
-                if temp_md_file and os.path.exists(temp_md_file):
-                    try:
-                        os.remove(temp_md_file)
-                        print(f"Deleted temporary markdown file: {temp_md_file}")
-                    except Exception as e:
-                        print(f"Error deleting temporary markdown file: {e}")
             
-            # Upload to data lake with detailed error handling
+            # Upload to data lake with detailed error handling; the local copy
+            # is only written when there is no upload target or the upload fails.
+            # The blob URL is known up front, so the database row is written on
+            # this thread while the upload runs on the I/O executor.
             blob_url = None
+            logged_url = None
             try:
-                if self.blob_service_client and AZURE_STORAGE_AVAILABLE:
-                    print(f"Uploading to data lake...")
-                    blob_url = self._upload_to_data_lake(docx_filepath, docx_filename)
-                    print(f"Successfully uploaded to data lake: {blob_url}")
+                if blob_client is not None:
+                    logger.debug("Uploading to data lake...")
+                    upload = REPORT_IO_EXECUTOR.submit(
+                        self._upload_to_data_lake, docx_bytes, docx_filename, blob_client
+                    )
+                    logged_url = blob_client.url
+                    self._log_report(session_id, conversation_id, docx_filename, logged_url)
+                    blob_url = upload.result()
+                    logger.info("Successfully uploaded to data lake: %s", blob_url)
+                    docx_filepath = None
                 else:
-                    print("No blob service client available, skipping upload")
-                    # Use a local file URL as fallback
-                    blob_url = f"file://{os.path.abspath(docx_filepath)}"
-                    print(f"Using local file URL: {blob_url}")
+                    logger.debug("No blob service client available, skipping upload")
             except Exception as upload_error:
-                print(f"Error uploading to data lake: {upload_error}")
-                traceback.print_exc()
-                # Continue anyway with local file path
-                blob_url = f"file://{os.path.abspath(docx_filepath)}"
-                print(f"Using local file URL as fallback: {blob_url}")
+                logger.exception("Error uploading to data lake: %s", upload_error)
             
-            # Log to database with detailed error handling
-            try:
-                print(f"Logging report to database...")
-                self._log_report_to_database(session_id, conversation_id, docx_filename, blob_url)
-                print("Successfully logged report to database")
-            except Exception as db_error:
-                print(f"Error logging report to database: {db_error}")
-                traceback.print_exc()
-                # Continue anyway
+            if blob_url is None:
+                # Continue with a local file as fallback
+                try:
+                    self._save_local_copy(docx_bytes, docx_filepath)
+                except Exception as save_error:
+                    logger.exception("Error saving Word document: %s", save_error)
+                    return json.dumps({
+                        "error": f"Word document could not be saved: {str(save_error)}",
+                        "stage": "save",
+                        "success": False
+                    })
+                blob_url = f"file://{os.path.abspath(docx_filepath)}"
+                logger.info("Using local file URL: %s", blob_url)
+                
+                if logged_url:
+                    # The row already points at the blob that never arrived
+                    self._update_report_url(docx_filename, blob_url)
+                else:
+                    self._log_report(session_id, conversation_id, docx_filename, blob_url)
             
             # Return success information
-            print(f"==== REPORT GENERATION COMPLETED SUCCESSFULLY ====\n")
+            logger.info("Report generation completed: %s", docx_filename)
             return json.dumps({
                 "success": True,
                 "filename": docx_filename,
@@ -195,86 +389,180 @@ class ReportFilePlugin:
             })
             
         except Exception as e:
-            print(f"Error in save_report_to_file: {e}")
-            traceback.print_exc()
-            print(f"==== REPORT GENERATION FAILED ====\n")
+            logger.exception("Report generation failed: %s", e)
             return json.dumps({
                 "error": str(e),
                 "success": False,
                 "stage": "overall_process"
             })
     
-    def _generate_word_document(self, markdown_filepath: str, docx_filepath: str, title: str = None):
+    @kernel_function(name="save_report_to_file", description="Saves a report to Word document and uploads to data lake")
+    async def save_report_to_file_async(self, report_content: str, session_id: str,
+                                        conversation_id: str, report_title: str = None) -> str:
+        """Runs ``save_report_to_file`` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(
+            self.save_report_to_file, report_content, session_id, conversation_id, report_title
+        )
+    
+    def _generate_word_document(self, markdown_bytes: bytes, title: str = None,
+                                needs_headings: bool = True, needs_tables: bool = True) -> bytes:
         """Generates a Word document from markdown using Spire.Doc.
         
+        Both the markdown input and the DOCX output stay in memory.
+        
         Args:
-            markdown_filepath: Input markdown filepath
-            docx_filepath: Output Word document filepath
+            markdown_bytes: UTF-8 encoded markdown content
             title: Optional report title
+            needs_headings: Whether the markdown contains headings
+            needs_tables: Whether the markdown contains tables
+            
+        Returns:
+            bytes: The DOCX document
         """
         # Check if Spire.Doc is available
         if not SPIRE_DOC_AVAILABLE:
             raise ImportError("Spire.Doc.Free is not available. Cannot generate Word document.")
         
-        # Print debug info
-        print(f"Generating Word document: {docx_filepath}")
-        print(f"Using markdown file: {markdown_filepath}")
-        print(f"Markdown file exists: {os.path.exists(markdown_filepath)}")
-        print(f"Markdown file size: {os.path.getsize(markdown_filepath)} bytes")
+        logger.debug("Generating Word document from %d bytes of markdown", len(markdown_bytes))
         
+        # Native Spire objects, released as soon as the bytes are out
+        resources = []
         try:
-            print("Creating Document object...")
+            logger.debug("Creating Document object...")
             # Create a Document object
             document = Document()
+            resources.append(document)
             
-            print(f"Loading markdown file...")
-            # Load the markdown file
-            document.LoadFromFile(markdown_filepath)
-            print("Successfully loaded markdown file")
+            logger.debug("Loading markdown...")
+            # Load the markdown from memory
+            source = Stream(markdown_bytes)
+            resources.append(source)
+            document.LoadFromStream(source, FileFormat.Markdown)
+            logger.debug("Successfully loaded markdown")
             
-            document = self.format_document(document)
+            document = self.format_document(document, needs_headings, needs_tables)
 
-            print(f"Saving document to file: {docx_filepath}")
-            # Save it as a DOCX file
-            document.SaveToFile(docx_filepath, FileFormat.Docx2019)
-            print(f"Successfully saved Word document: {docx_filepath}")
-            
-            print("Disposing document resources...")
-            # Dispose of resources
-            document.Dispose()
-            print("Document resources disposed")
-            
-            # Verify the file was created
-            if os.path.exists(docx_filepath):
-                print(f"Confirmed: Word document exists at {docx_filepath}")
-                print(f"File size: {os.path.getsize(docx_filepath)} bytes")
-            else:
-                print(f"WARNING: Word document not found after generation: {docx_filepath}")
+            # Save it as DOCX into an in-memory stream
+            output = Stream()
+            resources.append(output)
+            document.SaveToStream(output, FileFormat.Docx2019)
+            docx_bytes = bytes(output.ToArray())
+            logger.debug("Successfully rendered Word document: %d bytes", len(docx_bytes))
             
-            return True
+            return docx_bytes
             
         except Exception as e:
-            print(f"Error generating Word document with Spire.Doc: {e}")
-            traceback.print_exc()
+            logger.exception("Error generating Word document with Spire.Doc: %s", e)
             raise
+        finally:
+            # Dispose of resources, document first
+            for resource in resources:
+                try:
+                    resource.Dispose()
+                except Exception as e:
+                    logger.warning("Error disposing %s: %s", type(resource).__name__, e)
+    
+    def _save_local_copy(self, docx_bytes: bytes, docx_filepath: str):
+        """Writes a rendered Word document to the local report directory.
+        
+        Args:
+            docx_bytes: The DOCX document
+            docx_filepath: Output Word document filepath
+        """
+        with open(docx_filepath, "wb") as f:
+            f.write(docx_bytes)
+        logger.info("Saved Word document: %s (%d bytes)", docx_filepath, len(docx_bytes))
+            
+    def _apply_heading_styles(self, document: Document) -> set:
+        """Puts the heading formatting on the built-in Heading 1-4 styles.
+        
+        Spire then renders every paragraph using those styles without any
+        per-run formatting from Python.
+        
+        Args:
+            document: The loaded document
+            
+        Returns:
+            set: Lower-cased names of the styles that were configured
+        """
+        styled = set()
+        for level, (color, font_size) in HEADING_FORMATS.items():
+            name = f"Heading {level}"
+            try:
+                style = document.Styles.FindByName(name)
+                if style is None:
+                    style = document.AddStyle(getattr(BuiltinStyle, f"Heading{level}"))
+                char_format = style.CharacterFormat
+                char_format.FontName = "Arial"
+                char_format.FontSize = font_size
+                char_format.Bold = True
+                char_format.TextColor = color
+                style.ParagraphFormat.BeforeSpacing = 6
+                style.ParagraphFormat.AfterSpacing = 8
+            except Exception as e:
+                logger.debug("Could not configure style %s: %s", name, e)
+                continue
+            styled.add(name.lower())
+        return styled
+    
+    def _create_table_styles(self, document: Document) -> tuple:
+        """Adds the table header and body paragraph styles to the document.
+        
+        Args:
+            document: The loaded document
+            
+        Returns:
+            tuple: (header style name, body style name); a name is None if
+            that style could not be created
+        """
+        names = []
+        for name, font_size, bold, before, after in (
+            (TABLE_HEADER_STYLE, 9, True, 0, 4),
+            (TABLE_BODY_STYLE, 8, False, 5, 5),
+        ):
+            try:
+                style = ParagraphStyle(document)
+                style.Name = name
+                char_format = style.CharacterFormat
+                char_format.FontName = "Arial"
+                char_format.FontSize = font_size
+                char_format.Bold = bold
+                para_format = style.ParagraphFormat
+                para_format.LineSpacingRule = LineSpacingRule.AtLeast
+                para_format.LineSpacing = 12  # At least 12 points between lines
+                para_format.BeforeSpacing = before
+                para_format.AfterSpacing = after
+                document.Styles.Add(style)
+                names.append(name)
+            except Exception as e:
+                logger.debug("Could not create style %s: %s", name, e)
+                names.append(None)
+        return tuple(names)
+    
+    def format_document(self, document: Document, needs_headings: bool = True,
+                        needs_tables: bool = True):
+        """Applies the report layout to a loaded document.
+        
+        Margins, paragraph spacing and the Arial body font are always set;
+        heading detection and table formatting only run when the source
+        markdown has headings or tables.
+        
+        Args:
+            document: The loaded document
+            needs_headings: Whether to detect and format headings
+            needs_tables: Whether to format tables
             
-    def format_document(self, document: Document):
-       
-        # Define colors for different heading levels (using ARGB values)
-        # Alpha is the first parameter (255 = fully opaque)
-        # Dark blue for # headings
-        heading1_color = Color.FromArgb(255, 0, 75, 156)
-        # Medium blue for ## headings  
-        heading2_color = Color.FromArgb(255, 58, 124, 193)
-        # Light blue for ### headings
-        heading3_color = Color.FromArgb(255, 58, 124, 193)
-        # Lightest blue for #### headings
-        heading4_color = Color.FromArgb(255, 0, 0, 0)
+        Returns:
+            Document: The formatted document
+        """
+        # Paragraphs using these styles are already formatted by the style
+        styled_headings = self._apply_heading_styles(document) if needs_headings else set()
         
-        # Create custom colors for table formatting
-        border_color = Color.FromArgb(255, 128, 128, 128)  # Gray
-        header_bg_color = Color.FromArgb(255, 240, 240, 240)  # Light gray
-        zebra_stripe_color = Color.FromArgb(255, 245, 245, 250)  # Very light blue
+        # Table paragraph styles, created with the first table section
+        table_styles = None
+        
+        # Local alias keeps the per-child isinstance check cheap
+        text_range = TextRange
 
         # Loop through the sections of document
         for i in range(document.Sections.Count):
@@ -289,368 +577,336 @@ class ReportFilePlugin:
             margins.Right = 72.0
 
             # Process paragraphs in the current section
-            para_count = section.Paragraphs.Count
-            for j in range(para_count):
-                paragraph = section.Paragraphs[j]
+            paragraphs = section.Paragraphs
+            for j in range(paragraphs.Count):
+                paragraph = paragraphs[j]
+                
+                # Method 1: Check paragraph style name if available
+                style_name = ""
+                if needs_headings:
+                    try:
+                        if hasattr(paragraph, 'StyleName'):
+                            style_name = paragraph.StyleName.lower()
+                    except Exception:
+                        pass
+                
+                # Headings in a configured style need no direct formatting
+                if style_name in styled_headings:
+                    continue
+                
+                # Resolve the Spire properties once per paragraph
+                para_format = paragraph.Format
+                children = paragraph.ChildObjects
                 
                 # Add 6pt spacing after each paragraph
                 try:
-                    paragraph.Format.AfterSpacing = 6  # 6 points after each paragraph
+                    para_format.AfterSpacing = 6  # 6 points after each paragraph
                 except Exception:
                     # Try alternative property name
                     try:
-                        paragraph.Format.SpaceAfter = 6
+                        para_format.SpaceAfter = 6
                     except Exception:
                         pass
                 
-                # Check for heading styles
-                is_heading = False
+                # Collect the text ranges in a single pass over the children;
+                # detection and formatting below both work from this list
+                ranges = []
+                for k in range(children.Count):
+                    obj = children[k]
+                    if isinstance(obj, text_range):
+                        ranges.append(obj)
+                
+                # Detect the heading level; each method only runs if the
+                # previous ones found nothing
                 heading_level = 0
                 
-                # Method 1: Check paragraph style name if available
-                try:
-                    if hasattr(paragraph, 'StyleName'):
-                        style_name = paragraph.StyleName.lower()
-                        
-                        if 'heading 1' in style_name or 'h1' in style_name:
-                            heading_level = 1
-                            is_heading = True
-                        elif 'heading 2' in style_name or 'h2' in style_name:
-                            heading_level = 2
-                            is_heading = True
-                        elif 'heading 3' in style_name or 'h3' in style_name:
-                            heading_level = 3
-                            is_heading = True
-                        elif 'heading 4' in style_name or 'h4' in style_name:
-                            heading_level = 4
-                            is_heading = True
-                except Exception:
-                    pass
+                # Method 1 (continued): other heading-like style names
+                if 'heading 1' in style_name or 'h1' in style_name:
+                    heading_level = 1
+                elif 'heading 2' in style_name or 'h2' in style_name:
+                    heading_level = 2
+                elif 'heading 3' in style_name or 'h3' in style_name:
+                    heading_level = 3
+                elif 'heading 4' in style_name or 'h4' in style_name:
+                    heading_level = 4
                 
                 # Method 2: Check paragraph format heading level if available
-                if not is_heading:
+                if needs_headings and not heading_level:
                     try:
-                        if hasattr(paragraph.Format, 'OutlineLevel'):
-                            outline_level = paragraph.Format.OutlineLevel
-                            
-                            if outline_level is OutlineLevel.Level1:
-                                heading_level = 1
-                                is_heading = True
-                            elif outline_level == 2:
-                                heading_level = 2
-                                is_heading = True
-                            elif outline_level is OutlineLevel.Level3:
-                                heading_level = 3
-                                is_heading = True
-                            elif outline_level is OutlineLevel.Level4:
-                                heading_level = 4
-                                is_heading = True
+                        if hasattr(para_format, 'OutlineLevel'):
+                            heading_level = OUTLINE_HEADING_LEVELS.get(para_format.OutlineLevel, 0)
                     except Exception:
                         pass
                 
                 # Method 3: Check text content for # symbols (as fallback)
-                if not is_heading:
+                if needs_headings and not heading_level:
                     text_content = paragraph.Text
-                    if text_content:
-                        if text_content.startswith("#"):
-                            heading_level = 1
-                            is_heading = True
-                        elif text_content.startswith("##"):
-                            heading_level = 2
-                            is_heading = True
-                        elif text_content.startswith("###"):
-                            heading_level = 3
-                            is_heading = True
-                        elif text_content.startswith("####"):
-                            heading_level = 4
-                            is_heading = True
+                    words = text_content.split(None, 1) if text_content else None
+                    if words:
+                        heading_level = HEADING_PREFIX_LEVELS.get(words[0], 0)
                 
-                # Method 4: Detect by font size and weight (as last resort)
-                if not is_heading:
-                    # Check if any of the text ranges have larger font or are bold
-                    has_large_font = False
-                    
-                    for k in range(paragraph.ChildObjects.Count):
-                        obj = paragraph.ChildObjects[k]
-                        if isinstance(obj, TextRange):
-                            if hasattr(obj.CharacterFormat, 'FontSize') and obj.CharacterFormat.FontSize >= 16:
-                                has_large_font = True
-                    
-                    # If large font detected, assume it's a heading
-                    if has_large_font:
-                        heading_level = 1  # Assume it's a level 1 heading
-                        is_heading = True
+                # Method 4: Detect by font size (as last resort); a large font
+                # is assumed to be a level 1 heading
+                if needs_headings and not heading_level:
+                    for obj in ranges:
+                        char_format = obj.CharacterFormat
+                        if hasattr(char_format, 'FontSize') and char_format.FontSize >= 16:
+                            heading_level = 1
+                            break
                 
                 # If we identified a heading, format it
-                if is_heading and heading_level > 0:
+                if heading_level:
                     # Set heading spacing
                     try:
-                        # More space for higher level headings
-                        if heading_level == 1:
-                            paragraph.Format.BeforeSpacing = 6
-                            paragraph.Format.AfterSpacing = 8
-                        elif heading_level == 2:
-                            paragraph.Format.BeforeSpacing = 6
-                            paragraph.Format.AfterSpacing = 8
-                        else:  # heading_level 3-4
-                            paragraph.Format.BeforeSpacing = 6
-                            paragraph.Format.AfterSpacing = 8
+                        para_format.BeforeSpacing = 6
+                        para_format.AfterSpacing = 8
                     except Exception:
                         pass
                     
-                    # Select the appropriate color
-                    if heading_level == 1:
-                        color = heading1_color
-                        font_size = 16
-                    elif heading_level == 2:
-                        color = heading2_color
-                        font_size = 14
-                    elif heading_level == 3:
-                        color = heading3_color
-                        font_size = 14
-                    elif heading_level == 4:
-                        color = heading4_color
-                        font_size = 12
-                    else:  
-                        color = heading4_color
-                        font_size = 10
+                    # Select the appropriate color and size
+                    color, font_size = HEADING_FORMATS.get(heading_level, DEFAULT_HEADING_FORMAT)
                     
                     # Apply the text color and formatting to each text range in the paragraph
-                    for k in range(paragraph.ChildObjects.Count):
-                        obj = paragraph.ChildObjects[k]
-                        if isinstance(obj, TextRange):
-                            # Set font family
-                            obj.CharacterFormat.FontName = "Arial"
-                            
-                            # Set font size
-                            obj.CharacterFormat.FontSize = font_size
-                            
-                            # Make it bold
-                            obj.CharacterFormat.Bold = True
-                            
-                            # Set color
+                    for obj in ranges:
+                        char_format = obj.CharacterFormat
+                        char_format.FontName = "Arial"
+                        char_format.FontSize = font_size
+                        char_format.Bold = True
+                        
+                        # Set color
+                        try:
+                            char_format.TextColor = color
+                        except Exception:
+                            # Try the alternative shade
                             try:
-                                obj.CharacterFormat.TextColor = color
+                                char_format.TextColor = HEADING_FALLBACK_COLORS.get(heading_level, HEADING_FALLBACK_COLORS[4])
                             except Exception:
-                                # Try alternative approaches
+                                # Final fallback
                                 try:
-                                    if heading_level == 1:
-                                        obj.CharacterFormat.TextColor = Color.FromArgb(255, 0, 75, 156)
-                                    elif heading_level == 2:
-                                        obj.CharacterFormat.TextColor = Color.FromArgb(255, 58, 124, 193)
-                                    elif heading_level == 3:
-                                        obj.CharacterFormat.TextColor = Color.FromArgb(255, 79, 156, 241)
-                                    else:
-                                        obj.CharacterFormat.TextColor = Color.FromArgb(255, 125, 185, 246)
+                                    char_format.TextColor = Color.Blue
                                 except Exception:
-                                    # Final fallback
-                                    try:
-                                        obj.CharacterFormat.TextColor = Color.Blue
-                                    except Exception:
-                                        pass
+                                    pass
                 else:
                     # For non-heading paragraphs, just set font to Arial
-                    for k in range(paragraph.ChildObjects.Count):
-                        obj = paragraph.ChildObjects[k]
-                        if isinstance(obj, TextRange):
-                            obj.CharacterFormat.FontName = "Arial"
+                    for obj in ranges:
+                        obj.CharacterFormat.FontName = "Arial"
 
             # Process all tables in the section
-            try:
-                for table_idx in range(section.Tables.Count):
-                    try:
-                        table = section.Tables[table_idx]
-                        
-                        # Try to set default margins for the whole table if available
+            if needs_tables:
+                if table_styles is None:
+                    table_styles = self._create_table_styles(document)
+                header_style, body_style = table_styles
+                try:
+                    tables = section.Tables
+                    for table_idx in range(tables.Count):
                         try:
-                            # Try to set default table border values
-                            table.TableFormat.Borders.BorderType = BorderStyle.Single
-                            table.TableFormat.Borders.Color = border_color
-                            table.TableFormat.Borders.LineWidth = 0.5
-                            
-                        except Exception:
-                            pass
-                        
-                        # Bold the first row (header row) of each table
-                        if table.Rows.Count > 0:
-                            header_row = table.Rows[0]
+                            table = tables[table_idx]
+                            rows = table.Rows
+                            row_count = rows.Count
                             
-                            # Set header row properties if supported
+                            # Try to set default margins for the whole table if available
                             try:
-                                # Make header row stand out
-                                header_row.Height = 20  # Slightly taller header row
+                                # Try to set default table border values
+                                borders = table.TableFormat.Borders
+                                borders.BorderType = BorderStyle.Single
+                                borders.Color = BORDER_COLOR
+                                borders.LineWidth = 0.5
+                                
                             except Exception:
                                 pass
                             
-                            # Process each cell in the header row
-                            for cell_idx in range(header_row.Cells.Count):
-                                cell = header_row.Cells[cell_idx]
+                            # Bold the first row (header row) of each table
+                            if row_count > 0:
+                                header_row = rows[0]
                                 
-                                # Set cell background color
+                                # Set header row properties if supported
                                 try:
-                                    cell.CellFormat.BackColor = header_bg_color
-                                except Exception:
-                                    pass
-                                
-                                # IMPORTANT: Apply more aggressive padding settings to each cell
-                                try:
-                                    # Try all available padding/margin methods
-                                    cell.Width = 500  # Give some base width
-                                    
-                                    # Approach 1: Using CellFormat
-                                    cell.CellFormat.VerticalAlignment = VerticalAlignment.Middle
-                                    
-                                    # Approach 2: More creative - add empty paragraphs
-                                    # Add a small empty paragraph to the beginning of the cell
-                                    try:
-                                        first_para = cell.Paragraphs[0]
-                                        first_para.Format.BeforeSpacing = 5
-                                        first_para.Format.AfterSpacing = 5
-                                    except:
-                                        pass
-                                    
+                                    # Make header row stand out
+                                    header_row.Height = 20  # Slightly taller header row
                                 except Exception:
                                     pass
                                 
-                                # Process paragraphs in the cell
-                                for para_idx in range(cell.Paragraphs.Count):
-                                    para = cell.Paragraphs[para_idx]
+                                # Process each cell in the header row
+                                cells = header_row.Cells
+                                for cell_idx in range(cells.Count):
+                                    cell = cells[cell_idx]
+                                    cell_format = cell.CellFormat
+                                    cell_paragraphs = cell.Paragraphs
                                     
-                                    # Try to set paragraph spacing in cells
+                                    # Set cell background color
                                     try:
-                                        para.Format.LineSpacingRule = LineSpacingRule.AtLeast
-                                        para.Format.LineSpacing = 12  # At least 12 points between lines
-                                        para.Format.AfterSpacing = 4  # 4 points after each paragraph in cells
+                                        cell_format.BackColor = HEADER_BG_COLOR
                                     except Exception:
                                         pass
                                     
-                                    # Format text in the header cell
-                                    for obj_idx in range(para.ChildObjects.Count):
-                                        try:
-                                            obj = para.ChildObjects[obj_idx]
-                                            if hasattr(obj, 'CharacterFormat'):
-                                                obj.CharacterFormat.FontName = "Arial"
-                                                obj.CharacterFormat.FontSize = 9
-                                                obj.CharacterFormat.Bold = True  # Make header bold
-                                        except Exception:
-                                            pass
-                            
-                            # Format the rest of the table with smaller font
-                            for row_idx in range(1, table.Rows.Count):  # Start from row 1 (after header)
-                                row = table.Rows[row_idx]
-                                
-                                # Add zebra striping (alternate row colors)
-                                if row_idx % 2 == 0:  # Even rows
-                                    try:
-                                        row.Height = 18
-                                        for cell_idx in range(row.Cells.Count):
-                                            try:
-                                                row.Cells[cell_idx].CellFormat.BackColor = zebra_stripe_color
-                                            except Exception:
-                                                pass
-                                    except Exception:
-                                        pass
-                                
-                                # Process each cell
-                                for cell_idx in range(row.Cells.Count):
-                                    cell = row.Cells[cell_idx]
-                                    
                                     # IMPORTANT: Apply more aggressive padding settings to each cell
                                     try:
                                         # Try all available padding/margin methods
                                         cell.Width = 500  # Give some base width
                                         
                                         # Approach 1: Using CellFormat
-                                        cell.CellFormat.VerticalAlignment = VerticalAlignment.Middle
-                                            
-                                        # Approach 2: More creative - add empty paragraphs or paragraph spacing
+                                        cell_format.VerticalAlignment = VerticalAlignment.Middle
+                                        
+                                        # Approach 2: More creative - extra space above the
+                                        # first paragraph of the cell
                                         try:
-                                            for para_idx in range(cell.Paragraphs.Count):
-                                                para = cell.Paragraphs[para_idx]
-                                                para.Format.LineSpacingRule = LineSpacingRule.AtLeast
-                                                para.Format.LineSpacing = 12 # At least 12 points between lines
-                                                para.Format.BeforeSpacing = 5
-                                                para.Format.AfterSpacing = 5
+                                            cell_paragraphs[0].Format.BeforeSpacing = 5
                                         except:
                                             pass
                                         
                                     except Exception:
                                         pass
                                     
-                                    # Process each paragraph in the cell
-                                    for para_idx in range(cell.Paragraphs.Count):
-                                        para = cell.Paragraphs[para_idx]
-                                        for obj_idx in range(para.ChildObjects.Count):
+                                    # Font and spacing come from the header style
+                                    if header_style:
+                                        for para_idx in range(cell_paragraphs.Count):
                                             try:
-                                                obj = para.ChildObjects[obj_idx]
-                                                if hasattr(obj, 'CharacterFormat'):
-                                                    obj.CharacterFormat.FontName = "Arial"
-                                                    obj.CharacterFormat.FontSize = 8
+                                                cell_paragraphs[para_idx].ApplyStyle(header_style)
                                             except Exception:
                                                 pass
-                    except Exception:
-                        pass
-            except Exception:
-                pass
+                                
+                                # Format the rest of the table with smaller font
+                                for row_idx in range(1, row_count):  # Start from row 1 (after header)
+                                    row = rows[row_idx]
+                                    cells = row.Cells
+                                    cell_count = cells.Count
+                                    
+                                    # Add zebra striping (alternate row colors)
+                                    if row_idx % 2 == 0:  # Even rows
+                                        try:
+                                            row.Height = 18
+                                            for cell_idx in range(cell_count):
+                                                try:
+                                                    cells[cell_idx].CellFormat.BackColor = ZEBRA_STRIPE_COLOR
+                                                except Exception:
+                                                    pass
+                                        except Exception:
+                                            pass
+                                    
+                                    # Process each cell
+                                    for cell_idx in range(cell_count):
+                                        cell = cells[cell_idx]
+                                        cell_paragraphs = cell.Paragraphs
+                                        
+                                        # IMPORTANT: Apply more aggressive padding settings to each cell
+                                        try:
+                                            # Try all available padding/margin methods
+                                            cell.Width = 500  # Give some base width
+                                            
+                                            # Approach 1: Using CellFormat
+                                            cell.CellFormat.VerticalAlignment = VerticalAlignment.Middle
+                                        except Exception:
+                                            pass
+                                        
+                                        # Font and spacing come from the body style
+                                        if body_style:
+                                            for para_idx in range(cell_paragraphs.Count):
+                                                try:
+                                                    cell_paragraphs[para_idx].ApplyStyle(body_style)
+                                                except Exception:
+                                                    pass
+                        except Exception:
+                            pass
+                except Exception:
+                    pass
 
         return document
 
-    def _upload_to_data_lake(self, filepath: str, filename: str) -> str:
-        """Uploads a file to Azure Data Lake Storage with improved error handling.
+    def _get_blob_client(self, filename: str):
+        """Gets the blob client a report will be uploaded to.
         
         Args:
-            filepath: Local file path
             filename: File name to use in storage
             
+        Returns:
+            BlobClient: Client for ``<year>/<month>/<filename>`` in the report container
+            
+        Raises:
+            RuntimeError: If no blob service client is available
+        """
+        # Check if blob service client is available
+        if not self.container_client or not AZURE_STORAGE_AVAILABLE:
+            raise RuntimeError("Blob service client not available, cannot upload to data lake")
+        
+        # Generate blob path with folder structure; one clock read keeps the
+        # year and month consistent across a month boundary
+        folder = datetime.now().strftime("%Y/%m")
+        return self.container_client.get_blob_client(f"{folder}/{filename}")
+    
+    def _upload_to_data_lake(self, data: bytes, filename: str, blob_client=None) -> str:
+        """Uploads a rendered document to Azure Data Lake Storage.
+        
+        Args:
+            data: The document content
+            filename: File name to use in storage
+            blob_client: Optional blob client from ``_get_blob_client``
+            
         Returns:
             str: URL of the uploaded blob
+            
+        Raises:
+            RuntimeError: If no blob service client is available
         """
+        if blob_client is None:
+            blob_client = self._get_blob_client(filename)
+        
+        # Upload the document straight from memory
+        blob_client.upload_blob(
+            data, 
+            overwrite=True,
+            max_concurrency=BLOB_UPLOAD_CONCURRENCY,
+            content_settings=ContentSettings(content_type=DOCX_CONTENT_TYPE)
+        )
+        
+        logger.debug("File uploaded successfully: %s", blob_client.url)
+        return blob_client.url
+    
+    def _db_connection(self):
+        """Borrow a connection from the shared pool for this connection string.
+        
+        Use as a context manager; the connection goes back to the pool when
+        the block completes and is closed instead if the block raised.
+        """
+        return get_pool(self.connection_string).connection()
+    
+    def _log_report(self, session_id: str, conversation_id: str, 
+                    filename: str, blob_url: str):
+        """Logs report metadata, reporting rather than raising on failure."""
         try:
-            # Check if blob service client is available
-            if not self.blob_service_client or not AZURE_STORAGE_AVAILABLE:
-                print("Blob service client not available, cannot upload to data lake")
-                # Return a local file URL as fallback
-                return f"file://{os.path.abspath(filepath)}"
-            
-            try:
-                # Create container if it doesn't exist
-                container_client = self.blob_service_client.get_container_client(self.storage_container)
-                if not container_client.exists():
-                    container_client.create_container()
-                    print(f"Created container: {self.storage_container}")
-            except Exception as container_error:
-                print(f"Error with container: {container_error}")
-                # Try to get the container anyway, it might just be a permissions issue
-                container_client = self.blob_service_client.get_container_client(self.storage_container)
-            
-            # Generate blob path with folder structure
-            year = datetime.now().strftime("%Y")
-            month = datetime.now().strftime("%m")
-            blob_path = f"{year}/{month}/{filename}"
-            
-            # Upload file
-            blob_client = container_client.get_blob_client(blob_path)
-            
-            # Check if file exists
-            if not os.path.exists(filepath):
-                print(f"File not found: {filepath}")
-                return f"file_not_found:{filepath}"
-            
-            with open(filepath, "rb") as data:
-                blob_client.upload_blob(
-                    data, 
-                    overwrite=True,
-                    content_settings=ContentSettings(content_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document")
-                )
+            logger.debug("Logging report to database...")
+            self._log_report_to_database(session_id, conversation_id, filename, blob_url)
+        except Exception as db_error:
+            logger.exception("Error logging report to database: %s", db_error)
+    
+    def _update_report_url(self, filename: str, blob_url: str) -> bool:
+        """Points an already logged report at a new URL.
+        
+        Args:
+            filename: The report filename
+            blob_url: The report URL
             
-            print(f"File uploaded successfully: {blob_client.url}")
-            return blob_client.url
+        Returns:
+            bool: Whether the update succeeded
+        """
+        try:
+            with self._db_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(
+                        "UPDATE fact_risk_report SET blob_url = ? WHERE filename = ?",
+                        (blob_url, filename),
+                    )
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    cursor.close()
+            return True
             
         except Exception as e:
-            print(f"Error in _upload_to_data_lake: {e}")
-            traceback.print_exc()
-            # Return a local file URL as fallback
-            return f"file://{os.path.abspath(filepath)}"
+            logger.exception("Error updating report URL: %s", e)
+            return False
     
     def _log_report_to_database(self, session_id: str, conversation_id: str, 
                               filename: str, blob_url: str):
@@ -662,64 +918,44 @@ class ReportFilePlugin:
             filename: The report filename
             blob_url: The report URL
         """
+        params = (session_id, conversation_id, filename, blob_url)
         try:
-            # Connect to database
-            try:
-                conn = pyodbc.connect(self.connection_string)
-            except Exception as conn_error:
-                print(f"Error connecting to database: {conn_error}")
-                return False
-            
-            cursor = conn.cursor()
-            
-            # Try to execute the stored procedure
-            try:
-                cursor.execute("""
-                    EXEC sp_LogRiskReport 
-                        @session_id = ?,
-                        @conversation_id = ?,
-                        @filename = ?,
-                        @blob_url = ?
-                """, (session_id, conversation_id, filename, blob_url))
-                
-                conn.commit()
-                print("Successfully logged report to database")
-                
-            except Exception as sp_error:
-                print(f"Error executing stored procedure: {sp_error}")
-                
-                # Try direct insert as fallback
+            with self._db_connection() as conn:
+                cursor = conn.cursor()
                 try:
-                    cursor.execute("""
-                        INSERT INTO fact_risk_report (
-                            session_id, 
-                            conversation_id, 
-                            filename,
-                            blob_url,
-                            report_type,
-                            created_date
+                    if self._has_log_procedure is None:
+                        cursor.execute(
+                            "SELECT 1 FROM sys.procedures WHERE name = 'sp_LogRiskReport'"
                         )
-                        VALUES (?, ?, ?, ?, 'comprehensive', GETDATE())
-                    """, (session_id, conversation_id, filename, blob_url))
+                        self._has_log_procedure = cursor.fetchone() is not None
                     
-                    conn.commit()
-                    print("Successfully inserted report using direct SQL")
+                    if self._has_log_procedure:
+                        try:
+                            cursor.execute(REPORT_LOG_PROCEDURE_SQL, params)
+                            conn.commit()
+                            logger.info("Successfully logged report to database")
+                            return True
+                        except Exception as sp_error:
+                            # Fall through to the direct insert below
+                            logger.warning("Error executing stored procedure: %s", sp_error)
+                            conn.rollback()
                     
-                except Exception as insert_error:
-                    print(f"Error inserting report: {insert_error}")
-                    conn.rollback()
-                    raise
-            
-            cursor.close()
-            conn.close()
+                    try:
+                        cursor.execute(REPORT_INSERT_SQL, params)
+                        conn.commit()
+                        logger.info("Successfully inserted report using direct SQL")
+                    except Exception as insert_error:
+                        logger.error("Error inserting report: %s", insert_error)
+                        conn.rollback()
+                        raise
+                finally:
+                    cursor.close()
             return True
             
         except Exception as e:
-            print(f"Error in _log_report_to_database: {e}")
-            traceback.print_exc()
+            logger.exception("Error in _log_report_to_database: %s", e)
             return False
     
-    @kernel_function(description="Generates a report from conversation history")
     def generate_report_from_conversation(self, conversation_id: str, session_id: str, report_type: str = "comprehensive") -> str:
         """Generates a Word report from a conversation history.
         
@@ -732,48 +968,6 @@ class ReportFilePlugin:
             str: JSON string with result information
         """
         try:
-            # Retrieve the conversation history from the database
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
-            # Query to get the conversation log
-            cursor.execute("""
-                SELECT 
-                    agent_name, 
-                    action, 
-                    event_time, 
-                    user_query, 
-                    agent_output,
-                    result_summary
-                FROM 
-                    dim_agent_event_log
-                WHERE 
-                    conversation_id = ?
-                ORDER BY 
-                    event_time
-            """, (conversation_id,))
-            
-            rows = cursor.fetchall()
-            cursor.close()
-            conn.close()
-            
-            if not rows:
-                return json.dumps({
-                    "error": "No conversation history found for the provided conversation ID",
-                    "success": False
-                })
-            
-            # Extract relevant information and build the report
-            report_content = f"# Comprehensive Risk Report\n\n"
-            report_content += f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-            
-            # Add executive summary
-            report_content += "## Executive Summary\n\n"
-            report_content += "This report was automatically generated from a conversation about equipment schedule risks.\n\n"
-            
-            # Add key findings section
-            report_content += "## Key Findings\n\n"
-            
             # Extract agent outputs - focus particularly on REPORTING_AGENT and SCHEDULER_AGENT
             report_sections = {
                 "user_queries": [],
@@ -784,36 +978,39 @@ class ReportFilePlugin:
                 "report_generation": []
             }
             
-            # Sort events by time and type
-            for row in rows:
-                agent_name = row[0]
-                action = row[1]
-                user_query = row[3]
-                agent_output = row[4]
-                
-                # Save user queries
-                if action == "User Query" and user_query:
-                    report_sections["user_queries"].append(user_query)
-                
-                # Save agent outputs
-                if agent_output:
-                    if "SCHEDULER_AGENT" in agent_name:
-                        report_sections["schedule_analysis"].append(agent_output)
-                    elif "POLITICAL_RISK_AGENT" in agent_name:
-                        report_sections["political_analysis"].append(agent_output)
-                    elif "TARIFF_RISK_AGENT" in agent_name:
-                        report_sections["tariff_analysis"].append(agent_output)
-                    elif "LOGISTICS_RISK_AGENT" in agent_name:
-                        report_sections["logistics_analysis"].append(agent_output)
-                    elif "REPORTING_AGENT" in agent_name:
-                        report_sections["report_generation"].append(agent_output)
-            
-            # Add user queries section
-            if report_sections["user_queries"]:
-                report_content += "### User Questions\n\n"
-                for query in report_sections["user_queries"]:
-                    report_content += f"- {query}\n"
-                report_content += "\n"
+            # A report is reused until the conversation logs a newer event
+            cache_key = (conversation_id, session_id)
+            
+            # Retrieve the user queries and the longest output per section;
+            # the ranking is done by the database
+            with self._db_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute(
+                        "SELECT MAX(event_time) FROM dim_agent_event_log WHERE conversation_id = ?",
+                        (conversation_id,)
+                    )
+                    latest_event = cursor.fetchone()[0]
+                    with self._report_cache_lock:
+                        cached = self._report_cache.get(cache_key)
+                        if cached is not None and latest_event is not None and cached[0] == latest_event:
+                            self._report_cache.move_to_end(cache_key)
+                            logger.info("Reusing report for conversation %s", conversation_id)
+                            return cached[1]
+                    
+                    cursor.execute(CONVERSATION_REPORT_SQL, (conversation_id, conversation_id))
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
+            
+            if not rows:
+                return json.dumps({
+                    "error": "No conversation history found for the provided conversation ID",
+                    "success": False
+                })
+            
+            for section, content, _ in rows:
+                report_sections[section].append(content)
             
             # Add relevant content from each agent - prioritize REPORTING_AGENT output
             if report_sections["report_generation"]:
@@ -821,13 +1018,31 @@ class ReportFilePlugin:
                 comprehensive_report = max(report_sections["report_generation"], key=len)
                 
                 # Clean up the report (remove agent prefix and any debugging info)
-                comprehensive_report = re.sub(r'REPORTING_AGENT >\s*', '', comprehensive_report)
-                comprehensive_report = re.sub(r'```\s*Agent Name:.*?```', '', comprehensive_report, flags=re.DOTALL)
-                comprehensive_report = re.sub(r'\*\*Step \d+:.*?Stage\*\*.*?(?=\*\*Step|\*\*Comprehensive|\Z)', '', comprehensive_report, flags=re.DOTALL)
+                comprehensive_report = REPORTING_PREFIX_RE.sub('', comprehensive_report)
+                comprehensive_report = AGENT_NAME_BLOCK_RE.sub('', comprehensive_report)
+                comprehensive_report = WORKFLOW_STEP_RE.sub('', comprehensive_report)
                 
                 # Use the comprehensive report as the main content
                 report_content = comprehensive_report
             else:
+                # Extract relevant information and build the report; chunks
+                # are collected in a list and joined once at the end
+                parts = [
+                    "# Comprehensive Risk Report\n\n",
+                    f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n",
+                    # Add executive summary
+                    "## Executive Summary\n\n",
+                    "This report was automatically generated from a conversation about equipment schedule risks.\n\n",
+                    # Add key findings section
+                    "## Key Findings\n\n",
+                ]
+                
+                # Add user queries section
+                if report_sections["user_queries"]:
+                    parts.append("### User Questions\n\n")
+                    parts.extend(f"- {query}\n" for query in report_sections["user_queries"])
+                    parts.append("\n")
+                
                 # If no reporting agent output, compile information from other agents
                 for section_name, section_items in [
                     ("Schedule Risk Analysis", report_sections["schedule_analysis"]),
@@ -836,15 +1051,22 @@ class ReportFilePlugin:
                     ("Logistics Risk Analysis", report_sections["logistics_analysis"])
                 ]:
                     if section_items:
-                        report_content += f"## {section_name}\n\n"
+                        parts.append(f"## {section_name}\n\n")
                         # Use the most comprehensive analysis (usually the longest one)
                         best_analysis = max(section_items, key=len)
                         # Clean up the analysis (remove agent prefix)
-                        best_analysis = re.sub(r'.*_AGENT >\s*', '', best_analysis)
-                        # Extract the most relevant sections
-                        analysis_sections = re.split(r'##\s+', best_analysis)
-                        for section in analysis_sections[1:]:  # Skip the first split result
-                            report_content += f"### {section}\n\n"
+                        best_analysis = AGENT_PREFIX_RE.sub('', best_analysis)
+                        # Extract the most relevant sections: each "## " heading
+                        # starts one, text before the first heading is skipped
+                        start = None
+                        for match in H2_SPLIT_RE.finditer(best_analysis):
+                            if start is not None:
+                                parts.append(f"### {best_analysis[start:match.start()]}\n\n")
+                            start = match.end()
+                        if start is not None:
+                            parts.append(f"### {best_analysis[start:]}\n\n")
+                
+                report_content = "".join(parts)
             
             # Generate the report file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -858,17 +1080,30 @@ class ReportFilePlugin:
                 report_title=f"Comprehensive Risk Report - {timestamp}"
             )
             
+            if latest_event is not None and json.loads(result).get("success"):
+                with self._report_cache_lock:
+                    self._report_cache[cache_key] = (latest_event, result)
+                    self._report_cache.move_to_end(cache_key)
+                    if len(self._report_cache) > REPORT_CACHE_SIZE:
+                        self._report_cache.popitem(last=False)
+            
             return result
             
         except Exception as e:
-            print(f"Error generating report from conversation: {e}")
-            traceback.print_exc()
+            logger.exception("Error generating report from conversation: %s", e)
             return json.dumps({
                 "error": str(e),
                 "success": False
             })
     
-    @kernel_function(description="Gets all available reports")
+    @kernel_function(name="generate_report_from_conversation", description="Generates a report from conversation history")
+    async def generate_report_from_conversation_async(self, conversation_id: str, session_id: str,
+                                                      report_type: str = "comprehensive") -> str:
+        """Runs ``generate_report_from_conversation`` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(
+            self.generate_report_from_conversation, conversation_id, session_id, report_type
+        )
+    
     def get_reports(self, session_id: str = None, conversation_id: str = None) -> str:
         """Gets all available reports with optional filtering.
         
@@ -880,9 +1115,6 @@ class ReportFilePlugin:
             str: JSON string with the reports
         """
         try:
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
-            
             # Build query parameters based on filters
             params = []
             where_clauses = []
@@ -896,32 +1128,46 @@ class ReportFilePlugin:
                 params.append(conversation_id)
             
             # Build the query
-            query = "SELECT * FROM fact_risk_report"
+            query = (
+                "SELECT report_id, session_id, conversation_id, filename, blob_url, "
+                "report_type, created_date FROM fact_risk_report"
+            )
             if where_clauses:
                 query += " WHERE " + " AND ".join(where_clauses)
             query += " ORDER BY created_date DESC"
             
-            # Execute the query
-            cursor.execute(query, params)
-            
-            # Fetch results
-            columns = [column[0] for column in cursor.description]
-            rows = cursor.fetchall()
-            
-            # Convert to list of dictionaries
-            reports = []
-            for row in rows:
-                reports.append(dict(zip(columns, row)))
-            
-            cursor.close()
-            conn.close()
+            with self._db_connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    cursor.arraysize = DB_FETCH_BATCH_SIZE
+                    # Execute the query
+                    cursor.execute(query, params)
+                    
+                    # Encode each batch as it arrives so the full result set
+                    # is never held as both rows and dictionaries
+                    columns = [column[0] for column in cursor.description]
+                    encoded = []
+                    while True:
+                        rows = cursor.fetchmany()
+                        if not rows:
+                            break
+                        encoded.extend(
+                            json.dumps(dict(zip(columns, row)), default=str)
+                            for row in rows
+                        )
+                finally:
+                    cursor.close()
             
-            # Return as JSON
-            return json.dumps(reports, default=str)
+            # Return as JSON (same layout as json.dumps on the list)
+            return "[" + ", ".join(encoded) + "]"
             
         except Exception as e:
-            print(f"Error getting reports: {e}")
-            traceback.print_exc()
+            logger.exception("Error getting reports: %s", e)
             return json.dumps({
                 "error": str(e)
-            })
\ No newline at end of file
+            })
+    
+    @kernel_function(name="get_reports", description="Gets all available reports")
+    async def get_reports_async(self, session_id: str = None, conversation_id: str = None) -> str:
+        """Runs ``get_reports`` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.get_reports, session_id, conversation_id)
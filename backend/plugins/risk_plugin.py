@@ -3,6 +3,18 @@
 import json
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
 
+# Upper bounds (exclusive) of the Low and Medium risk bands, in percent
+RISK_THRESHOLDS = (5, 15)
+# (risk_flag, risk_points) per band, lowest band first
+RISK_CATEGORIES = (
+    ("Low Risk", 1),
+    ("Medium Risk", 3),
+    ("High Risk", 5),
+)
+# Batches with fewer rows than this are scored in plain Python; below it,
+# importing numpy and building arrays costs more than the loop
+NUMPY_BATCH_MIN_ROWS = 64
+
 class RiskCalculationPlugin:
     """A plugin for calculating and categorizing schedule risks."""
     
@@ -16,7 +28,7 @@ class RiskCalculationPlugin:
             risk_percent = abs(days_variance / days_until_due * 100)
             #risk_percent = days_variance / days_until_due * 100
             return f"{risk_percent:.2f}"
-        except Exception as e:
+        except Exception:
             return "-1"  # Error indicator
     
     @kernel_function(description="Categorizes risk by percentage")
@@ -26,20 +38,86 @@ class RiskCalculationPlugin:
             # if risk_percentage < 0:
             #     return json.dumps({"error": "Invalid risk percentage"})
             
-            if risk_percentage < 5:
-                return json.dumps({
-                    "risk_flag": "Low Risk",
-                    "risk_points": 1
-                })
-            elif risk_percentage < 15:
-                return json.dumps({
-                    "risk_flag": "Medium Risk",
-                    "risk_points": 3
-                })
+            if risk_percentage < RISK_THRESHOLDS[0]:
+                risk_flag, risk_points = RISK_CATEGORIES[0]
+            elif risk_percentage < RISK_THRESHOLDS[1]:
+                risk_flag, risk_points = RISK_CATEGORIES[1]
             else:
-                return json.dumps({
-                    "risk_flag": "High Risk",
-                    "risk_points": 5
-                })
+                risk_flag, risk_points = RISK_CATEGORIES[2]
+            return json.dumps({
+                "risk_flag": risk_flag,
+                "risk_points": risk_points
+            })
         except Exception as e:
             return json.dumps({"error": str(e)})
+    
+    @kernel_function(description="Calculates and categorizes risk for many schedule rows at once")
+    def calculate_risks_batch(self, days_variance_json: str, days_until_due_json: str) -> str:
+        """Calculates risk percentage, flag and points for a batch of rows.
+        
+        Args:
+            days_variance_json: JSON array of days variance per row
+            days_until_due_json: JSON array of days until due per row, same length
+        
+        Returns:
+            str: JSON array of {"risk_percentage", "risk_flag", "risk_points"}
+            objects in input order, or a JSON error object
+        """
+        try:
+            days_variance = json.loads(days_variance_json)
+            days_until_due = json.loads(days_until_due_json)
+            if (
+                not isinstance(days_variance, list)
+                or not isinstance(days_until_due, list)
+                or len(days_variance) != len(days_until_due)
+            ):
+                return json.dumps({"error": "Expected two JSON arrays of the same length"})
+            if len(days_variance) < NUMPY_BATCH_MIN_ROWS:
+                return json.dumps([
+                    self._score_row(float(variance), float(until_due))
+                    for variance, until_due in zip(days_variance, days_until_due)
+                ])
+            
+            import numpy as np
+            
+            days_variance = np.asarray(days_variance, dtype=np.float64)
+            days_until_due = np.asarray(days_until_due, dtype=np.float64)
+            if days_variance.ndim != 1 or days_until_due.ndim != 1:
+                return json.dumps({"error": "Expected two JSON arrays of the same length"})
+            
+            # Rows already past due are 100% risk, as in calculate_risk_percentage
+            past_due = days_until_due <= 0
+            risk = np.abs(days_variance / np.where(past_due, 1.0, days_until_due)) * 100
+            risk = np.round(np.where(past_due, 100.0, risk), 2)
+            bands = np.digitize(risk, RISK_THRESHOLDS)
+            
+            return json.dumps([
+                {
+                    "risk_percentage": percent,
+                    "risk_flag": RISK_CATEGORIES[band][0],
+                    "risk_points": RISK_CATEGORIES[band][1]
+                }
+                for percent, band in zip(risk.tolist(), bands.tolist())
+            ])
+        except Exception as e:
+            return json.dumps({"error": str(e)})
+    
+    @staticmethod
+    def _score_row(days_variance: float, days_until_due: float) -> dict:
+        """Scores one row of ``calculate_risks_batch`` without numpy."""
+        # Rows already past due are 100% risk, as in calculate_risk_percentage
+        if days_until_due <= 0:
+            percent = 100.0
+        else:
+            percent = round(abs(days_variance / days_until_due) * 100, 2)
+        if percent < RISK_THRESHOLDS[0]:
+            band = 0
+        elif percent < RISK_THRESHOLDS[1]:
+            band = 1
+        else:
+            band = 2
+        return {
+            "risk_percentage": percent,
+            "risk_flag": RISK_CATEGORIES[band][0],
+            "risk_points": RISK_CATEGORIES[band][1]
+        }
@@ -1,9 +1,13 @@
 """Equipment schedule plugin for schedule management."""
 
+import asyncio
 import json
+import logging
 import uuid
-import pyodbc
 from semantic_kernel.functions.kernel_function_decorator import kernel_function
+from utils.db_pool import get_pool
+
+logger = logging.getLogger(__name__)
 
 class EquipmentSchedulePlugin:
     """A plugin for working with equipment schedule data."""
@@ -11,41 +15,45 @@ class EquipmentSchedulePlugin:
     def __init__(self, connection_string):
         self.connection_string = connection_string
     
-    @kernel_function(description="Retrieves equipment schedule comparison data")
     def get_schedule_comparison_data(self) -> str:
         """Retrieves schedule comparison data for analysis"""
         try:
-            print(f"Called get_schedule_comparison_data")
-            
-            # Connect to database
-            conn = pyodbc.connect(self.connection_string)
-            cursor = conn.cursor()
+            logger.debug("Called get_schedule_comparison_data")
             
             # Base query
             query = "EXEC sp_GetScheduleComparisonData"
             
-            print(f"Executing query: {query}")
-            cursor.execute(query)
-            
-            # Fetch results
-            columns = [column[0] for column in cursor.description]
-            rows = cursor.fetchall()
+            # Borrow a pooled connection
+            with get_pool(self.connection_string).connection() as conn:
+                cursor = conn.cursor()
+                try:
+                    logger.debug("Executing query: %s", query)
+                    cursor.execute(query)
+                    
+                    # Fetch results
+                    columns = [column[0] for column in cursor.description]
+                    rows = cursor.fetchall()
+                finally:
+                    cursor.close()
             
             # Convert to list of dictionaries
             results = []
             for row in rows:
                 results.append(dict(zip(columns, row)))
             
-            print(f"Query returned {len(results)} rows")
-            print(results)
-            
-            # Close connection
-            cursor.close()
-            conn.close()
+            logger.info("Query returned %d rows", len(results))
+            # Dumping every row is only useful when debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Schedule comparison rows: %s", results)
             
             # Return as JSON string
             return json.dumps(results, default=str)
             
         except Exception as e:
-            print(f"Error in get_schedule_comparison_data: {str(e)}")
-            return json.dumps({"error": str(e)})
\ No newline at end of file
+            logger.error("Error in get_schedule_comparison_data: %s", e)
+            return json.dumps({"error": str(e)})
+    
+    @kernel_function(name="get_schedule_comparison_data", description="Retrieves equipment schedule comparison data")
+    async def get_schedule_comparison_data_async(self) -> str:
+        """Runs ``get_schedule_comparison_data`` in a worker thread so the event loop is not blocked."""
+        return await asyncio.to_thread(self.get_schedule_comparison_data)
@@ -5,14 +5,255 @@ Handles all interactions with Google Cloud Firestore.
 
 from google.cloud import firestore
 from google.cloud.firestore_v1.base_query import FieldFilter
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime, timedelta
 import asyncio
+import contextvars
+import copy
+import re
+import time
 import uuid
+from collections import Counter, OrderedDict
 from functools import lru_cache
 
 from config.settings import get_settings
 
+# Most writes Firestore accepts in a single batch commit
+FIRESTORE_BATCH_LIMIT = 500
+
+# How long contract metadata updates are held so back-to-back updates
+# coalesce into one write (seconds)
+WRITE_COALESCE_DELAY = 0.1
+
+# Most session deletes cleanup_old_sessions keeps in flight at once
+SESSION_DELETE_CONCURRENCY = 20
+
+# Contracts kept in the read cache, and how long a cached read stays fresh
+CONTRACT_CACHE_SIZE = 512
+CONTRACT_CACHE_TTL = 30
+
+# Contract search index: a contract's most frequent terms are stored in its
+# "keywords" array (for array-contains-any lookups) and "term_freq" map, next
+# to its lowercased title
+SEARCH_KEYWORDS_MAX = 500
+# Most values Firestore accepts in one array-contains-any filter
+SEARCH_QUERY_TERMS_MAX = 30
+SEARCH_INDEX_FIELDS = ("keywords", "term_freq", "title_lc")
+SEARCH_TOKEN_RE = re.compile(r"[a-z0-9]+")
+SEARCH_STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because
+been before being below between both but by can could did do does doing down
+during each few for from further had has have having he her here hers him his
+how i if in into is it its itself me more most my no nor not of off on once
+only or other our ours out over own same she should so some such than that the
+their theirs them then there these they this those through to too under until
+up very was we were what when where which while who whom why will with would
+you your yours
+""".split())
+
+
+def search_terms(text: str) -> List[str]:
+    """Split text into lowercase search terms, without stopwords.
+    
+    Args:
+        text: Text to tokenize
+        
+    Returns:
+        Terms in order of appearance, repeats included
+    """
+    return [
+        term for term in SEARCH_TOKEN_RE.findall(text.lower())
+        if term not in SEARCH_STOPWORDS
+    ]
+
+
+def build_search_fields(title: str, content: str) -> Dict[str, Any]:
+    """Build the search index fields stored on a contract document.
+    
+    Args:
+        title: Contract title; its terms are always indexed
+        content: Extracted contract text
+        
+    Returns:
+        The "keywords", "term_freq" and "title_lc" fields
+    """
+    term_freq = Counter(search_terms(content))
+    title_terms = dict.fromkeys(search_terms(title))
+    for term in title_terms:
+        term_freq.setdefault(term, 0)
+    
+    keywords = list(title_terms)
+    for term, _ in term_freq.most_common():
+        if len(keywords) >= SEARCH_KEYWORDS_MAX:
+            break
+        if term not in title_terms:
+            keywords.append(term)
+    keywords = keywords[:SEARCH_KEYWORDS_MAX]
+    
+    return {
+        "keywords": keywords,
+        "term_freq": {term: term_freq[term] for term in keywords},
+        "title_lc": title.lower(),
+    }
+
+
+def without_search_fields(contract: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a contract without the search index fields, for API output."""
+    return {k: v for k, v in contract.items() if k not in SEARCH_INDEX_FIELDS}
+
+
+class BatchWriteError(Exception):
+    """Raised by ``AsyncBatcher.wait_drained`` when queued updates failed.
+    
+    Attributes:
+        errors: document_id -> exception for each of the caller's updates
+            that was not written
+    """
+    
+    def __init__(self, errors: Dict[str, Exception]):
+        self.errors = errors
+        super().__init__(
+            f"{len(errors)} queued update(s) failed: "
+            + ", ".join(f"{doc_id}: {e}" for doc_id, e in errors.items())
+        )
+
+
+class AsyncBatcher:
+    """Coalesces partial updates to one collection into batched writes.
+    
+    Updates for the same document are merged, and everything queued within
+    ``delay`` seconds of the first update is written in a single
+    ``FirestoreService.batch_write`` call. If that batch fails, its updates
+    are retried one by one so only the failing documents are lost.
+    
+    Each update's outcome is delivered to the caller that queued it: ``add``
+    returns a future, and ``wait_drained`` reports only the failures of
+    updates queued from the calling task.
+    """
+    
+    def __init__(
+        self,
+        firestore_service: "FirestoreService",
+        collection: str,
+        delay: float = WRITE_COALESCE_DELAY,
+    ):
+        self._firestore = firestore_service
+        self.collection = collection
+        self.delay = delay
+        # document_id -> merged fields waiting to be written
+        self.pending: Dict[str, Dict[str, Any]] = {}
+        # document_id -> futures of the updates merged into pending
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        # (document_id, future) of the updates queued from the current task
+        self._queued = contextvars.ContextVar(f"queued_{collection}_updates", default=None)
+        # Held while a flush is writing, so flushes apply in order
+        self._lock = asyncio.Lock()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks = set()
+    
+    @property
+    def busy(self) -> bool:
+        """Whether any update is queued or being written."""
+        return bool(self.pending) or self._lock.locked()
+    
+    def add(self, document_id: str, data: Dict[str, Any]) -> asyncio.Future:
+        """Queue a partial update, merging it with any queued for the document.
+        
+        Returns:
+            A future resolved once the update is written, or failed with the
+            error that prevented it
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.setdefault(document_id, {}).update(data)
+        self._waiters.setdefault(document_id, []).append(future)
+        
+        queued = self._queued.get()
+        if queued is None:
+            queued = []
+            self._queued.set(queued)
+        queued.append((document_id, future))
+        
+        if self._timer is None:
+            self._timer = loop.call_later(self.delay, self._schedule_flush)
+        return future
+    
+    def _schedule_flush(self):
+        self._timer = None
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def flush(self):
+        """Write all queued updates now.
+        
+        Failures are delivered through the futures returned by ``add``
+        rather than raised.
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        
+        async with self._lock:
+            pending, self.pending = self.pending, {}
+            waiters, self._waiters = self._waiters, {}
+            if not pending:
+                return
+            try:
+                await self._firestore.batch_write([
+                    (self.collection, document_id, data)
+                    for document_id, data in pending.items()
+                ])
+            except Exception as e:
+                print(f"⚠️ Batched write of {len(pending)} {self.collection} updates failed, retrying one by one: {e}")
+                for document_id, data in pending.items():
+                    try:
+                        await self._firestore.update_document(self.collection, document_id, data)
+                    except Exception as e:
+                        print(f"⚠️ Failed to update {self.collection}/{document_id}: {e}")
+                        _resolve(waiters.pop(document_id, []), e)
+            _resolve([f for futures in waiters.values() for f in futures], None)
+    
+    async def wait_drained(self):
+        """Flush queued updates and wait until every earlier update is written.
+        
+        Raises:
+            BatchWriteError: If any update queued from the calling task since
+                its last call failed
+        """
+        if self.busy:
+            await self.flush()
+        
+        queued = self._queued.get()
+        if not queued:
+            return
+        self._queued.set(None)
+        
+        outcomes = await asyncio.gather(
+            *(future for _, future in queued), return_exceptions=True
+        )
+        errors = {
+            document_id: outcome
+            for (document_id, _), outcome in zip(queued, outcomes)
+            if isinstance(outcome, BaseException)
+        }
+        if errors:
+            raise BatchWriteError(errors)
+
+
+def _resolve(futures: List[asyncio.Future], error: Optional[Exception]):
+    """Complete update futures with the write's outcome."""
+    for future in futures:
+        if future.done():
+            continue
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+            # Nobody may await it (e.g. the caller's task ended); don't log
+            # "exception was never retrieved" for an error already printed
+            future.exception()
+
 
 class FirestoreService:
     """Service for interacting with Firestore."""
@@ -24,11 +265,20 @@ class FirestoreService:
     MESSAGES = "messages"
     THINKING_LOGS = "thinking_logs"
     DOCUMENTS = "documents"
+    PDF_TEXT_CACHE = "pdf_text_cache"
     
     def __init__(self):
         """Initialize the Firestore service."""
         self.settings = get_settings()
         self._client = None
+        # contract_id -> (expires_at, contract), LRU ordered
+        self._contract_cache = OrderedDict()
+        # contract_id -> in-flight read shared by concurrent cache misses
+        self._contract_loads = {}
+        # Bumped on every contract write so in-flight reads don't cache stale data
+        self._contract_generation = 0
+        # Coalesced contract metadata updates
+        self.contract_writes = AsyncBatcher(self, self.CONTRACTS)
     
     @property
     def client(self) -> firestore.Client:
@@ -85,6 +335,9 @@ class FirestoreService:
             print(f"⚠️ Firestore timeout writing to {collection}/{document_id}")
             # Return the document_id anyway for local session management
             return document_id or str(data.get('id', uuid.uuid4()))
+        finally:
+            if collection == self.CONTRACTS and document_id:
+                self._invalidate_contract(document_id)
     
     async def get_document(
         self,
@@ -135,7 +388,11 @@ class FirestoreService:
         data["updated_at"] = firestore.SERVER_TIMESTAMP
         
         doc_ref = self.client.collection(collection).document(document_id)
-        await asyncio.to_thread(doc_ref.update, data)
+        try:
+            await asyncio.to_thread(doc_ref.update, data)
+        finally:
+            if collection == self.CONTRACTS:
+                self._invalidate_contract(document_id)
         return True
     
     async def delete_document(
@@ -153,16 +410,48 @@ class FirestoreService:
             True if successful
         """
         doc_ref = self.client.collection(collection).document(document_id)
-        await asyncio.to_thread(doc_ref.delete)
+        try:
+            await asyncio.to_thread(doc_ref.delete)
+        finally:
+            if collection == self.CONTRACTS:
+                self._invalidate_contract(document_id)
         return True
     
+    async def batch_write(
+        self,
+        writes: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> None:
+        """Apply partial updates to existing documents with batched writes.
+        
+        Each write is an ``update``, committed in batches of
+        FIRESTORE_BATCH_LIMIT; a missing document fails its whole batch.
+        
+        Args:
+            writes: (collection, document_id, data) tuples
+        """
+        contract_ids = [
+            document_id for collection, document_id, _ in writes
+            if collection == self.CONTRACTS
+        ]
+        try:
+            for start in range(0, len(writes), FIRESTORE_BATCH_LIMIT):
+                batch = self.client.batch()
+                for collection, document_id, data in writes[start:start + FIRESTORE_BATCH_LIMIT]:
+                    doc_ref = self.client.collection(collection).document(document_id)
+                    batch.update(doc_ref, {**data, "updated_at": firestore.SERVER_TIMESTAMP})
+                await asyncio.to_thread(batch.commit)
+        finally:
+            for contract_id in contract_ids:
+                self._invalidate_contract(contract_id)
+    
     async def query_documents(
         self,
         collection: str,
         filters: Optional[List[tuple]] = None,
         order_by: Optional[str] = None,
         order_direction: str = "DESCENDING",
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        start_after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """Query documents in a collection.
         
@@ -172,6 +461,9 @@ class FirestoreService:
             order_by: Field to order by
             order_direction: "ASCENDING" or "DESCENDING"
             limit: Maximum number of results
+            start_after: ID of the last document of the previous page; the
+                query resumes after it (a cursor, so skipped documents are
+                not read)
             
         Returns:
             List of matching documents
@@ -192,6 +484,14 @@ class FirestoreService:
             )
             query = query.order_by(order_by, direction=direction)
         
+        # Resume after the cursor document
+        if start_after:
+            cursor = await asyncio.to_thread(
+                self.client.collection(collection).document(start_after).get
+            )
+            if cursor.exists:
+                query = query.start_after(cursor)
+        
         # Apply limit
         if limit:
             query = query.limit(limit)
@@ -245,13 +545,59 @@ class FirestoreService:
             "compliance_status": None,
             "key_dates": [],
             "clauses": [],
+            **build_search_fields(title, content),
         }
         
         return await self.create_document(self.CONTRACTS, data)
     
     async def get_contract(self, contract_id: str) -> Optional[Dict[str, Any]]:
-        """Get a contract by ID."""
-        return await self.get_document(self.CONTRACTS, contract_id)
+        """Get a contract by ID.
+        
+        Reads are cached for CONTRACT_CACHE_TTL seconds and concurrent
+        misses for the same contract share one Firestore read. Contract
+        writes made through this service invalidate the cache. Queued
+        metadata updates for the contract are written first.
+        """
+        if self.contract_writes.busy:
+            # flush, not wait_drained: failures are reported to the tool caller
+            await self.contract_writes.flush()
+        
+        entry = self._contract_cache.get(contract_id)
+        if entry is not None:
+            if entry[0] >= time.monotonic():
+                self._contract_cache.move_to_end(contract_id)
+                return copy.deepcopy(entry[1])
+            del self._contract_cache[contract_id]
+        
+        load = self._contract_loads.get(contract_id)
+        if load is None:
+            load = asyncio.ensure_future(self._load_contract(contract_id))
+            self._contract_loads[contract_id] = load
+            load.add_done_callback(
+                lambda done: self._contract_loads.pop(contract_id, None)
+                if self._contract_loads.get(contract_id) is done else None
+            )
+        # Shielded so one cancelled caller doesn't cancel the shared read
+        contract = await asyncio.shield(load)
+        # Deep copies: callers mutate nested fields (analysis, metadata) and
+        # must not change the cached contract or each other's results
+        return copy.deepcopy(contract)
+    
+    async def _load_contract(self, contract_id: str) -> Optional[Dict[str, Any]]:
+        generation = self._contract_generation
+        contract = await self.get_document(self.CONTRACTS, contract_id)
+        if contract is not None and generation == self._contract_generation:
+            self._contract_cache[contract_id] = (time.monotonic() + CONTRACT_CACHE_TTL, contract)
+            self._contract_cache.move_to_end(contract_id)
+            if len(self._contract_cache) > CONTRACT_CACHE_SIZE:
+                self._contract_cache.popitem(last=False)
+        return contract
+    
+    def _invalidate_contract(self, contract_id: str):
+        self._contract_generation += 1
+        self._contract_cache.pop(contract_id, None)
+        # Later readers must not join a read that started before the write
+        self._contract_loads.pop(contract_id, None)
     
     async def update_contract_analysis(
         self,
@@ -283,9 +629,14 @@ class FirestoreService:
         self,
         status: Optional[str] = None,
         contract_type: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        start_after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """List contracts with optional filters."""
+        """List contracts with optional filters, newest first.
+        
+        Pass the ID of the last contract of a page as ``start_after`` to
+        get the next page.
+        """
         filters = []
         if status:
             filters.append(("status", "==", status))
@@ -296,7 +647,8 @@ class FirestoreService:
             self.CONTRACTS,
             filters=filters if filters else None,
             order_by="created_at",
-            limit=limit
+            limit=limit,
+            start_after=start_after
         )
     
     # =========================================================================
@@ -327,7 +679,102 @@ class FirestoreService:
         Returns:
             Clause ID
         """
-        data = {
+        data = self._clause_data(
+            contract_id,
+            clause_type,
+            content,
+            section_number,
+            risk_level,
+            risk_explanation,
+            compliance_issues,
+        )
+        
+        return await self.create_document(self.CLAUSES, data)
+    
+    async def bulk_create_clauses(
+        self,
+        contract_id: str,
+        clauses: List[Dict[str, Any]],
+        update_contract: bool = False,
+    ) -> List[str]:
+        """Create many clause documents with batched writes.
+        
+        Document IDs are generated client-side so every clause of a contract
+        is written in one commit per FIRESTORE_BATCH_LIMIT writes. With
+        ``update_contract`` the contract's ``clauses`` list is set in the
+        same final commit, so up to FIRESTORE_BATCH_LIMIT - 1 clauses and the
+        contract update are applied atomically in one round-trip.
+        
+        Args:
+            contract_id: Parent contract ID
+            clauses: Clause dicts with clause_type, content and optionally
+                section_number, risk_level, risk_explanation, compliance_issues
+            update_contract: Also set the contract's ``clauses`` field to the
+                new clause IDs
+            
+        Returns:
+            Clause IDs in the same order as ``clauses``
+        """
+        collection = self.client.collection(self.CLAUSES)
+        clause_ids = []
+        batch = self.client.batch()
+        pending = 0
+        
+        for clause in clauses:
+            if pending == FIRESTORE_BATCH_LIMIT:
+                await asyncio.to_thread(batch.commit)
+                batch = self.client.batch()
+                pending = 0
+            
+            doc_ref = collection.document()
+            data = self._clause_data(
+                contract_id,
+                clause["clause_type"],
+                clause["content"],
+                clause.get("section_number"),
+                clause.get("risk_level"),
+                clause.get("risk_explanation"),
+                clause.get("compliance_issues"),
+            )
+            data["created_at"] = firestore.SERVER_TIMESTAMP
+            data["updated_at"] = firestore.SERVER_TIMESTAMP
+            batch.set(doc_ref, data)
+            clause_ids.append(doc_ref.id)
+            pending += 1
+        
+        if update_contract:
+            if pending == FIRESTORE_BATCH_LIMIT:
+                await asyncio.to_thread(batch.commit)
+                batch = self.client.batch()
+                pending = 0
+            contract_ref = self.client.collection(self.CONTRACTS).document(contract_id)
+            batch.update(contract_ref, {
+                "clauses": clause_ids,
+                "updated_at": firestore.SERVER_TIMESTAMP,
+            })
+            pending += 1
+        
+        try:
+            if pending:
+                await asyncio.to_thread(batch.commit)
+        finally:
+            if update_contract:
+                self._invalidate_contract(contract_id)
+        
+        return clause_ids
+    
+    @staticmethod
+    def _clause_data(
+        contract_id: str,
+        clause_type: str,
+        content: str,
+        section_number: Optional[str] = None,
+        risk_level: Optional[str] = None,
+        risk_explanation: Optional[str] = None,
+        compliance_issues: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Build the stored fields of a clause document."""
+        return {
             "contract_id": contract_id,
             "clause_type": clause_type,
             "content": content,
@@ -337,17 +784,20 @@ class FirestoreService:
             "compliance_issues": compliance_issues or [],
             "recommendations": [],
         }
-        
-        return await self.create_document(self.CLAUSES, data)
     
     async def get_clauses_for_contract(
         self,
-        contract_id: str
+        contract_id: str,
+        clause_type: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get all clauses for a contract."""
+        """Get all clauses for a contract, optionally of one clause type."""
+        filters = [("contract_id", "==", contract_id)]
+        if clause_type:
+            filters.append(("clause_type", "==", clause_type))
+        
         return await self.query_documents(
             self.CLAUSES,
-            filters=[("contract_id", "==", contract_id)],
+            filters=filters,
             order_by="section_number",
             order_direction="ASCENDING"
         )
@@ -610,12 +1060,21 @@ class FirestoreService:
             limit=500
         )
         
-        count = 0
-        for session in old_sessions:
-            await self.delete_document(self.SESSIONS, session["id"])
-            count += 1
+        semaphore = asyncio.Semaphore(SESSION_DELETE_CONCURRENCY)
+        
+        async def delete_session(session_id: str):
+            async with semaphore:
+                await self.delete_document(self.SESSIONS, session_id)
+        
+        results = await asyncio.gather(
+            *(delete_session(session["id"]) for session in old_sessions),
+            return_exceptions=True,
+        )
+        failures = [result for result in results if isinstance(result, Exception)]
+        if failures:
+            print(f"⚠️ Failed to delete {len(failures)} of {len(old_sessions)} old sessions: {failures[0]}")
         
-        return count
+        return len(old_sessions) - len(failures)
 
 
 # Create singleton instance
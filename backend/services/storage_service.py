@@ -5,8 +5,13 @@ Handles all interactions with Google Cloud Storage.
 
 from google.cloud import storage
 from google.cloud.storage import Blob
+from google.cloud.exceptions import NotFound
+from google.cloud.storage.retry import DEFAULT_RETRY
 from typing import Optional, Tuple, BinaryIO
 import asyncio
+import random
+import time
+from collections import OrderedDict
 from functools import lru_cache
 from datetime import timedelta
 import mimetypes
@@ -14,6 +19,32 @@ import os
 
 from config.settings import get_settings
 
+# Optional native-asyncio client; without it blob I/O runs in worker threads
+try:
+    from aiohttp import ClientError, ClientResponseError
+    from gcloud.aio.storage import Storage as AioStorage
+    AIO_STORAGE_AVAILABLE = True
+except ImportError:
+    AIO_STORAGE_AVAILABLE = False
+
+# Blob resource fields requested by list_files
+LIST_BLOB_FIELDS = "items(name,size,contentType,timeCreated,updated),nextPageToken"
+# Resumable uploads send 8 MiB chunks (must be a multiple of 256 KiB);
+# each chunk is retried on its own
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_TIMEOUT = 120
+# Retry policy for aio uploads, matching DEFAULT_RETRY on the sync path:
+# jittered exponential backoff from 1s, doubling up to 60s, given up after
+# 120s, for timeouts, throttling and 5xx responses
+UPLOAD_RETRY_INITIAL = 1.0
+UPLOAD_RETRY_MAXIMUM = 60.0
+UPLOAD_RETRY_MULTIPLIER = 2.0
+UPLOAD_RETRY_DEADLINE = 120.0
+UPLOAD_RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+# Signed URLs kept for reuse; a cached URL is handed out again only while at
+# least half of the requested lifetime remains
+SIGNED_URL_CACHE_SIZE = 1024
+
 
 class StorageService:
     """Service for interacting with Google Cloud Storage."""
@@ -23,6 +54,9 @@ class StorageService:
         self.settings = get_settings()
         self._client = None
         self._bucket = None
+        # (blob_path, expiration_minutes) -> (url, expires_at)
+        self._url_cache = OrderedDict()
+        self._aio_client = None
     
     @property
     def client(self) -> storage.Client:
@@ -40,6 +74,27 @@ class StorageService:
             self._bucket = self.client.bucket(self.settings.gcs_bucket_name)
         return self._bucket
     
+    @property
+    def aio_client(self) -> Optional["AioStorage"]:
+        """Get or create the asyncio Storage client, if gcloud-aio-storage is installed.
+        
+        The client keeps one aiohttp session, so it must be created and used
+        on the application's event loop.
+        """
+        if not AIO_STORAGE_AVAILABLE:
+            return None
+        if self._aio_client is None:
+            self._aio_client = AioStorage(
+                service_file=self.settings.google_application_credentials
+            )
+        return self._aio_client
+    
+    async def close(self) -> None:
+        """Close the asyncio client's HTTP session, if one was opened."""
+        if self._aio_client is not None:
+            await self._aio_client.close()
+            self._aio_client = None
+    
     def _get_blob_path(self, folder: str, filename: str) -> str:
         """Construct the full blob path.
         
@@ -52,6 +107,14 @@ class StorageService:
         """
         return f"{folder}/{filename}"
     
+    def _strip_gs_uri(self, blob_path: str) -> str:
+        """Turn a gs://bucket/path URI into a bucket-relative path."""
+        if blob_path.startswith("gs://"):
+            parts = blob_path[5:].split("/", 1)
+            if len(parts) == 2:
+                return parts[1]
+        return blob_path
+    
     async def upload_file(
         self,
         file_data: BinaryIO,
@@ -73,7 +136,7 @@ class StorageService:
         folder = folder or self.settings.gcs_contracts_folder
         blob_path = self._get_blob_path(folder, filename)
         
-        blob = self.bucket.blob(blob_path)
+        blob = self.bucket.blob(blob_path, chunk_size=UPLOAD_CHUNK_SIZE)
         
         # Detect content type if not provided
         if content_type is None:
@@ -84,7 +147,9 @@ class StorageService:
         await asyncio.to_thread(
             blob.upload_from_file,
             file_data,
-            content_type=content_type
+            content_type=content_type,
+            timeout=UPLOAD_TIMEOUT,
+            retry=DEFAULT_RETRY,
         )
         
         # Return the GCS URI
@@ -111,20 +176,60 @@ class StorageService:
         folder = folder or self.settings.gcs_contracts_folder
         blob_path = self._get_blob_path(folder, filename)
         
-        blob = self.bucket.blob(blob_path)
-        
         if content_type is None:
             content_type, _ = mimetypes.guess_type(filename)
             content_type = content_type or "application/octet-stream"
         
+        aio_client = self.aio_client
+        if aio_client is not None:
+            await self._aio_upload(aio_client, blob_path, data, content_type)
+            return f"gs://{self.settings.gcs_bucket_name}/{blob_path}"
+        
+        blob = self.bucket.blob(blob_path, chunk_size=UPLOAD_CHUNK_SIZE)
         await asyncio.to_thread(
             blob.upload_from_string,
             data,
-            content_type=content_type
+            content_type=content_type,
+            timeout=UPLOAD_TIMEOUT,
+            retry=DEFAULT_RETRY,
         )
         
         return f"gs://{self.settings.gcs_bucket_name}/{blob_path}"
     
+    async def _aio_upload(
+        self,
+        aio_client: "AioStorage",
+        blob_path: str,
+        data: bytes,
+        content_type: str,
+    ) -> None:
+        """Upload bytes with the asyncio client, retrying transient failures.
+        
+        Follows the same policy as DEFAULT_RETRY on the sync path (see
+        UPLOAD_RETRY_*). Each attempt re-sends the whole object.
+        """
+        deadline = time.monotonic() + UPLOAD_RETRY_DEADLINE
+        delay = UPLOAD_RETRY_INITIAL
+        while True:
+            try:
+                await aio_client.upload(
+                    self.settings.gcs_bucket_name,
+                    blob_path,
+                    data,
+                    content_type=content_type,
+                    timeout=UPLOAD_TIMEOUT,
+                )
+                return
+            except (ClientError, asyncio.TimeoutError) as e:
+                if isinstance(e, ClientResponseError) and e.status not in UPLOAD_RETRY_STATUSES:
+                    raise
+                sleep = random.uniform(0, delay)
+                if time.monotonic() + sleep > deadline:
+                    raise
+                print(f"⚠️ Upload of {blob_path} failed, retrying in {sleep:.1f}s: {e}")
+                await asyncio.sleep(sleep)
+                delay = min(delay * UPLOAD_RETRY_MULTIPLIER, UPLOAD_RETRY_MAXIMUM)
+    
     async def upload_contract_pdf(
         self,
         file_data: BinaryIO,
@@ -201,15 +306,51 @@ class StorageService:
             File contents as bytes
         """
         # Handle both full URI and path
-        if blob_path.startswith("gs://"):
-            # Parse gs:// URI
-            parts = blob_path[5:].split("/", 1)
-            if len(parts) == 2:
-                blob_path = parts[1]
+        blob_path = self._strip_gs_uri(blob_path)
+        
+        aio_client = self.aio_client
+        if aio_client is not None:
+            try:
+                return await aio_client.download(self.settings.gcs_bucket_name, blob_path)
+            except ClientResponseError as e:
+                # Keep the same exception as the google-cloud-storage path
+                if e.status == 404:
+                    raise NotFound(f"Blob {blob_path} not found") from e
+                raise
         
         blob = self.bucket.blob(blob_path)
         return await asyncio.to_thread(blob.download_as_bytes)
     
+    async def download_to_filename(
+        self,
+        blob_path: str,
+        filename: str,
+    ) -> None:
+        """Stream a file from Cloud Storage to a local path.
+        
+        The blob is written in chunks, so it is never held in memory whole.
+        
+        Args:
+            blob_path: Path to the blob (without gs:// prefix)
+            filename: Local file to write
+        """
+        blob_path = self._strip_gs_uri(blob_path)
+        
+        aio_client = self.aio_client
+        if aio_client is not None:
+            try:
+                await aio_client.download_to_filename(
+                    self.settings.gcs_bucket_name, blob_path, filename
+                )
+                return
+            except ClientResponseError as e:
+                if e.status == 404:
+                    raise NotFound(f"Blob {blob_path} not found") from e
+                raise
+        
+        blob = self.bucket.blob(blob_path)
+        await asyncio.to_thread(blob.download_to_filename, filename)
+    
     async def download_contract(self, contract_id: str) -> Optional[bytes]:
         """Download a contract PDF by ID.
         
@@ -219,16 +360,20 @@ class StorageService:
         Returns:
             PDF bytes or None if not found
         """
-        # Try common extensions
-        for ext in [".pdf", ".PDF"]:
+        # Try common extensions; upload_contract_pdf keeps the original
+        # extension, so an upper-case .PDF is possible. Downloading directly
+        # and treating NotFound as a miss avoids a separate exists() call.
+        for ext in (".pdf", ".PDF"):
             blob_path = self._get_blob_path(
                 self.settings.gcs_contracts_folder,
                 f"{contract_id}{ext}"
             )
             blob = self.bucket.blob(blob_path)
             
-            if await asyncio.to_thread(blob.exists):
+            try:
                 return await asyncio.to_thread(blob.download_as_bytes)
+            except NotFound:
+                continue
         
         return None
     
@@ -246,11 +391,15 @@ class StorageService:
         Returns:
             Signed URL
         """
-        # Handle gs:// URI
-        if blob_path.startswith("gs://"):
-            parts = blob_path[5:].split("/", 1)
-            if len(parts) == 2:
-                blob_path = parts[1]
+        blob_path = self._strip_gs_uri(blob_path)
+        
+        # Signing may need an IAM signBlob call, so reuse a recent URL
+        key = (blob_path, expiration_minutes)
+        now = time.time()
+        cached = self._url_cache.get(key)
+        if cached is not None and cached[1] - now >= expiration_minutes * 30:
+            self._url_cache.move_to_end(key)
+            return cached[0]
         
         blob = self.bucket.blob(blob_path)
         
@@ -260,6 +409,11 @@ class StorageService:
             method="GET"
         )
         
+        self._url_cache[key] = (url, now + expiration_minutes * 60)
+        self._url_cache.move_to_end(key)
+        if len(self._url_cache) > SIGNED_URL_CACHE_SIZE:
+            self._url_cache.popitem(last=False)
+        
         return url
     
     async def delete_file(self, blob_path: str) -> bool:
@@ -271,19 +425,14 @@ class StorageService:
         Returns:
             True if deleted, False if not found
         """
-        # Handle gs:// URI
-        if blob_path.startswith("gs://"):
-            parts = blob_path[5:].split("/", 1)
-            if len(parts) == 2:
-                blob_path = parts[1]
+        blob = self.bucket.blob(self._strip_gs_uri(blob_path))
         
-        blob = self.bucket.blob(blob_path)
-        
-        if await asyncio.to_thread(blob.exists):
+        # A single DELETE; a missing blob comes back as NotFound
+        try:
             await asyncio.to_thread(blob.delete)
-            return True
-        
-        return False
+        except NotFound:
+            return False
+        return True
     
     async def list_files(
         self,
@@ -307,24 +456,29 @@ class StorageService:
         if prefix:
             full_prefix = f"{full_prefix}{prefix}"
         
-        blobs = self.client.list_blobs(
-            self.settings.gcs_bucket_name,
-            prefix=full_prefix,
-            max_results=limit
-        )
-        
-        results = []
-        for blob in blobs:
-            results.append({
-                "name": blob.name,
-                "size": blob.size,
-                "content_type": blob.content_type,
-                "created": blob.time_created.isoformat() if blob.time_created else None,
-                "updated": blob.updated.isoformat() if blob.updated else None,
-                "uri": f"gs://{self.settings.gcs_bucket_name}/{blob.name}",
-            })
-        
-        return results
+        def _list():
+            # Only request the fields used below to keep list pages small
+            blobs = self.client.list_blobs(
+                self.settings.gcs_bucket_name,
+                prefix=full_prefix,
+                max_results=limit,
+                fields=LIST_BLOB_FIELDS,
+            )
+            
+            results = []
+            for blob in blobs:
+                results.append({
+                    "name": blob.name,
+                    "size": blob.size,
+                    "content_type": blob.content_type,
+                    "created": blob.time_created.isoformat() if blob.time_created else None,
+                    "updated": blob.updated.isoformat() if blob.updated else None,
+                    "uri": f"gs://{self.settings.gcs_bucket_name}/{blob.name}",
+                })
+            return results
+        
+        # Paging through the listing is blocking I/O
+        return await asyncio.to_thread(_list)
     
     async def file_exists(self, blob_path: str) -> bool:
         """Check if a file exists.
@@ -335,11 +489,7 @@ class StorageService:
         Returns:
             True if file exists
         """
-        # Handle gs:// URI
-        if blob_path.startswith("gs://"):
-            parts = blob_path[5:].split("/", 1)
-            if len(parts) == 2:
-                blob_path = parts[1]
+        blob_path = self._strip_gs_uri(blob_path)
         
         blob = self.bucket.blob(blob_path)
         return await asyncio.to_thread(blob.exists)
@@ -353,11 +503,7 @@ class StorageService:
         Returns:
             Metadata dict or None if not found
         """
-        # Handle gs:// URI
-        if blob_path.startswith("gs://"):
-            parts = blob_path[5:].split("/", 1)
-            if len(parts) == 2:
-                blob_path = parts[1]
+        blob_path = self._strip_gs_uri(blob_path)
         
         blob = self.bucket.blob(blob_path)
         
@@ -190,4 +190,7 @@ CREATE TABLE fact_risk_report (
     blob_url VARCHAR(1000) NOT NULL,
     report_type VARCHAR(50) DEFAULT 'comprehensive',
     created_date DATETIME DEFAULT GETDATE()
-);
\ No newline at end of file
+);
+
+-- get_reports lists reports newest first
+CREATE INDEX IX_fact_risk_report_created_date ON fact_risk_report (created_date DESC);
\ No newline at end of file
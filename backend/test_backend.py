@@ -415,6 +415,42 @@ def test_environment_check():
     return True
 
 
+def test_lazy_imports():
+    """Check that importing the packages does not pull in the legacy Azure SDKs."""
+    print("\n" + "="*60)
+    print("TESTING LAZY PACKAGE IMPORTS")
+    print("="*60)
+    
+    import subprocess
+    
+    # Trace a fresh interpreter so modules already imported by this suite
+    # do not hide a regression
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import agents, config, managers, plugins"],
+        cwd=str(backend_dir),
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        log_test("Import packages", "FAIL", result.stderr.strip().splitlines()[-1])
+        return False
+    
+    imported = {
+        line.rsplit("|", 1)[-1].strip()
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    ok = True
+    for heavy in ("semantic_kernel", "azure.ai.projects", "azure.identity"):
+        if heavy in imported:
+            log_test(f"Package import skips {heavy}", "FAIL", f"{heavy} imported eagerly")
+            ok = False
+        else:
+            log_test(f"Package import skips {heavy}", "PASS")
+    
+    return ok
+
+
 async def run_all_tests():
     """Run all tests."""
     print("\n" + "LEGALMIND BACKEND TEST SUITE".center(60, "="))
@@ -424,6 +460,7 @@ async def run_all_tests():
     
     results.append(("Environment", test_environment_check()))
     results.append(("Imports", test_imports()))
+    results.append(("Lazy Imports", test_lazy_imports()))
     results.append(("Settings", test_settings()))
     results.append(("Tool Definitions", test_tool_definitions()))
     results.append(("Agent Configuration", test_agent_configuration()))
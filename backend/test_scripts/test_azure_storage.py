@@ -1,46 +1,121 @@
 """Test script to verify Azure Storage connection and file upload."""
 
+import asyncio
+import atexit
 import os
 from datetime import datetime
-from azure.storage.blob import BlobServiceClient, ContentSettings
-from azure.identity import DefaultAzureCredential
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.storage.blob import ContentSettings
+from azure.storage.blob.aio import BlobServiceClient
+from azure.identity.aio import DefaultAzureCredential
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Parallel block uploads per blob (the SDK's ParallelOperationThreadCount),
+# clamped to 2x the CPU count within 8..32
+UPLOAD_CONCURRENCY = min(32, max(8, (os.cpu_count() or 1) * 2))
+# Block size is a client option; upload_blob() does not take it per call
+CLIENT_OPTIONS = {
+    "max_block_size": 8 * 1024 * 1024,
+    "max_single_put_size": 8 * 1024 * 1024,
+    "connection_timeout": 60,
+    "read_timeout": 300,
+}
+# Open connections allowed at once; enough for every parallel block upload
+CONNECTION_POOL_SIZE = 64
+# Test uploads share this prefix and are removed again after each run
+TEST_BLOB_PREFIX = "test/test_file_"
+# A blob batch request holds at most 256 sub-requests
+BLOB_BATCH_SIZE = 256
+
+# Reused for every call in this process: one event loop keeps the aiohttp
+# session, the Blob client and the credential (with its cached token) alive
+# between test runs instead of walking the credential chain each time
+_runner = asyncio.Runner()
+_session = None
+_credential = None
+_blob_service_client = None
+
+async def _get_blob_service_client():
+    """Creates the shared Blob client on first use."""
+    global _session, _credential, _blob_service_client
+    if _blob_service_client is not None:
+        return _blob_service_client
+    
+    storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
+    storage_account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
+    if not storage_connection_string and not storage_account_name:
+        raise ValueError("Neither AZURE_STORAGE_CONNECTION_STRING nor AZURE_STORAGE_ACCOUNT_NAME is set")
+    
+    # One aiohttp session with a pool large enough that parallel block PUTs
+    # do not queue for a connection. aiohttp only sends Expect: 100-continue
+    # when asked to, so each PUT is a single round trip.
+    _session = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=CONNECTION_POOL_SIZE),
+        trust_env=False,
+    )
+    transport = AioHttpTransport(session=_session, session_owner=False)
+    
+    # Try connection string first
+    if storage_connection_string:
+        print("Using connection string for authentication...")
+        _blob_service_client = BlobServiceClient.from_connection_string(
+            storage_connection_string, transport=transport, **CLIENT_OPTIONS
+        )
+    else:
+        # Use DefaultAzureCredential if no connection string
+        print("Using DefaultAzureCredential for authentication...")
+        # Skip credential sources this project never uses so a miss does not
+        # pay for their probes; workload identity is only tried inside AKS
+        _credential = DefaultAzureCredential(
+            exclude_shared_token_cache_credential=True,
+            exclude_visual_studio_code_credential=True,
+            exclude_powershell_credential=True,
+            exclude_developer_cli_credential=True,
+            exclude_workload_identity_credential=not os.getenv("AZURE_FEDERATED_TOKEN_FILE"),
+        )
+        account_url = f"https://{storage_account_name}.blob.core.windows.net"
+        _blob_service_client = BlobServiceClient(
+            account_url, credential=_credential, transport=transport, **CLIENT_OPTIONS
+        )
+    return _blob_service_client
+
+async def _close_clients():
+    """Closes the shared Blob client, credential and HTTP session."""
+    if _blob_service_client is not None:
+        await _blob_service_client.close()
+    if _credential is not None:
+        await _credential.close()
+    if _session is not None:
+        await _session.close()
+
+@atexit.register
+def _shutdown():
+    _runner.run(_close_clients())
+    _runner.close()
+
 def test_azure_storage_upload():
     """Test Azure Storage upload functionality with a dummy text file."""
+    return _runner.run(_run_upload_test())
+
+async def _run_upload_test():
+    """Runs the upload test with the asyncio Blob client."""
     
     # Get configuration from environment
-    storage_connection_string = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
     storage_container = os.getenv("AZURE_STORAGE_CONTAINER", "procurement-expediting-risk-reports")
-    storage_account_name = os.getenv("AZURE_STORAGE_ACCOUNT_NAME")
-    
-    # Initialize blob service client
-    blob_service_client = None
     
     try:
-        # Try connection string first
-        if storage_connection_string:
-            print("Using connection string for authentication...")
-            blob_service_client = BlobServiceClient.from_connection_string(storage_connection_string)
-        elif storage_account_name:
-            # Use DefaultAzureCredential if no connection string
-            print("Using DefaultAzureCredential for authentication...")
-            credential = DefaultAzureCredential()
-            account_url = f"https://{storage_account_name}.blob.core.windows.net"
-            blob_service_client = BlobServiceClient(account_url, credential=credential)
-
-        else:
-            raise ValueError("Neither AZURE_STORAGE_CONNECTION_STRING nor AZURE_STORAGE_ACCOUNT_NAME is set")
+        blob_service_client = await _get_blob_service_client()
         
         # Get container client
         container_client = blob_service_client.get_container_client(storage_container)
         
         # Create container if it doesn't exist
         try:
-            container_client.create_container()
+            await container_client.create_container()
             print(f"Created container: {storage_container}")
         except Exception as e:
             if "ContainerAlreadyExists" in str(e):
@@ -48,10 +123,9 @@ def test_azure_storage_upload():
             else:
                 raise
         
-        # Create a dummy text file
+        # Build a dummy text file in memory
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"test_file_{timestamp}.txt"
-        local_path = f"./test_{timestamp}.txt"
+        filename = f"{TEST_BLOB_PREFIX}{timestamp}.txt"
         
         # Write some test content
         test_content = f"""
@@ -61,34 +135,33 @@ def test_azure_storage_upload():
             Container: {storage_container}
         """
         
-        with open(local_path, 'w') as f:
-            f.write(test_content)
-        
-        print(f"Created local test file: {local_path}")
-        
-        # Upload the file
-        blob_path = f"test/{filename}"
+        # Upload the file; blocks go up in parallel once it spans several
+        blob_path = filename
         blob_client = container_client.get_blob_client(blob_path)
         
-        with open(local_path, "rb") as data:
-            blob_client.upload_blob(
-                data, 
-                overwrite=True,
-                content_settings=ContentSettings(content_type="text/plain")
-            )
+        await blob_client.upload_blob(
+            test_content.encode("utf-8"),
+            overwrite=True,
+            max_concurrency=UPLOAD_CONCURRENCY,
+            content_settings=ContentSettings(content_type="text/plain")
+        )
         
         print(f"Successfully uploaded file to: {blob_path}")
         print(f"Blob URL: {blob_client.url}")
         
         # List blobs in the container to verify
         print("\nListing blobs in container:")
-        blobs = container_client.list_blobs()
-        for blob in blobs:
+        async for blob in container_client.list_blobs():
             print(f"- {blob.name}")
         
-        # Clean up local file
-        os.remove(local_path)
-        print(f"\nCleaned up local file: {local_path}")
+        # Remove this and any earlier test uploads, up to 256 per batch request
+        test_blobs = [
+            blob.name
+            async for blob in container_client.list_blobs(name_starts_with=TEST_BLOB_PREFIX)
+        ]
+        for start in range(0, len(test_blobs), BLOB_BATCH_SIZE):
+            await container_client.delete_blobs(*test_blobs[start:start + BLOB_BATCH_SIZE])
+        print(f"\nDeleted {len(test_blobs)} test blob(s)")
         
         return True
         
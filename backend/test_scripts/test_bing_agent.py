@@ -6,7 +6,7 @@
 """
 DESCRIPTION:
     This sample demonstrates how to use agent operations with the Bing grounding tool from
-    the Azure Agents service using a synchronous client.
+    the Azure Agents service using an asynchronous client.
 
 USAGE:
     python sample_agents_bing_grounding.py
@@ -24,10 +24,15 @@ USAGE:
        "Connected resources" tab in your Azure AI Foundry project.
 """
 
+import asyncio
+import hashlib
+import json
 import os
-from azure.ai.projects import AIProjectClient
+from pathlib import Path
+from azure.ai.projects.aio import AIProjectClient
 from azure.ai.projects.models import MessageRole, BingGroundingTool
-from azure.identity import DefaultAzureCredential
+from azure.core.exceptions import ResourceNotFoundError
+from azure.identity.aio import DefaultAzureCredential
 from dotenv import load_dotenv
 load_dotenv()
 
@@ -38,19 +43,16 @@ bing_connection_name = os.getenv("BING_CONNECTION_NAME")
 bing_api_key = os.getenv("BING_SEARCH_API_KEY")
 
 print(bing_connection_name)
-project_client = AIProjectClient.from_connection_string(
-    credential=DefaultAzureCredential(),
-    conn_str=project_connection_string,
-)
 
-
-
-# Initialize agent bing tool and add the connection id
-bing_connection = project_client.connections.get(connection_name=bing_connection_name)
-conn_id = bing_connection.id
-
-# 2. Initialize Bing grounding tool
-bing_tool = BingGroundingTool(connection_id=conn_id)
+# The agent is created once under this name and reused by later runs
+AGENT_NAME = "political-risk-agent"
+# Agent id from the last run, keyed by a hash of its definition
+AGENT_CACHE_FILE = Path(__file__).with_name(".bing_agent_cache.json")
+# Run polling starts at 100 ms and doubles up to a 2 s ceiling
+RUN_POLL_INITIAL_INTERVAL = 0.1
+RUN_POLL_MAX_INTERVAL = 2.0
+# Run states that mean the run has not finished yet
+RUN_ACTIVE_STATES = ("queued", "in_progress", "cancelling")
 
 POLITICAL_RISK_AGENT_INSTRUCTIONS = """
 You are a Political Risk Intelligence Agent. Your job is to:
@@ -116,53 +118,148 @@ content = """
 SCHEDULER_AGENT > ```json { "projectInfo": [ { "name": "Project A", "location": "Tuas South Avenue 14, Singapore 637312" } ], "manufacturingLocations": [ "Rathenaustra\u00dfe 2, 93055 Regensburg, Germany" ], "shippingPorts": [ "Hamburg", "Wilhelmshaven" ], "receivingPorts": [ "Penang Port", "Singapore" ], "equipmentItems": [ { "code": "123456", "name": "LV Switchgear - 400V/5000A Switchboard-1 (3-Sections)", "origin": "Germany", "destination": "Singapore", "status": "Ahead", "p6DueDate": "2026-02-21", "deliveryDate": "2026-01-21", "variance": "-31" }, { "code": "123457", "name": "LV Switchgear - 400V/5000A Switchboard-2 (3-Sections)", "origin": "Germany", "destination": "Singapore", "status": "Ahead", "p6DueDate": "2026-02-25", "deliveryDate": "2026-02-20", "variance": "-5" }, { "code": "123458", "name": "LV Switchgear - 400V/5000A Switchboard-3 (3-Sections)", "origin": "Germany", "destination": "Singapore", "status": "Late", "p6DueDate": "2026-02-27", "deliveryDate": "2026-03-07", "variance": "8" } ], "searchQuery": { "political": "Political risks manufacturing exports Germany to Singapore Electrical Equipment current issues", "tariff": "Germany Singapore tariffs Electrical Equipment trade agreements", "logistics": "Hamburg to Penang Port shipping route issues logistics current delays" } } ```
 """
 
-# Create agent with the bing tool and process assistant run
-with project_client:
-    agent = project_client.agents.create_agent(
-        model=os.getenv("AZURE_AI_AGENT_MODEL_DEPLOYMENT_NAME"),
-        name="my-assistant",
+def _agent_definition_hash():
+    """Hash everything the agent is created from, so any change forces a new agent."""
+    definition = "\n".join([
+        model_deployment_name or "",
+        bing_connection_name or "",
+        POLITICAL_RISK_AGENT_INSTRUCTIONS,
+    ])
+    return hashlib.sha256(definition.encode("utf-8")).hexdigest()
+
+
+def _load_cached_agent_id(definition_hash):
+    try:
+        cache = json.loads(AGENT_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if cache.get("definition_hash") != definition_hash:
+        return None
+    return cache.get("agent_id")
+
+
+def _save_cached_agent_id(agent_id, definition_hash):
+    AGENT_CACHE_FILE.write_text(
+        json.dumps({"agent_id": agent_id, "definition_hash": definition_hash}),
+        encoding="utf-8",
+    )
+
+
+async def get_or_create_agent(project_client):
+    """Reuse the persistent political risk agent, creating it only when needed.
+    
+    The cached id is tried first, then an agent named AGENT_NAME. An agent
+    found by name is only reused if the cache says it has the current
+    definition; otherwise it is replaced.
+    
+    Args:
+        project_client: The async AIProjectClient
+        
+    Returns:
+        The agent to run the thread with
+    """
+    definition_hash = _agent_definition_hash()
+    cached_agent_id = _load_cached_agent_id(definition_hash)
+    if cached_agent_id:
+        try:
+            agent = await project_client.agents.get_agent(cached_agent_id)
+            print(f"Reusing agent, ID: {agent.id}")
+            return agent
+        except ResourceNotFoundError:
+            print(f"Cached agent {cached_agent_id} no longer exists")
+    
+    response = await project_client.agents.list_agents(limit=100)
+    existing = next((a for a in response.data if a.name == AGENT_NAME), None)
+    if existing:
+        # Not in the cache for this definition, so its instructions are stale
+        await project_client.agents.delete_agent(existing.id)
+        print(f"Deleted outdated agent, ID: {existing.id}")
+    
+    # Initialize Bing grounding tool with the connection id
+    bing_connection = await project_client.connections.get(connection_name=bing_connection_name)
+    bing_tool = BingGroundingTool(connection_id=bing_connection.id)
+    
+    agent = await project_client.agents.create_agent(
+        model=model_deployment_name,
+        name=AGENT_NAME,
         instructions=POLITICAL_RISK_AGENT_INSTRUCTIONS,
         tools=bing_tool.definitions,
         headers={"x-ms-enable-preview": "true"},
     )
-    # [END create_agent_with_bing_grounding_tool]
-
+    _save_cached_agent_id(agent.id, definition_hash)
     print(f"Created agent, ID: {agent.id}")
+    return agent
 
-    # Create thread for communication
-    thread = project_client.agents.create_thread()
-    print(f"Created thread, ID: {thread.id}")
 
-    # Create message to thread
-    message = project_client.agents.create_message(
+async def start_thread(project_client):
+    """Create a thread and post the test message to it."""
+    thread = await project_client.agents.create_thread()
+    print(f"Created thread, ID: {thread.id}")
+    
+    message = await project_client.agents.create_message(
         thread_id=thread.id,
         role=MessageRole.USER,
         content=content,
     )
     print(f"Created message, ID: {message.id}")
-
-    # Create and process agent run in thread with tools
-    run = project_client.agents.create_and_process_run(thread_id=thread.id, agent_id=agent.id)
-    print(f"Run finished with status: {run.status}")
-
-    if run.status == "failed":
-        print(f"Run failed: {run.last_error}")
-
-    # Delete the assistant when done
-    project_client.agents.delete_agent(agent.id)
-    print("Deleted agent")
-
-    # Print the Agent's response message with optional citation
-    response_message = project_client.agents.list_messages(thread_id=thread.id).get_last_message_by_role(
-        MessageRole.AGENT
-    )
-
-    print("#####################################################")
-    print (response_message)
-
-    print("#####################################################")
-    if response_message:
-        for text_message in response_message.text_messages:
-            print(f"Agent response: {text_message.text.value}")
-        for annotation in response_message.url_citation_annotations:
-            print(f"URL Citation: [{annotation.url_citation.title}]({annotation.url_citation.url})")
\ No newline at end of file
+    return thread
+
+
+async def run_until_complete(project_client, thread_id, agent_id):
+    """Start a run and poll it with exponential backoff until it finishes.
+    
+    Short runs are picked up within ~100 ms, while long Bing-grounded runs
+    settle into one status request every two seconds.
+    
+    Args:
+        project_client: The async AIProjectClient
+        thread_id: The thread to run
+        agent_id: The agent to run the thread with
+        
+    Returns:
+        The finished run
+    """
+    run = await project_client.agents.create_run(thread_id=thread_id, agent_id=agent_id)
+    attempt = 0
+    while run.status in RUN_ACTIVE_STATES:
+        await asyncio.sleep(min(RUN_POLL_INITIAL_INTERVAL * 2 ** attempt, RUN_POLL_MAX_INTERVAL))
+        attempt += 1
+        run = await project_client.agents.get_run(thread_id=thread_id, run_id=run.id)
+    return run
+
+
+async def main():
+    async with DefaultAzureCredential() as credential, AIProjectClient.from_connection_string(
+        credential=credential,
+        conn_str=project_connection_string,
+    ) as project_client:
+        # Resolve the agent while the thread and message are being created
+        agent, thread = await asyncio.gather(
+            get_or_create_agent(project_client),
+            start_thread(project_client),
+        )
+        
+        # Create and process agent run in thread with tools
+        run = await run_until_complete(project_client, thread.id, agent.id)
+        print(f"Run finished with status: {run.status}")
+        
+        if run.status == "failed":
+            print(f"Run failed: {run.last_error}")
+        
+        # Print the Agent's response message with optional citation
+        messages = await project_client.agents.list_messages(thread_id=thread.id)
+        response_message = messages.get_last_message_by_role(MessageRole.AGENT)
+        
+        print("#####################################################")
+        print (response_message)
+        
+        print("#####################################################")
+        if response_message:
+            for text_message in response_message.text_messages:
+                print(f"Agent response: {text_message.text.value}")
+            for annotation in response_message.url_citation_annotations:
+                print(f"URL Citation: [{annotation.url_citation.title}]({annotation.url_citation.url})")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,10 +3,121 @@ Clause Tools
 Tools for clause extraction and analysis.
 """
 
-from typing import Dict, List, Any, Optional
+import copy
+import re
+import time
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
 from services.firestore_service import get_firestore_service
 
+# Optional: pyahocorasick matches every keyword in one pass over the text
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Entries kept in each clause lookup cache, and how long they stay fresh
+CLAUSE_CACHE_SIZE = 1024
+CLAUSE_CACHE_TTL = 60
+
+# Characters of each section's text stored with its clause; the clause
+# type is still decided from the whole section
+CLAUSE_CONTENT_MAX_CHARS = 1000
+
+# Common clause patterns to identify; earlier types win when several match
+CLAUSE_PATTERNS = {
+    "indemnification": ["indemnif", "hold harmless", "defend and indemnify"],
+    "limitation_of_liability": ["limitation of liability", "limited liability", "cap on damages"],
+    "confidentiality": ["confidential", "non-disclosure", "proprietary information"],
+    "termination": ["terminat", "cancellation", "end of agreement"],
+    "intellectual_property": ["intellectual property", "ip rights", "patent", "copyright", "trademark"],
+    "payment": ["payment terms", "compensation", "fees", "invoic"],
+    "warranties": ["warrant", "representation", "guarantee"],
+    "governing_law": ["governing law", "jurisdiction", "venue", "applicable law"],
+    "dispute_resolution": ["arbitrat", "mediat", "dispute resolution"],
+    "force_majeure": ["force majeure", "act of god", "unforeseen circumstances"],
+    "assignment": ["assign", "transfer of rights", "novation"],
+    "non_compete": ["non-compete", "non-competition", "restrictive covenant"],
+    "data_protection": ["data protection", "privacy", "gdpr", "personal data"],
+}
+
+
+def _build_clause_automaton(patterns: Dict[str, List[str]]):
+    """Compile all clause keywords into one Aho-Corasick automaton.
+    
+    Each keyword maps to (priority, clause_type), priority being the
+    position of its clause type in ``patterns``.
+    """
+    automaton = ahocorasick.Automaton()
+    for priority, (clause_type, keywords) in enumerate(patterns.items()):
+        for keyword in keywords:
+            if not automaton.exists(keyword):
+                automaton.add_word(keyword, (priority, clause_type))
+    automaton.make_automaton()
+    return automaton
+
+
+CLAUSE_AUTOMATON = _build_clause_automaton(CLAUSE_PATTERNS) if AHOCORASICK_AVAILABLE else None
+
+# A whole section header line; the alternatives are the three header rules
+# (ends with a colon / digit in the first five chars of a short line / all
+# caps), applied to the line with surrounding whitespace stripped
+SECTION_HEADER_RE = re.compile(
+    r"^[^\S\n]*(?P<line>(?=\S)(?:"
+    r"[^\n]*?:"
+    r"|(?=[^\n]{0,4}\d)[^\n]{1,99}?"
+    r"|(?=[^\n]*[A-Z])[^a-z\n]*?"
+    r"))[^\S\n]*$",
+    re.MULTILINE,
+)
+# A line break plus the whitespace around it, including any blank lines
+BODY_LINE_BREAK_RE = re.compile(r"[^\S\n]*\n\s*")
+
+# One case-insensitive matcher per clause type, in priority order; searched
+# on the original text so no lowered copy is needed
+CLAUSE_TYPE_REGEXES = [
+    (clause_type, re.compile("|".join(map(re.escape, keywords)), re.IGNORECASE))
+    for clause_type, keywords in CLAUSE_PATTERNS.items()
+]
+
+# clause_id -> (expires_at, clause) and (clause_type, risk_level, limit) ->
+# (expires_at, clauses); both are LRU ordered
+_clause_cache = OrderedDict()
+_similar_clauses_cache = OrderedDict()
+
+
+def _cache_get(cache: OrderedDict, key):
+    """Return a fresh cached value, or None."""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    if entry[0] < time.monotonic():
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return entry[1]
+
+
+def _cache_put(cache: OrderedDict, key, value):
+    cache[key] = (time.monotonic() + CLAUSE_CACHE_TTL, value)
+    cache.move_to_end(key)
+    if len(cache) > CLAUSE_CACHE_SIZE:
+        cache.popitem(last=False)
+
+
+def invalidate_clause_cache(clause_id: Optional[str] = None):
+    """Drop cached clause lookups after clauses are written.
+    
+    Args:
+        clause_id: The changed clause; None when only new clauses were added
+    """
+    if clause_id is not None:
+        _clause_cache.pop(clause_id, None)
+    # Any write can change which clauses match a similarity query
+    _similar_clauses_cache.clear()
+
 
 async def extract_clauses(
     contract_id: str,
@@ -23,31 +134,80 @@ async def extract_clauses(
     """
     firestore = get_firestore_service()
     
-    # Common clause patterns to identify
-    clause_patterns = {
-        "indemnification": ["indemnif", "hold harmless", "defend and indemnify"],
-        "limitation_of_liability": ["limitation of liability", "limited liability", "cap on damages"],
-        "confidentiality": ["confidential", "non-disclosure", "proprietary information"],
-        "termination": ["terminat", "cancellation", "end of agreement"],
-        "intellectual_property": ["intellectual property", "ip rights", "patent", "copyright", "trademark"],
-        "payment": ["payment terms", "compensation", "fees", "invoic"],
-        "warranties": ["warrant", "representation", "guarantee"],
-        "governing_law": ["governing law", "jurisdiction", "venue", "applicable law"],
-        "dispute_resolution": ["arbitrat", "mediat", "dispute resolution"],
-        "force_majeure": ["force majeure", "act of god", "unforeseen circumstances"],
-        "assignment": ["assign", "transfer of rights", "novation"],
-        "non_compete": ["non-compete", "non-competition", "restrictive covenant"],
-        "data_protection": ["data protection", "privacy", "gdpr", "personal data"],
-    }
-    
     # Simple clause extraction (in production, use NLP/ML)
-    lines = content.split('\n')
+    # Sections are parsed lazily, so only the current one is held at full
+    # length; each record keeps just its truncated text
     extracted_clauses = []
-    current_section = ""
-    current_content = []
-    section_number = 0
+    for section_number, (title, section_text) in enumerate(_iter_sections(content)):
+        extracted_clauses.append({
+            "section_number": str(section_number),
+            "clause_type": _identify_clause_type(section_text),
+            "title": title,
+            "content": section_text[:CLAUSE_CONTENT_MAX_CHARS],
+        })
+    
+    # Save clauses and link them to the contract in batched writes
+    clause_ids = await firestore.bulk_create_clauses(
+        contract_id,
+        extracted_clauses,
+        update_contract=True,
+    )
+    invalidate_clause_cache()
+    for clause, clause_id in zip(extracted_clauses, clause_ids):
+        clause["id"] = clause_id
+    
+    return {
+        "status": "success",
+        "clauses": extracted_clauses,
+        "count": len(extracted_clauses)
+    }
+
+
+def _iter_sections(content: str) -> Iterator[Tuple[str, str]]:
+    """Split contract text into (header, body) sections, yielded in order.
+    
+    A stripped, non-empty line is a header if it is all caps, ends with a
+    colon, or is under 100 characters with a digit in its first five.
+    Body lines are stripped and joined with single spaces; text with no
+    header of its own is carried into the next section.
+    """
+    if not content.isascii():
+        # The regexes only model str.isupper()/isdigit() for ASCII text
+        yield from _iter_sections_by_line(content)
+        return
     
-    for line in lines:
+    # Body text is kept as stripped slices of content (normally one per
+    # section) and only flattened once, when its section is emitted
+    title = ""
+    body = []
+    pos = 0
+    for match in SECTION_HEADER_RE.finditer(content):
+        piece = content[pos:match.start()].strip()
+        if piece:
+            body.append(piece)
+        if title and body:
+            yield title, _flatten_body(body)
+            body = []
+        title = match.group("line")
+        pos = match.end()
+    piece = content[pos:].strip()
+    if piece:
+        body.append(piece)
+    if title and body:
+        yield title, _flatten_body(body)
+
+
+def _flatten_body(pieces: List[str]) -> str:
+    """Join body slices into one line, collapsing each line break to a space."""
+    text = pieces[0] if len(pieces) == 1 else ' '.join(pieces)
+    return BODY_LINE_BREAK_RE.sub(' ', text)
+
+
+def _iter_sections_by_line(content: str) -> Iterator[Tuple[str, str]]:
+    """Line-by-line version of _iter_sections for non-ASCII text."""
+    title = ""
+    body = []
+    for line in content.split('\n'):
         line = line.strip()
         if not line:
             continue
@@ -59,66 +219,39 @@ async def extract_clauses(
             (len(line) < 100 and any(char.isdigit() for char in line[:5]))
         )
         
-        if is_header and current_section and current_content:
-            # Save previous section
-            section_text = ' '.join(current_content)
-            clause_type = _identify_clause_type(section_text, clause_patterns)
-            
-            extracted_clauses.append({
-                "section_number": str(section_number),
-                "clause_type": clause_type,
-                "title": current_section,
-                "content": section_text[:1000],  # Truncate for storage
-            })
-            current_content = []
-            section_number += 1
+        if is_header and title and body:
+            yield title, ' '.join(body)
+            body = []
         
         if is_header:
-            current_section = line
+            title = line
         else:
-            current_content.append(line)
+            body.append(line)
     
     # Don't forget the last section
-    if current_section and current_content:
-        section_text = ' '.join(current_content)
-        clause_type = _identify_clause_type(section_text, clause_patterns)
-        extracted_clauses.append({
-            "section_number": str(section_number),
-            "clause_type": clause_type,
-            "title": current_section,
-            "content": section_text[:1000],
-        })
-    
-    # Save clauses to Firestore
-    clause_ids = []
-    for clause in extracted_clauses:
-        clause_id = await firestore.create_clause(
-            contract_id=contract_id,
-            clause_type=clause["clause_type"],
-            content=clause["content"],
-            section_number=clause["section_number"],
-        )
-        clause_ids.append(clause_id)
-        clause["id"] = clause_id
-    
-    # Update contract with clause IDs
-    await firestore.update_document(
-        firestore.CONTRACTS,
-        contract_id,
-        {"clauses": clause_ids}
-    )
-    
-    return {
-        "status": "success",
-        "clauses": extracted_clauses,
-        "count": len(extracted_clauses)
-    }
+    if title and body:
+        yield title, ' '.join(body)
 
 
-def _identify_clause_type(text: str, patterns: Dict[str, List[str]]) -> str:
+def _identify_clause_type(text: str, patterns: Dict[str, List[str]] = CLAUSE_PATTERNS) -> str:
     """Identify clause type based on content patterns."""
-    text_lower = text.lower()
+    if patterns is CLAUSE_PATTERNS:
+        if CLAUSE_AUTOMATON is not None:
+            # Single pass over the text; keep the highest-priority match
+            best = None
+            for _, (priority, clause_type) in CLAUSE_AUTOMATON.iter(text.lower()):
+                if best is None or priority < best[0]:
+                    best = (priority, clause_type)
+                    if priority == 0:
+                        break
+            return best[1] if best else "general"
+        
+        for clause_type, regex in CLAUSE_TYPE_REGEXES:
+            if regex.search(text):
+                return clause_type
+        return "general"
     
+    text_lower = text.lower()
     for clause_type, keywords in patterns.items():
         for keyword in keywords:
             if keyword in text_lower:
@@ -136,13 +269,17 @@ async def get_clause(clause_id: str) -> Dict[str, Any]:
     Returns:
         Clause data
     """
-    firestore = get_firestore_service()
-    clause = await firestore.get_document(firestore.CLAUSES, clause_id)
+    clause = _cache_get(_clause_cache, clause_id)
+    if clause is None:
+        firestore = get_firestore_service()
+        clause = await firestore.get_document(firestore.CLAUSES, clause_id)
+        if clause:
+            _cache_put(_clause_cache, clause_id, clause)
     
     if clause:
         return {
             "status": "success",
-            "clause": clause
+            "clause": copy.deepcopy(clause)
         }
     return {
         "status": "error",
@@ -164,10 +301,7 @@ async def get_contract_clauses(
         List of clauses
     """
     firestore = get_firestore_service()
-    clauses = await firestore.get_clauses_for_contract(contract_id)
-    
-    if clause_type:
-        clauses = [c for c in clauses if c.get("clause_type") == clause_type]
+    clauses = await firestore.get_clauses_for_contract(contract_id, clause_type)
     
     return {
         "status": "success",
@@ -195,28 +329,28 @@ async def update_clause_analysis(
     Returns:
         Update status
     """
-    firestore = get_firestore_service()
-    
-    update_data = {}
-    if risk_level:
-        update_data["risk_level"] = risk_level
-    if risk_explanation:
-        update_data["risk_explanation"] = risk_explanation
-    if compliance_issues:
-        update_data["compliance_issues"] = compliance_issues
-    if recommendations:
-        update_data["recommendations"] = recommendations
-    
-    if update_data:
-        await firestore.update_document(firestore.CLAUSES, clause_id, update_data)
+    update_data = {
+        field: value
+        for field, value in (
+            ("risk_level", risk_level),
+            ("risk_explanation", risk_explanation),
+            ("compliance_issues", compliance_issues),
+            ("recommendations", recommendations),
+        )
+        if value
+    }
+    if not update_data:
         return {
-            "status": "success",
-            "message": "Clause analysis updated"
+            "status": "error",
+            "message": "No analysis data provided"
         }
     
+    firestore = get_firestore_service()
+    await firestore.update_document(firestore.CLAUSES, clause_id, update_data)
+    invalidate_clause_cache(clause_id)
     return {
-        "status": "error",
-        "message": "No analysis data provided"
+        "status": "success",
+        "message": "Clause analysis updated"
     }
 
 
@@ -235,21 +369,25 @@ async def find_similar_clauses(
     Returns:
         List of similar clauses
     """
-    firestore = get_firestore_service()
-    
-    filters = [("clause_type", "==", clause_type)]
-    if risk_level:
-        filters.append(("risk_level", "==", risk_level))
-    
-    clauses = await firestore.query_documents(
-        firestore.CLAUSES,
-        filters=filters,
-        limit=limit
-    )
+    key = (clause_type, risk_level, limit)
+    clauses = _cache_get(_similar_clauses_cache, key)
+    if clauses is None:
+        firestore = get_firestore_service()
+        
+        filters = [("clause_type", "==", clause_type)]
+        if risk_level:
+            filters.append(("risk_level", "==", risk_level))
+        
+        clauses = await firestore.query_documents(
+            firestore.CLAUSES,
+            filters=filters,
+            limit=limit
+        )
+        _cache_put(_similar_clauses_cache, key, clauses)
     
     return {
         "status": "success",
-        "clauses": clauses,
+        "clauses": copy.deepcopy(clauses),
         "count": len(clauses)
     }
 
@@ -3,13 +3,48 @@ Contract Tools
 Tools for contract parsing and management.
 """
 
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import PyPDF2
 import pdfplumber
-import io
+import asyncio
+import hashlib
+import multiprocessing
+import os
+import re
+import tempfile
 
-from services.firestore_service import get_firestore_service
+from services.firestore_service import (
+    SEARCH_QUERY_TERMS_MAX,
+    build_search_fields,
+    get_firestore_service,
+    search_terms,
+    without_search_fields,
+)
+from config.settings import get_settings
 from services.storage_service import get_storage_service
+from utils import pdf_text
+from utils.pdf_text import PYMUPDF_AVAILABLE
+
+# PDFs with more pages than this are split across worker processes
+PARALLEL_EXTRACTION_MIN_PAGES = 20
+
+# Largest extracted text (UTF-8 bytes) stored in the PDF text cache; Firestore
+# documents are capped at 1 MiB including field names and overhead
+PDF_TEXT_CACHE_MAX_BYTES = 1_000_000
+
+_extraction_pool = None
+_extraction_workers = None
+
+# "field:value" terms in a search query that become Firestore filters
+SEARCH_FILTER_RE = re.compile(r'\b(contract_type|type|status):("[^"]*"|\S+)', re.IGNORECASE)
+# Filter name in the query -> contract field
+SEARCH_FILTER_FIELDS = {
+    "contract_type": "contract_type",
+    "type": "contract_type",
+    "status": "status",
+}
 
 
 async def get_contract(contract_id: str) -> Dict[str, Any]:
@@ -27,7 +62,7 @@ async def get_contract(contract_id: str) -> Dict[str, Any]:
     if contract:
         return {
             "status": "success",
-            "contract": contract
+            "contract": without_search_fields(contract)
         }
     else:
         return {
@@ -39,7 +74,8 @@ async def get_contract(contract_id: str) -> Dict[str, Any]:
 async def list_contracts(
     status: Optional[str] = None,
     contract_type: Optional[str] = None,
-    limit: int = 50
+    limit: int = 50,
+    start_after: Optional[str] = None
 ) -> Dict[str, Any]:
     """List contracts with optional filters.
     
@@ -47,22 +83,27 @@ async def list_contracts(
         status: Filter by status (pending_analysis, analyzed)
         contract_type: Filter by contract type (NDA, MSA, etc.)
         limit: Maximum number of results
+        start_after: next_cursor from the previous page
         
     Returns:
-        List of contracts
+        List of contracts, with a next_cursor when there may be more
     """
     firestore = get_firestore_service()
     contracts = await firestore.list_contracts(
         status=status,
         contract_type=contract_type,
-        limit=limit
+        limit=limit,
+        start_after=start_after
     )
     
-    return {
+    result = {
         "status": "success",
-        "contracts": contracts,
+        "contracts": [without_search_fields(c) for c in contracts],
         "count": len(contracts)
     }
+    if contracts and len(contracts) == limit:
+        result["next_cursor"] = contracts[-1]["id"]
+    return result
 
 
 async def extract_contract_text(contract_id: str) -> Dict[str, Any]:
@@ -102,28 +143,52 @@ async def extract_contract_text(contract_id: str) -> Dict[str, Any]:
                 "message": "No file associated with contract"
             }
         
-        pdf_bytes = await storage.download_file(file_url)
-        
-        # Extract text using pdfplumber (better quality)
-        text_content = ""
-        with pdfplumber.open(io.BytesIO(pdf_bytes)) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text_content += page_text + "\n\n"
+        # Stream the PDF to a temporary file instead of holding it in memory;
+        # the parsers (and extraction workers) open it by path. A file in a
+        # temporary directory, not an open NamedTemporaryFile, so it can be
+        # reopened by name on Windows too.
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            pdf_path = os.path.join(tmp_dir, "contract.pdf")
+            await storage.download_to_filename(file_url, pdf_path)
+            
+            # The same PDF is often uploaded for several contracts, so reuse
+            # text already extracted from identical bytes
+            digest = await asyncio.to_thread(_file_digest, pdf_path)
+            cached = await firestore.get_document(firestore.PDF_TEXT_CACHE, digest)
+            if cached and "content" in cached:
+                text_content = cached["content"]
+                page_count = cached.get("page_count", 0)
+            else:
+                # Parsing is CPU-bound, so keep it off the event loop
+                text_content, page_count = await _extract_text(pdf_path, contract_id)
+                text_size = len(text_content.encode("utf-8"))
+                if text_size > PDF_TEXT_CACHE_MAX_BYTES:
+                    print(f"⚠️ Not caching extracted text for {contract_id}: {text_size} bytes exceeds the Firestore document limit")
+                else:
+                    try:
+                        await firestore.create_document(
+                            firestore.PDF_TEXT_CACHE,
+                            {"content": text_content, "page_count": page_count},
+                            document_id=digest,
+                        )
+                    except Exception as e:
+                        print(f"⚠️ Could not cache extracted text for {contract_id}: {e}")
         
-        # Update contract with extracted content
+        # Update contract with extracted content and its search index
         await firestore.update_document(
             firestore.CONTRACTS,
             contract_id,
-            {"content": text_content}
+            {
+                "content": text_content,
+                **build_search_fields(contract.get("title", ""), text_content),
+            }
         )
         
         return {
             "status": "success",
             "content": text_content,
             "source": "extracted",
-            "page_count": len(pdf.pages) if pdf else 0
+            "page_count": page_count
         }
         
     except Exception as e:
@@ -133,6 +198,111 @@ async def extract_contract_text(contract_id: str) -> Dict[str, Any]:
         }
 
 
+def _file_digest(pdf_path: str) -> str:
+    """BLAKE2b-128 hex digest of a file, read in chunks."""
+    with open(pdf_path, "rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+async def _extract_text(pdf_path: str, contract_id: str) -> Tuple[str, int]:
+    """Extract PDF text without blocking the event loop.
+    
+    Large PDFs are split into page ranges parsed in parallel worker
+    processes; smaller ones are parsed in a single worker thread.
+    
+    Returns:
+        The extracted text and the page count
+    """
+    global _extraction_pool
+    
+    workers = _pdf_extraction_workers()
+    if PYMUPDF_AVAILABLE and workers > 1:
+        try:
+            page_count = await asyncio.to_thread(pdf_text.count_pages, pdf_path)
+            if page_count > PARALLEL_EXTRACTION_MIN_PAGES:
+                if _extraction_pool is None:
+                    # spawn, not fork: the parent has gRPC and executor threads.
+                    # Workers only import utils.pdf_text to run their jobs.
+                    _extraction_pool = ProcessPoolExecutor(
+                        max_workers=workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                loop = asyncio.get_running_loop()
+                step = -(-page_count // workers)
+                parts = await asyncio.gather(*(
+                    loop.run_in_executor(
+                        _extraction_pool,
+                        pdf_text.extract_page_range,
+                        pdf_path,
+                        start,
+                        min(start + step, page_count),
+                    )
+                    for start in range(0, page_count, step)
+                ))
+                return "".join(parts), page_count
+        except Exception as e:
+            if isinstance(e, BrokenProcessPool):
+                shutdown_extraction_pool()
+            print(f"⚠️ PyMuPDF could not read contract {contract_id}, using pdfplumber: {e}")
+            return await asyncio.to_thread(_extract_text_pdfplumber, pdf_path)
+    
+    return await asyncio.to_thread(_extract_text_sync, pdf_path, contract_id)
+
+
+def shutdown_extraction_pool():
+    """Stop the PDF extraction worker processes, if any were started."""
+    global _extraction_pool
+    
+    if _extraction_pool is not None:
+        _extraction_pool.shutdown(wait=False, cancel_futures=True)
+        _extraction_pool = None
+
+
+def _pdf_extraction_workers() -> int:
+    """Worker processes for parallel extraction.
+    
+    The pdf_extraction_workers setting, capped at the CPUs this process may
+    run on (os.cpu_count() reports the whole host, not the container).
+    """
+    global _extraction_workers
+    
+    if _extraction_workers is None:
+        try:
+            cpus = len(os.sched_getaffinity(0))
+        except AttributeError:
+            # Not available on Windows and macOS
+            cpus = os.cpu_count() or 1
+        _extraction_workers = max(1, min(get_settings().pdf_extraction_workers, cpus))
+    return _extraction_workers
+
+
+def _extract_text_sync(pdf_path: str, contract_id: str) -> Tuple[str, int]:
+    """Extract text with PyMuPDF, falling back to pdfplumber.
+    
+    Blocking; run it in a worker thread from async code.
+    
+    Returns:
+        The extracted text and the page count
+    """
+    if PYMUPDF_AVAILABLE:
+        try:
+            return pdf_text.extract_text(pdf_path)
+        except Exception as e:
+            print(f"⚠️ PyMuPDF could not read contract {contract_id}, using pdfplumber: {e}")
+    return _extract_text_pdfplumber(pdf_path)
+
+
+def _extract_text_pdfplumber(pdf_path: str) -> Tuple[str, int]:
+    """Extract page text with pdfplumber, in the same format as PyMuPDF."""
+    text_content = ""
+    with pdfplumber.open(pdf_path) as pdf:
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                text_content += page_text + "\n\n"
+        return text_content, len(pdf.pages)
+
+
 async def update_contract_metadata(
     contract_id: str,
     contract_type: Optional[str] = None,
@@ -165,11 +335,9 @@ async def update_contract_metadata(
         update_data["status"] = status
     
     if update_data:
-        await firestore.update_document(
-            firestore.CONTRACTS,
-            contract_id,
-            update_data
-        )
+        # Queued so several updates in a row share one write; the chatbot
+        # manager drains the queue before returning tool results
+        firestore.contract_writes.add(contract_id, update_data)
         return {
             "status": "success",
             "message": "Contract updated successfully",
@@ -188,9 +356,11 @@ async def search_contracts(
 ) -> Dict[str, Any]:
     """Search contracts by text content.
     
-    Note: For full-text search, you might want to use
-    a dedicated search service or Firestore's array-contains.
-    This is a simplified implementation.
+    Contracts are looked up through their "keywords" index with Firestore's
+    array-contains-any and ranked by how often the query terms occur, with
+    a boost when the whole query appears in the title. Terms such as
+    ``contract_type:NDA`` or ``status:analyzed`` are applied as Firestore
+    filters; a query made only of filters lists the matching contracts.
     
     Args:
         query: Search query
@@ -200,30 +370,54 @@ async def search_contracts(
         Matching contracts
     """
     firestore = get_firestore_service()
-    
-    # Get all contracts and filter (simple implementation)
-    # For production, consider using Firestore's full-text search
-    # or integrating with Algolia/Elasticsearch
-    all_contracts = await firestore.list_contracts(limit=100)
+    filters = [
+        (SEARCH_FILTER_FIELDS[name.lower()], "==", value.strip('"'))
+        for name, value in SEARCH_FILTER_RE.findall(query)
+    ]
+    if filters:
+        query = SEARCH_FILTER_RE.sub(" ", query).strip()
+        if not query:
+            contracts = await firestore.query_documents(
+                firestore.CONTRACTS,
+                filters=filters,
+                order_by="created_at",
+                limit=limit
+            )
+            return {
+                "status": "success",
+                "contracts": [without_search_fields(c) for c in contracts],
+                "count": len(contracts),
+                "total_matches": len(contracts)
+            }
     
     query_lower = query.lower()
-    matching = []
+    terms = list(dict.fromkeys(search_terms(query)))[:SEARCH_QUERY_TERMS_MAX]
     
-    for contract in all_contracts:
-        title = contract.get("title", "").lower()
-        content = contract.get("content", "").lower()
-        
-        if query_lower in title or query_lower in content:
-            # Add relevance score (simple)
-            score = 0
-            if query_lower in title:
+    matching = []
+    if terms:
+        candidates = await firestore.query_documents(
+            firestore.CONTRACTS,
+            filters=[*filters, ("keywords", "array_contains_any", terms)],
+            limit=limit * 5
+        )
+        for contract in candidates:
+            term_freq = contract.get("term_freq", {})
+            score = sum(term_freq.get(term, 0) for term in terms)
+            title_lc = contract.get("title_lc")
+            if title_lc is None:
+                title_lc = contract.get("title", "").lower()
+            if query_lower in title_lc:
                 score += 10
-            if query_lower in content:
-                score += content.count(query_lower)
             
+            contract = without_search_fields(contract)
             contract["_relevance_score"] = score
             matching.append(contract)
     
+    if not matching:
+        # Contracts stored before the keyword index existed, and queries made
+        # only of stopwords or punctuation, need the full scan
+        matching = await _scan_contracts(query_lower, filters)
+    
     # Sort by relevance
     matching.sort(key=lambda x: x.get("_relevance_score", 0), reverse=True)
     
@@ -235,6 +429,34 @@ async def search_contracts(
     }
 
 
+async def _scan_contracts(
+    query_lower: str,
+    filters: List[Tuple[str, str, str]]
+) -> List[Dict[str, Any]]:
+    """Substring-match the query against the latest 100 contracts passing filters."""
+    firestore = get_firestore_service()
+    all_contracts = await firestore.query_documents(
+        firestore.CONTRACTS,
+        filters=filters or None,
+        order_by="created_at",
+        limit=100
+    )
+    
+    matching = []
+    for contract in all_contracts:
+        # One scan of the content: a non-zero count already implies a match
+        score = contract.get("content", "").lower().count(query_lower)
+        if query_lower in contract.get("title", "").lower():
+            score += 10
+        
+        if score:
+            contract = without_search_fields(contract)
+            contract["_relevance_score"] = score
+            matching.append(contract)
+    
+    return matching
+
+
 # Tool definitions for Gemini function calling
 CONTRACT_TOOLS = [
     {
@@ -270,6 +492,10 @@ CONTRACT_TOOLS = [
                 "limit": {
                     "type": "integer",
                     "description": "Maximum number of results (default 50)"
+                },
+                "start_after": {
+                    "type": "string",
+                    "description": "next_cursor from a previous call, to get the next page"
                 }
             }
         },
@@ -344,7 +570,7 @@ CONTRACT_TOOLS = [
             "properties": {
                 "query": {
                     "type": "string",
-                    "description": "Search query text"
+                    "description": "Search query text; may include filters like contract_type:NDA or status:analyzed"
                 },
                 "limit": {
                     "type": "integer",
@@ -6,6 +6,7 @@ Tools for generating legal documents.
 from typing import Dict, List, Any, Optional
 from datetime import datetime
 from io import BytesIO
+import asyncio
 from docx import Document
 from docx.shared import Inches, Pt
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -159,17 +160,17 @@ async def generate_contract_summary(
     firestore = get_firestore_service()
     storage = get_storage_service()
     
-    # Get contract data
-    contract = await firestore.get_contract(contract_id)
+    # Get contract data and clauses concurrently
+    contract, clauses = await asyncio.gather(
+        firestore.get_contract(contract_id),
+        firestore.get_clauses_for_contract(contract_id),
+    )
     if not contract:
         return {
             "status": "error",
             "message": f"Contract {contract_id} not found"
         }
     
-    # Get clauses
-    clauses = await firestore.get_clauses_for_contract(contract_id)
-    
     # Create document
     doc = Document()
     
@@ -287,15 +288,16 @@ async def generate_risk_report(
     firestore = get_firestore_service()
     storage = get_storage_service()
     
-    contract = await firestore.get_contract(contract_id)
+    contract, clauses = await asyncio.gather(
+        firestore.get_contract(contract_id),
+        firestore.get_clauses_for_contract(contract_id),
+    )
     if not contract:
         return {
             "status": "error",
             "message": f"Contract {contract_id} not found"
         }
     
-    clauses = await firestore.get_clauses_for_contract(contract_id)
-    
     doc = Document()
     
     # Title
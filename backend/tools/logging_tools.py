@@ -5,6 +5,7 @@ Tools for logging agent thinking and reasoning.
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import asyncio
 import time
 
 from services.firestore_service import get_firestore_service
@@ -148,20 +149,18 @@ async def get_session_trace(
     """
     firestore = get_firestore_service()
     
-    # Get session info
-    session = await firestore.get_session(session_id)
+    # Get session info, messages and thinking logs concurrently
+    session, messages, logs = await asyncio.gather(
+        firestore.get_session(session_id),
+        firestore.get_messages(session_id),
+        firestore.get_thinking_logs(session_id=session_id),
+    )
     if not session:
         return {
             "status": "error",
             "message": f"Session {session_id} not found"
         }
     
-    # Get messages
-    messages = await firestore.get_messages(session_id)
-    
-    # Get thinking logs
-    logs = await firestore.get_thinking_logs(session_id=session_id)
-    
     # Combine into timeline
     timeline = []
     
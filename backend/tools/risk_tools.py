@@ -5,8 +5,10 @@ Tools for risk assessment and analysis.
 
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+import asyncio
 
 from services.firestore_service import get_firestore_service
+from tools.clause_tools import invalidate_clause_cache
 
 
 # Risk patterns and indicators
@@ -103,6 +105,42 @@ RISK_INDICATORS = {
     },
 }
 
+# Negotiation advice per risk type, used for contract-level recommendations
+RISK_RECOMMENDATIONS = {
+    "high_liability": {
+        "action": "Negotiate liability caps",
+        "detail": "Request a cap on liability, typically limited to the contract value or a multiple thereof. Exclude consequential damages."
+    },
+    "weak_termination": {
+        "action": "Improve termination rights",
+        "detail": "Add termination for convenience with reasonable notice (30-90 days). Remove or reduce termination penalties."
+    },
+    "one_sided": {
+        "action": "Balance contract terms",
+        "detail": "Negotiate mutual rights where possible. Add 'reasonable' qualifiers to discretionary terms."
+    },
+    "ip_risk": {
+        "action": "Clarify IP ownership",
+        "detail": "Clearly define IP ownership boundaries. Consider joint ownership or license back provisions."
+    },
+    "data_risk": {
+        "action": "Strengthen data protections",
+        "detail": "Add data security requirements, retention limits, and deletion rights. Restrict third-party sharing."
+    },
+    "vague_language": {
+        "action": "Clarify ambiguous terms",
+        "detail": "Replace vague terms with specific, measurable criteria. Define what constitutes 'reasonable'."
+    },
+    "missing_protection": {
+        "action": "Add standard protections",
+        "detail": "Request basic warranties and representations. Avoid blanket waivers without negotiation."
+    },
+    "dispute_risk": {
+        "action": "Improve dispute resolution",
+        "detail": "Negotiate a favorable or neutral venue. Consider mediation before arbitration. Review jury waiver."
+    },
+}
+
 
 async def assess_contract_risk(
     contract_id: str,
@@ -206,45 +244,10 @@ def _generate_risk_recommendations(findings: List[Dict]) -> List[Dict]:
     """Generate recommendations based on risk findings."""
     recommendations = []
     
-    recommendation_templates = {
-        "high_liability": {
-            "action": "Negotiate liability caps",
-            "detail": "Request a cap on liability, typically limited to the contract value or a multiple thereof. Exclude consequential damages."
-        },
-        "weak_termination": {
-            "action": "Improve termination rights",
-            "detail": "Add termination for convenience with reasonable notice (30-90 days). Remove or reduce termination penalties."
-        },
-        "one_sided": {
-            "action": "Balance contract terms",
-            "detail": "Negotiate mutual rights where possible. Add 'reasonable' qualifiers to discretionary terms."
-        },
-        "ip_risk": {
-            "action": "Clarify IP ownership",
-            "detail": "Clearly define IP ownership boundaries. Consider joint ownership or license back provisions."
-        },
-        "data_risk": {
-            "action": "Strengthen data protections",
-            "detail": "Add data security requirements, retention limits, and deletion rights. Restrict third-party sharing."
-        },
-        "vague_language": {
-            "action": "Clarify ambiguous terms",
-            "detail": "Replace vague terms with specific, measurable criteria. Define what constitutes 'reasonable'."
-        },
-        "missing_protection": {
-            "action": "Add standard protections",
-            "detail": "Request basic warranties and representations. Avoid blanket waivers without negotiation."
-        },
-        "dispute_risk": {
-            "action": "Improve dispute resolution",
-            "detail": "Negotiate a favorable or neutral venue. Consider mediation before arbitration. Review jury waiver."
-        },
-    }
-    
     for finding in findings:
         risk_type = finding["risk_type"]
-        if risk_type in recommendation_templates:
-            template = recommendation_templates[risk_type]
+        if risk_type in RISK_RECOMMENDATIONS:
+            template = RISK_RECOMMENDATIONS[risk_type]
             recommendations.append({
                 "risk_type": risk_type,
                 "severity": finding["severity"],
@@ -305,6 +308,7 @@ async def assess_clause_risk(
             "risk_explanation": explanation,
         }
     )
+    invalidate_clause_cache(clause_id)
     
     return {
         "status": "success",
@@ -329,7 +333,11 @@ async def get_contract_risk_summary(
     """
     firestore = get_firestore_service()
     
-    contract = await firestore.get_contract(contract_id)
+    # Fetch the contract and its clauses concurrently
+    contract, clauses = await asyncio.gather(
+        firestore.get_contract(contract_id),
+        firestore.get_clauses_for_contract(contract_id),
+    )
     if not contract:
         return {
             "status": "error",
@@ -337,7 +345,6 @@ async def get_contract_risk_summary(
         }
     
     # Get clause risk distribution
-    clauses = await firestore.get_clauses_for_contract(contract_id)
     
     risk_distribution = {
         "low": 0,
@@ -379,8 +386,12 @@ async def compare_contract_risks(
     
     comparisons = []
     
-    for contract_id in contract_ids:
-        contract = await firestore.get_contract(contract_id)
+    # Contract lookups are independent, so fetch them all at once
+    contracts = await asyncio.gather(*(
+        firestore.get_contract(contract_id) for contract_id in contract_ids
+    ))
+    
+    for contract_id, contract in zip(contract_ids, contracts):
         if contract:
             comparisons.append({
                 "contract_id": contract_id,
@@ -1,13 +1,34 @@
 """Utilities module initialization."""
 
-try:
-    from .database_utils import get_connection
-except ImportError:
-    get_connection = None
-    
-from .thinking_log_viewer import render_thinking_log_viewer
-
-__all__ = [
+from importlib import import_module
+
+# Exported name -> submodule; submodules are imported on first access so that
+# e.g. ``utils.db_pool`` does not pull in streamlit via the log viewer
+_LAZY = {
+    'get_connection': 'database_utils',
+    'render_thinking_log_viewer': 'thinking_log_viewer',
+}
+
+__all__ = (
     'get_connection',
-    'render_thinking_log_viewer'
-]
\ No newline at end of file
+    'render_thinking_log_viewer',
+)
+
+
+def __getattr__(name):
+    """Import the submodule that defines ``name`` on first access."""
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(import_module(f".{_LAZY[name]}", __name__), name)
+    except ImportError:
+        if name != 'get_connection':
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """List only the exported names so introspection does not import them."""
+    return list(__all__)
@@ -0,0 +1,107 @@
+"""Shared pyodbc connection pools for the legacy SQL plugins."""
+
+import logging
+import queue
+import threading
+from contextlib import contextmanager
+
+import pyodbc
+
+logger = logging.getLogger(__name__)
+
+# Idle connections kept open per connection string
+DEFAULT_POOL_SIZE = 8
+
+
+class PyodbcPool:
+    """A bounded pool of idle pyodbc connections for one connection string.
+
+    Connections are opened on demand; at most ``size`` idle connections are
+    kept, any extra ones are closed when released.
+    """
+
+    def __init__(self, connection_string, size=DEFAULT_POOL_SIZE):
+        self.connection_string = connection_string
+        self._idle = queue.LifoQueue(maxsize=size)
+
+    def acquire(self):
+        """Get a live connection, reusing an idle one when possible.
+
+        Returns:
+            pyodbc.Connection: The database connection
+        """
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return pyodbc.connect(self.connection_string)
+
+            # Check the idle connection is still usable before handing it out
+            try:
+                cursor = conn.cursor()
+                try:
+                    cursor.execute("SELECT 1")
+                finally:
+                    cursor.close()
+                return conn
+            except Exception as e:
+                logger.debug("Discarding stale database connection: %s", e)
+                _close_quietly(conn)
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full.
+
+        Any uncommitted work is rolled back so the next user starts clean.
+        """
+        try:
+            conn.rollback()
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            _close_quietly(conn)
+        except Exception as e:
+            logger.debug("Closing unusable database connection: %s", e)
+            _close_quietly(conn)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a ``with`` block.
+
+        The connection is closed instead of returned if the block raised.
+        """
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            _close_quietly(conn)
+            raise
+        self.release(conn)
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(connection_string, size=DEFAULT_POOL_SIZE):
+    """Get the process-wide pool for a connection string, creating it once.
+
+    Args:
+        connection_string: ODBC connection string
+        size: Idle connections to keep if the pool is created by this call
+
+    Returns:
+        PyodbcPool: The shared pool
+    """
+    pool = _pools.get(connection_string)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(connection_string)
+            if pool is None:
+                pool = _pools[connection_string] = PyodbcPool(connection_string, size)
+    return pool
@@ -4,14 +4,40 @@ Provides consistent error responses and logging
 """
 
 from fastapi import Request, status
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.exceptions import RequestValidationError
-from datetime import datetime
+from datetime import datetime, timezone
+from functools import lru_cache
+import json
 import logging
+import time
 from typing import Optional, Dict, Any
 
 logger = logging.getLogger(__name__)
 
+# Optional: orjson serializes responses in C, several times faster than json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Response class for error handlers and the app's default_response_class
+FastJSONResponse = ORJSONResponse if ORJSON_AVAILABLE else JSONResponse
+
+# Fixed start of every error body without details; the message and the
+# timestamp suffix are appended per response
+ERROR_BODY_PREFIX = b'{"success":false,"status":"error","error":'
+
+# APIError log_level name -> logging level
+LOG_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "critical": logging.CRITICAL,
+}
+
 
 class APIError(Exception):
     """Standard API error for consistent error responses."""
@@ -28,13 +54,57 @@ class APIError(Exception):
         self.details = details or {}
         self.log_level = log_level
         
-        # Log the error
-        log_func = getattr(logger, log_level, logger.warning)
-        log_func(f"API Error {status_code}: {message}", extra={"details": self.details})
+        # Log the error, skipping the formatting when the level is disabled
+        level = LOG_LEVELS.get(log_level, logging.WARNING)
+        if logger.isEnabledFor(level):
+            logger.log(
+                level,
+                "API Error %d: %s",
+                status_code,
+                message,
+                extra={"details": self.details} if self.details else None,
+            )
         
         super().__init__(self.message)
 
 
+@lru_cache(maxsize=1)
+def _error_timestamp(second: int) -> str:
+    """UTC ISO timestamp for a Unix second; reused for errors in the same second."""
+    return datetime.fromtimestamp(second, timezone.utc).isoformat()
+
+
+@lru_cache(maxsize=1)
+def _error_body_suffix(second: int) -> bytes:
+    return f',"timestamp":"{_error_timestamp(second)}"}}'.encode()
+
+
+def _dump_message(message: str) -> bytes:
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(message)
+    return json.dumps(message).encode()
+
+
+def error_json_response(status_code: int, message: str) -> Response:
+    """Create a standardized error response without details.
+    
+    Produces the same body as ``get_error_response`` without building and
+    serializing a dict: only the message is encoded, the rest is reused.
+    
+    Args:
+        status_code: HTTP status code
+        message: User-friendly error message
+        
+    Returns:
+        JSON response
+    """
+    return Response(
+        content=ERROR_BODY_PREFIX + _dump_message(message) + _error_body_suffix(int(time.time())),
+        status_code=status_code,
+        media_type="application/json",
+    )
+
+
 def get_error_response(
     status_code: int,
     message: str,
@@ -56,7 +126,7 @@ def get_error_response(
         "success": False,
         "status": "error",
         "error": message,
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": _error_timestamp(int(time.time())),
     }
     
     if include_details and details:
@@ -85,7 +155,7 @@ async def validation_exception_handler(
     """Handle validation errors with user-friendly messages."""
     logger.warning(f"Validation error: {exc}")
     
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=status.HTTP_400_BAD_REQUEST,
         content=get_error_response(
             status_code=400,
@@ -98,25 +168,14 @@ async def validation_exception_handler(
 
 async def api_error_handler(request: Request, exc: APIError):
     """Handle custom API errors."""
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=get_error_response(
-            status_code=exc.status_code,
-            message=exc.message,
-            details=exc.details,
-            include_details=False
-        )
-    )
+    return error_json_response(exc.status_code, exc.message)
 
 
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected exceptions."""
     logger.error(f"Unexpected error: {exc}", exc_info=True)
     
-    return JSONResponse(
-        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        content=get_error_response(
-            status_code=500,
-            message="An unexpected error occurred. Please try again.",
-        )
+    return error_json_response(
+        status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "An unexpected error occurred. Please try again.",
     )
@@ -0,0 +1,76 @@
+"""
+PDF Text Extraction
+PyMuPDF page-text helpers, also run inside the PDF extraction worker
+processes. Keep the imports to PyMuPDF only: spawned workers import this
+module to unpickle their jobs, and should not load the API stack.
+"""
+
+from typing import Tuple
+
+# Optional: PyMuPDF extracts text several times faster than pdfplumber
+try:
+    import pymupdf
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Pages whose content stream is larger than this and draws no text are
+# skipped without a text parse (diagrams, scanned signatures); 0 disables
+GRAPHICS_PAGE_MIN_STREAM_BYTES = 1_000_000
+
+
+def count_pages(pdf_path: str) -> int:
+    """Number of pages in a PDF."""
+    with pymupdf.open(pdf_path, filetype="pdf") as doc:
+        return doc.page_count
+
+
+def extract_page_range(pdf_path: str, start: int, end: int) -> str:
+    """Extract the text of pages [start, end) with PyMuPDF.
+
+    Runs in extraction worker processes, so it opens its own document.
+
+    Returns:
+        The text of every non-empty page in the range followed by a blank line
+    """
+    with pymupdf.open(pdf_path, filetype="pdf") as doc:
+        return join_page_text(doc, start, end)
+
+
+def extract_text(pdf_path: str) -> Tuple[str, int]:
+    """Extract page text with PyMuPDF.
+
+    Returns:
+        The text of every non-empty page followed by a blank line, and the
+        page count
+    """
+    with pymupdf.open(pdf_path, filetype="pdf") as doc:
+        return join_page_text(doc, 0, doc.page_count), doc.page_count
+
+
+def join_page_text(doc, start: int, end: int) -> str:
+    """Join the text of pages [start, end) of an open PyMuPDF document."""
+    page_texts = (page_text(doc[number]) for number in range(start, end))
+    return "".join(text + "\n\n" for text in page_texts if text)
+
+
+def page_text(page) -> str:
+    """Text of one PyMuPDF page, skipping large graphics-only pages.
+
+    A page is skipped only if its content stream has no text object (BT)
+    and it draws no form XObjects, which could hold text of their own, so
+    the skip never drops text get_text() would have found.
+    """
+    if GRAPHICS_PAGE_MIN_STREAM_BYTES:
+        contents = page.read_contents()
+        if (
+            len(contents) > GRAPHICS_PAGE_MIN_STREAM_BYTES
+            and b"BT" not in contents
+            and not page.get_xobjects()
+        ):
+            print(
+                f"Skipping text extraction on page {page.number + 1}: "
+                f"{len(contents)} byte content stream without text"
+            )
+            return ""
+    return page.get_text("text").rstrip()
@@ -4,10 +4,14 @@ Utilities for request handling, timeouts, and async operations
 """
 
 import asyncio
+import json
+import random
 from functools import wraps
 from typing import Callable, Any, Optional
 import logging
 
+from utils.error_handlers import get_error_response
+
 logger = logging.getLogger(__name__)
 
 
@@ -63,21 +67,29 @@ async def with_retry(
     coro_func: Callable,
     max_retries: int = 3,
     delay_seconds: float = 1.0,
-    backoff_multiplier: float = 2.0
+    backoff_multiplier: float = 3.0,
+    cap_seconds: float = 30.0
 ):
-    """Execute an async operation with exponential backoff retry.
+    """Execute an async operation with jittered exponential backoff retry.
+    
+    Delays use "decorrelated jitter": each one is drawn uniformly between
+    ``delay_seconds`` and ``backoff_multiplier`` times the previous delay,
+    capped at ``cap_seconds``, so callers that failed together don't retry
+    in lockstep.
     
     Args:
         coro_func: Async callable that returns a coroutine
         max_retries: Maximum number of retry attempts
-        delay_seconds: Initial delay between retries in seconds
-        backoff_multiplier: Multiplier for delay on each retry
+        delay_seconds: Smallest delay between retries in seconds
+        backoff_multiplier: Upper bound of each delay as a multiple of the
+            previous one
+        cap_seconds: Largest delay between retries in seconds
         
     Returns:
         Result of the coroutine
         
     Raises:
-        Exception: If all retries fail
+        Exception: The last attempt's exception, if all retries fail
     """
     delay = delay_seconds
     last_exception = None
@@ -88,51 +100,109 @@ async def with_retry(
         except Exception as e:
             last_exception = e
             if attempt < max_retries - 1:
+                delay = min(cap_seconds, random.uniform(delay_seconds, delay * backoff_multiplier))
                 logger.warning(
                     f"Attempt {attempt + 1}/{max_retries} failed, "
-                    f"retrying in {delay}s: {str(e)}"
+                    f"retrying in {delay:.2f}s: {str(e)}"
                 )
                 await asyncio.sleep(delay)
-                delay *= backoff_multiplier
             else:
                 logger.error(f"All {max_retries} attempts failed: {str(e)}")
     
     raise last_exception if last_exception else Exception("Unknown error")
 
 
-def validate_request_size(
-    max_size_mb: float = 10.0
-):
-    """Middleware to validate request body size.
+class BodySizeLimitMiddleware:
+    """ASGI middleware that rejects request bodies larger than ``max_bytes``.
     
-    Args:
-        max_size_mb: Maximum allowed request size in MB
-        
-    Returns:
-        Middleware function
+    Requests whose Content-Length already exceeds the limit are answered
+    with 413 before any of the body is read. Otherwise body bytes are
+    counted as the application receives them, and the request is cut off
+    with a 413 as soon as the running total passes the limit, so chunked
+    or mislabelled uploads are never buffered in full.
+    
+    Example:
+        app.add_middleware(BodySizeLimitMiddleware, max_bytes=10 * 1024 * 1024)
     """
-    max_bytes = int(max_size_mb * 1024 * 1024)
     
-    async def middleware(request, call_next):
-        content_length = request.headers.get("content-length", 0)
-        try:
-            content_length = int(content_length)
-        except (ValueError, TypeError):
-            content_length = 0
+    def __init__(self, app, max_bytes: int):
+        self.app = app
+        self.max_bytes = max_bytes
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        if content_length > max_bytes:
-            logger.warning(
-                f"Request rejected: size {content_length} bytes "
-                f"exceeds limit of {max_bytes} bytes"
-            )
-            return JSONResponse(
-                status_code=413,
-                content={
-                    "success": False,
-                    "error": f"Request too large. Maximum size: {max_size_mb}MB"
-                }
-            )
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    content_length = int(value)
+                except ValueError:
+                    break
+                if content_length > self.max_bytes:
+                    logger.warning(
+                        f"Request rejected: size {content_length} bytes "
+                        f"exceeds limit of {self.max_bytes} bytes"
+                    )
+                    await self._reject(send)
+                    return
+                break
+        
+        received = 0
+        response_started = False
+        rejected = False
+        
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                raise _BodyTooLarge()
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    logger.warning(
+                        f"Request rejected: body exceeded limit of "
+                        f"{self.max_bytes} bytes while streaming"
+                    )
+                    if not response_started:
+                        await self._reject(send)
+                    rejected = True
+                    raise _BodyTooLarge()
+            return message
         
-        return await call_next(request)
+        async def guarded_send(message):
+            nonlocal response_started
+            # The 413 has already been sent; drop whatever the app answers
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+        
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # Errors caused by cutting the body off are already answered
+            if not rejected:
+                raise
     
-    return middleware
+    async def _reject(self, send):
+        body = json.dumps(get_error_response(
+            status_code=413,
+            message=f"Request too large. Maximum size: {self.max_bytes // (1024 * 1024)}MB",
+        )).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class _BodyTooLarge(Exception):
+    """Raised from receive() once the request body passes the size limit."""
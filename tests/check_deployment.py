@@ -3,13 +3,26 @@
 Check deployment status of legalmind-backend and test the 403 fix
 """
 
+import asyncio
 import subprocess
 import json
+import statistics
 import sys
 import time
 import urllib.request
 import urllib.error
 
+# Optional: aiohttp is needed for the concurrent warm-up probes
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+# Concurrent health requests sent to measure cold-start latency and make
+# Cloud Run scale out
+WARMUP_PROBES = 20
+
 def run_command(cmd, timeout=30):
     """Run a shell command and return output"""
     try:
@@ -26,6 +39,39 @@ def run_command(cmd, timeout=30):
     except Exception as e:
         return "", str(e), 1
 
+async def probe(session, url):
+    """Request the URL once and return (status, seconds)"""
+    start = time.perf_counter()
+    async with session.get(url) as response:
+        await response.read()
+        return response.status, time.perf_counter() - start
+
+async def run_probes(url, count):
+    timeout = aiohttp.ClientTimeout(total=60)
+    async with aiohttp.ClientSession(timeout=timeout) as session:
+        return await asyncio.gather(
+            *(probe(session, url) for _ in range(count)),
+            return_exceptions=True
+        )
+
+def report_warmup_latency(url):
+    """Send concurrent probes and print p50/p95 latency"""
+    if not AIOHTTP_AVAILABLE:
+        print("\nℹ️  aiohttp not installed; skipping concurrent warm-up probes")
+        return
+    
+    print(f"\nStep 3: Sending {WARMUP_PROBES} concurrent warm-up probes...")
+    results = asyncio.run(run_probes(url, WARMUP_PROBES))
+    latencies = [r[1] for r in results if not isinstance(r, BaseException)]
+    failures = [r for r in results if isinstance(r, BaseException) or r[0] != 200]
+    
+    if len(latencies) >= 2:
+        cuts = statistics.quantiles(latencies, n=20)
+        print(f"✅ p50: {cuts[9] * 1000:.0f} ms, p95: {cuts[18] * 1000:.0f} ms, "
+              f"max: {max(latencies) * 1000:.0f} ms")
+    if failures:
+        print(f"⚠️  {len(failures)}/{WARMUP_PROBES} probes failed or returned non-200")
+
 def main():
     print("\n" + "="*80)
     print("CHECKING VERTEX AI FIX DEPLOYMENT")
@@ -57,6 +103,7 @@ def main():
                 print("\n✅✅✅ SUCCESS! 403 ERROR IS FIXED! ✅✅✅")
                 print("\nThe backend is responding correctly without authentication errors.")
                 print("The Vertex AI fallback fix has been successfully deployed!")
+                report_warmup_latency(backend_url)
                 return 0
                 
     except urllib.error.HTTPError as e:
@@ -75,6 +122,7 @@ def main():
                     data = json.loads(response.read().decode('utf-8'))
                     print(f"✅ Retry successful! Status: {response.status}")
                     print(f"✅ Response: {json.dumps(data, indent=2)}")
+                    report_warmup_latency(backend_url)
                     return 0
             except urllib.error.HTTPError as e2:
                 print(f"❌ Still failing: {e2.code}")